@@ -136,9 +136,11 @@
 # st.markdown("For API details, visit the [FastAPI documentation](http://localhost:8000/docs).")
 
 
+import json
 import streamlit as st
 import requests
 import os
+import time
 
 # --- Configuration ---
 # Update the base URL to include the /api prefix
@@ -179,8 +181,21 @@ with st.sidebar:
                     # Corrected URL to include /api prefix
                     response = requests.post(f"{FASTAPI_URL}/upload-text-file", files=files, params=params)
 
-                    if response.status_code == 200:
-                        st.success(f"File '{uploaded_file.name}' processed successfully!")
+                    if response.status_code == 202:
+                        # Ingestion runs in the background; poll the job until it finishes
+                        job_id = response.json()["job_id"]
+                        progress = st.empty()
+                        while True:
+                            job = requests.get(f"{FASTAPI_URL}/jobs/{job_id}").json()
+                            progress.text(f"Embedded {job['chunks_embedded']} chunks, written {job['chunks_written']}...")
+                            if job["status"] in ("completed", "failed"):
+                                break
+                            time.sleep(1)
+                        progress.empty()
+                        if job["status"] == "completed":
+                            st.success(f"File '{uploaded_file.name}' processed successfully!")
+                        else:
+                            st.error(f"Failed to process file: {job['error']}")
                     else:
                         st.error(f"Failed to upload file. Status: {response.status_code}, Detail: {response.text}")
                 except Exception as e:
@@ -219,7 +234,7 @@ with st.sidebar:
                         # Corrected URL to include /api prefix
                         response = requests.delete(f"{FASTAPI_URL}/drop-database")
                         if response.status_code == 200:
-                            st.success("Database directory successfully dropped. Restart the FastAPI server to reinitialize.")
+                            st.success("Database directory successfully dropped. A fresh database is created on next use.")
                             st.session_state['confirm_drop'] = False # Reset confirmation
                         else:
                             st.error(f"Failed to drop database: {response.text}")
@@ -229,6 +244,17 @@ with st.sidebar:
                 st.warning("Click again to confirm dropping the entire database.")
                 st.session_state['confirm_drop'] = True
 
+def iter_sse(response):
+    """Yield (event, data) pairs from a Server-Sent Events response."""
+    event = "message"
+    for line in response.iter_lines(decode_unicode=True):
+        if line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            yield event, json.loads(line[len("data:"):].strip())
+            event = "message"
+
+
 # --- Main Interface ---
 # User Query Input
 st.subheader("Ask a Question")
@@ -243,17 +269,26 @@ if st.button("Get Answer", use_container_width=True, type="primary"):
     if query_text:
         with st.spinner("Searching and generating answer..."):
             try:
-                # Send a POST request to the corrected FastAPI /api/ask_rag endpoint
-                response = requests.post(f"{FASTAPI_URL}/ask_rag", json={"query": query_text})
+                # Stream the answer from the FastAPI /api/ask_rag/stream endpoint
+                response = requests.post(f"{FASTAPI_URL}/ask_rag/stream", json={"query": query_text}, stream=True)
 
                 if response.status_code == 200:
-                    result = response.json()
-                    answer = result.get("answer")
-                    documents_used = result.get("documents_used", [])
+                    events = {}
+
+                    def answer_tokens():
+                        # Render tokens as they arrive; keep the other events for later
+                        for event, data in iter_sse(response):
+                            if event == "token":
+                                yield data
+                            else:
+                                events[event] = data
 
                     # Display the answer
                     st.success("Answer:")
-                    st.write(answer)
+                    st.write_stream(answer_tokens())
+                    if "error" in events:
+                        st.error(events["error"].get("detail", "Streaming failed."))
+                    documents_used = events.get("sources", [])
 
                     # Display the source documents
                     st.markdown("---")
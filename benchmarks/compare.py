@@ -0,0 +1,93 @@
+import argparse
+import json
+import sys
+
+# Metric name fragments where a larger value is an improvement; everything else is a cost
+HIGHER_IS_BETTER = ("per_second", "throughput")
+IGNORED = ("requests", "concurrency", "files", "bytes", "chunks", "stats", "added", "updated", "unchanged",
+           "deleted", "cache_hits", "cache_misses", "tokens")
+
+
+def flatten(results: dict) -> dict[str, float]:
+    """
+    Flatten a results file into {"<size>.<metric path>": value} for every numeric metric.
+
+    Args:
+        results (dict): Parsed output of `run_benchmarks`.
+
+    Returns:
+        dict[str, float]: Comparable metrics keyed by corpus size and path.
+    """
+    metrics = {}
+
+    def walk(prefix: str, value) -> None:
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if key not in IGNORED:
+                    walk(f"{prefix}.{key}", item)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            metrics[prefix] = float(value)
+
+    for corpus in results.get("corpora", []):
+        walk(corpus["size"], {key: value for key, value in corpus.items() if key != "size"})
+    return metrics
+
+
+def compare(baseline: dict, candidate: dict, threshold: float) -> tuple[list[tuple], int]:
+    """
+    Compare two results files metric by metric.
+
+    Args:
+        baseline (dict): Results of the reference run.
+        candidate (dict): Results of the run being evaluated.
+        threshold (float): Relative change, in percent, beyond which a worse metric is a regression.
+
+    Returns:
+        tuple[list[tuple], int]: (metric, baseline, candidate, change %, verdict) rows and
+        the number of regressions.
+    """
+    before, after = flatten(baseline), flatten(candidate)
+    rows, regressions = [], 0
+    for metric in sorted(before.keys() & after.keys()):
+        old, new = before[metric], after[metric]
+        change = (new - old) / old * 100 if old else 0.0
+        improvement = change if any(part in metric for part in HIGHER_IS_BETTER) else -change
+        verdict = ""
+        if improvement < -threshold:
+            verdict = "REGRESSION"
+            regressions += 1
+        elif improvement > threshold:
+            verdict = "improved"
+        rows.append((metric, old, new, change, verdict))
+    return rows, regressions
+
+
+def main():
+    """
+    Compare two benchmark results files and exit with status 1 on regressions.
+
+    Example:
+        python -m benchmarks.compare benchmarks/results/before.json benchmarks/results/after.json
+    """
+    parser = argparse.ArgumentParser(description="Compare two benchmark results files.")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0, help="regression threshold in percent")
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.candidate, encoding="utf-8") as f:
+        candidate = json.load(f)
+
+    rows, regressions = compare(baseline, candidate, args.threshold)
+    width = max((len(row[0]) for row in rows), default=10)
+    print(f"{'metric':<{width}}  {'baseline':>12}  {'candidate':>12}  {'change':>8}")
+    for metric, old, new, change, verdict in rows:
+        print(f"{metric:<{width}}  {old:>12.2f}  {new:>12.2f}  {change:>+7.1f}%  {verdict}")
+    print(f"\n{len(rows)} metrics compared, {regressions} regressions beyond {args.threshold:.0f}%")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import argparse
+import json
+import os
+import random
+import re
+
+RAW_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "raw_data")
+SOURCE_FILES = ("HR_Policy_Dataset1.txt", "HR_Policy_Dataset2.txt")
+COMPANIES = ("Acme", "Globex", "Initech", "Umbrella", "Stark", "Wayne", "Wonka", "Hooli", "Vandelay", "Soylent")
+HEADING_PATTERN = re.compile(r"^\d+(\.\d+)*\s+\S")
+SIZE_UNITS = {"kb": 1024, "mb": 1024 * 1024}
+
+
+def parse_size(size: str) -> int:
+    """Parse a size such as "256KB" or "2MB" into bytes."""
+    match = re.fullmatch(r"(\d+)\s*(kb|mb)", size.strip().lower())
+    if not match:
+        raise ValueError(f"Invalid size '{size}'; use e.g. 256KB or 2MB")
+    return int(match.group(1)) * SIZE_UNITS[match.group(2)]
+
+
+def load_sections() -> list[tuple[str, list[str]]]:
+    """
+    Split the HR policy files of `raw_data/` into (heading, paragraphs) sections.
+
+    Returns:
+        list[tuple[str, list[str]]]: Every numbered section of the source files.
+    """
+    sections = []
+    for name in SOURCE_FILES:
+        with open(os.path.join(RAW_DATA_DIR, name), encoding="utf-8") as f:
+            paragraphs = [block.strip() for block in f.read().split("\n\n") if block.strip()]
+        heading, body = None, []
+        for paragraph in paragraphs:
+            if HEADING_PATTERN.match(paragraph) and len(paragraph) < 80:
+                if heading and body:
+                    sections.append((heading, body))
+                heading, body = paragraph, []
+            elif heading:
+                body.append(paragraph)
+        if heading and body:
+            sections.append((heading, body))
+    return sections
+
+
+def _document(sections: list[tuple[str, list[str]]], rng: random.Random, target_bytes: int) -> tuple[str, list[str]]:
+    company = f"{rng.choice(COMPANIES)} {rng.randint(1, 999)}"
+    lines = [f"{company} HR Policy Document", ""]
+    headings = []
+    number = 0
+    while sum(len(line) + 1 for line in lines) < target_bytes:
+        number += 1
+        heading, body = rng.choice(sections)
+        title = heading.split(maxsplit=1)[1]  # drop the original section number
+        headings.append(title)
+        lines += [f"{number}. {title}", ""]
+        for sub, paragraph in enumerate(rng.sample(body, k=len(body)), start=1):
+            paragraph = re.sub(r"\b\d+\b", lambda m: str(int(m.group()) + rng.randint(0, 5)), paragraph)
+            paragraph = paragraph.replace("XYZ Company", f"{company} Company")
+            lines += [f"{number}.{sub} {paragraph}", ""]
+    return "\n".join(lines), headings
+
+
+def generate_corpus(target_dir: str, total_bytes: int, file_bytes: int = 64 * 1024, seed: int = 0,
+                    questions: int = 200) -> dict:
+    """
+    Write a synthetic corpus of HR policy files built from the `raw_data/` documents.
+
+    Sections are shuffled, renumbered and attributed to generated companies, so the
+    corpus has realistic vocabulary and structure at any size. The same seed always
+    produces the same corpus. A `questions.json` file with queries about the corpus
+    is written next to the text files.
+
+    Args:
+        target_dir (str): Directory to write the corpus into.
+        total_bytes (int): Approximate corpus size.
+        file_bytes (int): Approximate size of each file.
+        seed (int): Random seed.
+        questions (int): Number of questions to generate.
+
+    Returns:
+        dict: Corpus description (files, bytes, seed and questions path).
+    """
+    rng = random.Random(seed)
+    sections = load_sections()
+    os.makedirs(target_dir, exist_ok=True)
+    written, files, all_headings = 0, 0, []
+    while written < total_bytes:
+        text, headings = _document(sections, rng, min(file_bytes, total_bytes - written))
+        with open(os.path.join(target_dir, f"policy_{files:05d}.txt"), "w", encoding="utf-8") as f:
+            f.write(text)
+        written += len(text.encode("utf-8"))
+        files += 1
+        all_headings.extend(headings)
+
+    templates = ("What does the policy say about {}?", "Explain the rules for {}.", "How is {} handled?")
+    question_list = [rng.choice(templates).format(rng.choice(all_headings).lower()) for _ in range(questions)]
+    questions_path = os.path.join(target_dir, "questions.json")
+    with open(questions_path, "w", encoding="utf-8") as f:
+        json.dump(question_list, f, indent=2)
+    return {"directory": target_dir, "files": files, "bytes": written, "seed": seed, "questions": questions_path}
+
+
+def main():
+    """
+    Generate synthetic corpora of several sizes.
+
+    Example:
+        python -m benchmarks.corpus bench_data --sizes 256KB 2MB 16MB
+    """
+    parser = argparse.ArgumentParser(description="Generate synthetic HR policy corpora.")
+    parser.add_argument("target_dir")
+    parser.add_argument("--sizes", nargs="+", default=["256KB", "2MB"])
+    parser.add_argument("--file-size", default="64KB")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        info = generate_corpus(os.path.join(args.target_dir, size.lower()), parse_size(size),
+                               file_bytes=parse_size(args.file_size), seed=args.seed)
+        print(json.dumps(info))
+
+
+if __name__ == "__main__":
+    main()
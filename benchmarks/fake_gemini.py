@@ -0,0 +1,99 @@
+import argparse
+import asyncio
+import json
+import random
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
+import uvicorn
+
+LOREM = (
+    "Employees are entitled to paid leave according to the policy. Requests should be submitted "
+    "to the line manager in advance and approved before the leave starts. "
+)
+
+
+class FakeGeminiSettings:
+    """Latency and output shape of the stand-in; set from the command line."""
+    latency_ms = 800.0  # time to the complete answer, or to the first streamed piece
+    jitter_ms = 100.0
+    piece_interval_ms = 30.0  # delay between streamed pieces
+    piece_chars = 40
+    answer_chars = 600
+    error_rate = 0.0  # share of requests answered with 503
+
+
+settings = FakeGeminiSettings()
+app = FastAPI(title="Fake Gemini")
+
+
+def _answer(prompt: str) -> str:
+    text = (LOREM * (settings.answer_chars // len(LOREM) + 1))[:settings.answer_chars]
+    return f"[{len(prompt)} prompt chars] {text}"
+
+
+def _payload(text: str) -> dict:
+    return {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finish_reason": "STOP"}]}
+
+
+async def _delay(base_ms: float) -> None:
+    await asyncio.sleep(max(0.0, base_ms + random.uniform(-settings.jitter_ms, settings.jitter_ms)) / 1000)
+
+
+@app.post("/v1beta/models/{model_method}")
+async def generate(model_method: str, request: Request):
+    """
+    Answer `generateContent` and `streamGenerateContent?alt=sse` calls like the Gemini REST API.
+    """
+    method = model_method.partition(":")[2]
+    body = await request.json()
+    prompt = "".join(part.get("text", "") for content in body.get("contents", []) for part in content.get("parts", []))
+    if random.random() < settings.error_rate:
+        raise HTTPException(status_code=503, detail="Injected failure")
+
+    if method == "generateContent":
+        await _delay(settings.latency_ms)
+        return _payload(_answer(prompt))
+    if method != "streamGenerateContent":
+        raise HTTPException(status_code=404, detail=f"Unknown method '{method}'")
+
+    async def pieces():
+        await _delay(settings.latency_ms)
+        answer = _answer(prompt)
+        for start in range(0, len(answer), settings.piece_chars):
+            if start:
+                await asyncio.sleep(settings.piece_interval_ms / 1000)
+            yield f"data: {json.dumps(_payload(answer[start:start + settings.piece_chars]))}\r\n\r\n"
+
+    return StreamingResponse(pieces(), media_type="text/event-stream")
+
+
+def main():
+    """
+    Serve a local stand-in for the Gemini REST API with configurable latency.
+
+    Point the application at it with `GEMINI_API_ENDPOINT=http://127.0.0.1:<port>`.
+
+    Example:
+        python -m benchmarks.fake_gemini --port 8090 --latency-ms 500
+    """
+    parser = argparse.ArgumentParser(description="Local Gemini stand-in for benchmarks.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency-ms", type=float, default=settings.latency_ms,
+                        help="time to the complete answer or to the first streamed piece")
+    parser.add_argument("--jitter-ms", type=float, default=settings.jitter_ms)
+    parser.add_argument("--piece-interval-ms", type=float, default=settings.piece_interval_ms)
+    parser.add_argument("--answer-chars", type=int, default=settings.answer_chars)
+    parser.add_argument("--error-rate", type=float, default=settings.error_rate)
+    args = parser.parse_args()
+
+    settings.latency_ms = args.latency_ms
+    settings.jitter_ms = args.jitter_ms
+    settings.piece_interval_ms = args.piece_interval_ms
+    settings.answer_chars = args.answer_chars
+    settings.error_rate = args.error_rate
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+import httpx
+from benchmarks.corpus import generate_corpus, parse_size
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_DIR, "benchmarks", "results")
+
+
+def percentiles(values: list[float]) -> dict:
+    """Summarize latencies (in seconds) as p50/p95/p99/mean/max in milliseconds."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def at(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 2)
+
+    return {
+        "p50": at(0.50),
+        "p95": at(0.95),
+        "p99": at(0.99),
+        "mean": round(sum(ordered) / len(ordered) * 1000, 2),
+        "max": round(ordered[-1] * 1000, 2),
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def peak_rss_mb(pid: int) -> float:
+    """Memory high-water mark of a running process, read from /proc (Linux only)."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_ingest(corpus_dir: str, workdir: str, workers: int, batch_size: int) -> dict:
+    """
+    Ingest a corpus with `ingest_cli.py` in a fresh process and database.
+
+    Returns:
+        dict: Wall time, the CLI's ingest stats and the process's peak RSS.
+    """
+    command = [sys.executable, os.path.join(REPO_DIR, "ingest_cli.py"), corpus_dir,
+               "--workers", str(workers), "--batch-size", str(batch_size)]
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=workdir, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    output = process.stdout.read()
+    _, status, usage = os.wait4(process.pid, 0)
+    seconds = time.perf_counter() - start
+    if status != 0:
+        raise RuntimeError(f"Ingest failed with status {status}")
+    stats = json.loads(output[output.index("{"):])
+    return {
+        "wall_seconds": round(seconds, 3),
+        "chunks": stats.get("chunks"),
+        "chunks_per_second": round(stats.get("chunks", 0) / seconds, 1),
+        "embed_tokens_per_second": stats.get("tokens_per_second"),
+        "peak_rss_mb": round(usage.ru_maxrss / 1024, 1),
+        "stats": stats,
+    }
+
+
+def start_process(command: list[str], cwd: str, env: dict) -> subprocess.Popen:
+    return subprocess.Popen(command, cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_until(url: str, process: subprocess.Popen, timeout: float, status: int = 200) -> float:
+    """Poll a URL until it answers with `status`; return the elapsed seconds."""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f"Process exited with status {process.returncode} before {url} was ready")
+        try:
+            if httpx.get(url, timeout=1).status_code == status:
+                return time.perf_counter() - start
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(f"{url} was not ready after {timeout}s")
+
+
+async def load_test(base_url: str, scenario: str, questions: list[str], requests: int, concurrency: int) -> dict:
+    """
+    Send `requests` calls of one scenario with `concurrency` in flight and summarize them.
+
+    Scenarios:
+        - retrieval: `/api/ask_rag/batch` with `answer=false` (embedding and search only).
+        - ask_rag: the full RAG pipeline through `/api/ask_rag`.
+        - ask_rag_stream: `/api/ask_rag/stream`, also measuring time to the first token.
+    """
+    latencies, first_tokens, errors = [], [], 0
+    semaphore = asyncio.Semaphore(concurrency)
+    rng = random.Random(0)
+
+    async def one(client: httpx.AsyncClient) -> None:
+        nonlocal errors
+        question = rng.choice(questions)
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                if scenario == "retrieval":
+                    response = await client.post("/api/ask_rag/batch",
+                                                 json={"queries": [{"question": question}], "answer": False})
+                elif scenario == "ask_rag":
+                    response = await client.post("/api/ask_rag", json={"query": question})
+                else:
+                    async with client.stream("POST", "/api/ask_rag/stream", json={"query": question}) as response:
+                        first_token = None
+                        async for line in response.aiter_lines():
+                            if first_token is None and line.startswith("event: token"):
+                                first_token = time.perf_counter() - start
+                        if first_token is not None:
+                            first_tokens.append(first_token)
+                if response.status_code != 200:
+                    errors += 1
+                    return
+            except httpx.HTTPError:
+                errors += 1
+                return
+            latencies.append(time.perf_counter() - start)
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(one(client) for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    result = {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else None,
+        "latency_ms": percentiles(latencies),
+    }
+    if first_tokens:
+        result["first_token_ms"] = percentiles(first_tokens)
+    return result
+
+
+def run_server_benchmarks(workdir: str, questions: list[str], args) -> dict:
+    """
+    Start the fake Gemini server and the FastAPI app over an ingested database and load-test it.
+
+    Returns:
+        dict: Cold-start time, per-scenario latency summaries and the server's peak RSS.
+    """
+    env = dict(os.environ)
+    gemini_port, app_port = free_port(), free_port()
+    env.update({
+        "GEMINI_API_KEY": env.get("GEMINI_API_KEY", "benchmark"),
+        "GEMINI_API_ENDPOINT": f"http://127.0.0.1:{gemini_port}",
+        "ANSWER_CACHE_ENABLED": "false",
+        "PYTHONPATH": REPO_DIR,
+    })
+    fake_gemini = start_process(
+        [sys.executable, "-m", "benchmarks.fake_gemini", "--port", str(gemini_port),
+         "--latency-ms", str(args.gemini_latency_ms)], REPO_DIR, env
+    )
+    server = None
+    try:
+        wait_until(f"http://127.0.0.1:{gemini_port}/docs", fake_gemini, timeout=30)
+        start = time.perf_counter()
+        server = start_process(
+            [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", REPO_DIR, "--port", str(app_port),
+             "--log-level", "warning"], workdir, env
+        )
+        base_url = f"http://127.0.0.1:{app_port}"
+        listening = wait_until(f"{base_url}/", server, timeout=120)
+        wait_until(f"{base_url}/ready", server, timeout=600)
+        result = {
+            "cold_start": {
+                "listening_seconds": round(listening, 3),
+                "ready_seconds": round(time.perf_counter() - start, 3),
+                "warm_up_seconds": httpx.get(f"{base_url}/ready").json().get("warm_up_seconds"),
+            },
+            "scenarios": {},
+        }
+        for scenario in args.scenarios:
+            result["scenarios"][scenario] = asyncio.run(
+                load_test(base_url, scenario, questions, args.requests, args.concurrency)
+            )
+        result["server_peak_rss_mb"] = peak_rss_mb(server.pid)
+        return result
+    finally:
+        for process in (server, fake_gemini):
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=30)
+
+
+def main():
+    """
+    Run the benchmark suite and write the results as JSON.
+
+    For each corpus size: generate a synthetic corpus, ingest it into a fresh database
+    (throughput and peak memory), then start the app against a local Gemini stand-in
+    and measure cold start and request latency percentiles under load.
+
+    Example:
+        python -m benchmarks.run_benchmarks --sizes 256KB 2MB --requests 200 --concurrency 8
+    """
+    parser = argparse.ArgumentParser(description="Benchmark ingestion and the RAG API.")
+    parser.add_argument("--sizes", nargs="+", default=["256KB", "2MB"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=2, help="chunking processes for ingestion")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--requests", type=int, default=100, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--scenarios", nargs="+", default=["retrieval", "ask_rag", "ask_rag_stream"],
+                        choices=["retrieval", "ask_rag", "ask_rag_stream"])
+    parser.add_argument("--gemini-latency-ms", type=float, default=800)
+    parser.add_argument("--skip-server", action="store_true", help="only benchmark ingestion")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--keep-workdir", action="store_true")
+    args = parser.parse_args()
+
+    started = datetime.now(timezone.utc)
+    results = {
+        "meta": {
+            "started_at": started.isoformat(),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": vars(args),
+        },
+        "corpora": [],
+    }
+    root = tempfile.mkdtemp(prefix="rag_bench_")
+    try:
+        for size in args.sizes:
+            corpus_dir = os.path.join(root, "corpus", size.lower())
+            workdir = os.path.join(root, "work", size.lower())
+            os.makedirs(workdir)
+            corpus = generate_corpus(corpus_dir, parse_size(size), seed=args.seed)
+            with open(corpus["questions"], encoding="utf-8") as f:
+                questions = json.load(f)
+            os.remove(corpus["questions"])
+
+            print(f"[{size}] ingesting {corpus['files']} files...", flush=True)
+            entry = {"size": size, "files": corpus["files"], "bytes": corpus["bytes"],
+                     "ingest": run_ingest(corpus_dir, workdir, args.workers, args.batch_size)}
+            if not args.skip_server:
+                print(f"[{size}] load-testing the API...", flush=True)
+                entry.update(run_server_benchmarks(workdir, questions, args))
+            results["corpora"].append(entry)
+    finally:
+        if args.keep_workdir:
+            print(f"Work directory kept at {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{started.strftime('%Y%m%dT%H%M%SZ')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
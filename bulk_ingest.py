@@ -0,0 +1,156 @@
+import multiprocessing
+import os
+import time
+import zipfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable
+from chroma_functionalities import (
+    build_chunk_records, delete_documents, delete_source_documents, get_source_chunk_lines, ingest_metadata,
+    iter_chunks, store_chunk_records
+)
+from embedding_engine import IngestStats
+from utils.enums import ChromaDBConfig, IngestConfig
+from utils.logger import setup_logger
+from utils.metrics import record_stage
+from utils.read_data import ReadDataClass
+
+logger = setup_logger(__name__)
+
+
+def collect_text_files(directory: str, recursive: bool = True) -> list[tuple[str, str]]:
+    """
+    List the .txt files of a directory.
+
+    Args:
+        directory (str): Directory to scan.
+        recursive (bool): Also scan sub-directories.
+
+    Returns:
+        list[tuple[str, str]]: (file path, source name) pairs; the source name is the path
+        relative to `directory`.
+
+    Raises:
+        FileNotFoundError: If the directory does not exist.
+    """
+    if not os.path.isdir(directory):
+        raise FileNotFoundError(f"Directory '{directory}' does not exist")
+    files = []
+    for root, dirs, names in os.walk(directory):
+        dirs.sort()
+        for name in sorted(names):
+            if name.endswith(".txt"):
+                path = os.path.join(root, name)
+                files.append((path, os.path.relpath(path, directory).replace(os.sep, "/")))
+        if not recursive:
+            break
+    return files
+
+
+def extract_zip(zip_path: str, target_dir: str) -> list[tuple[str, str]]:
+    """
+    Extract the .txt members of a zip archive.
+
+    Members whose path would escape `target_dir` are skipped.
+
+    Args:
+        zip_path (str): Path to the archive.
+        target_dir (str): Directory to extract into.
+
+    Returns:
+        list[tuple[str, str]]: (file path, source name) pairs; the source name is the member path.
+    """
+    files = []
+    root = os.path.realpath(target_dir)
+    with zipfile.ZipFile(zip_path) as archive:
+        for member in archive.infolist():
+            if member.is_dir() or not member.filename.endswith(".txt"):
+                continue
+            destination = os.path.realpath(os.path.join(root, member.filename))
+            if os.path.commonpath([root, destination]) != root:
+                logger.warning(f"Skipping unsafe zip member '{member.filename}'")
+                continue
+            archive.extract(member, root)
+            files.append((destination, member.filename))
+    return files
+
+
+def _chunk_file(path: str, chunking: str = None) -> tuple[list[tuple[str, dict]], float]:
+    """
+    Chunk one file; runs in a worker process with its own tokenizer.
+
+    Stage metrics recorded in the worker stay in that process, so the time taken is
+    returned and recorded by the parent as the `chunk` ingest stage.
+    """
+    start = time.perf_counter()
+    chunks = list(iter_chunks(ReadDataClass.stream_file(path), chunking))
+    return chunks, time.perf_counter() - start
+
+
+def bulk_ingest(collection, files: list[tuple[str, str]], force: bool = False, incremental: bool = False,
+                workers: int = IngestConfig.CHUNK_PROCESSES, batch_size: int = ChromaDBConfig.INGEST_BATCH_SIZE,
+                progress: Callable[[str, int], None] = None, chunking: str = None,
+                tags: list[str] = None) -> IngestStats:
+    """
+    Ingest many text files with parallel chunking and one shared embedding stream.
+
+    Files are chunked concurrently in `workers` processes. As each file finishes, its
+    chunks join a single pending queue that is embedded and written in batches of
+    `batch_size`, so small files share batches instead of paying per-file overhead.
+
+    Args:
+        collection (chromadb.api.models.Collection.Collection): ChromaDB collection object.
+        files (list[tuple[str, str]]): (file path, source name) pairs to ingest.
+        force (bool): Replace the chunks previously stored for each source.
+        incremental (bool): Sync only the differences with the chunks stored for each source.
+        workers (int): Number of chunking processes.
+        batch_size (int): Number of chunks embedded and written per batch.
+        progress (Callable[[str, int], None]): Optional progress callback, see `store_in_collection`.
+        chunking (str): Chunking strategy, see `iter_chunks`.
+        tags (list[str]): Optional tags stored on every chunk, see `ingest_metadata`.
+
+    Returns:
+        IngestStats: Throughput and sync counters of the whole ingest.
+    """
+    stats = IngestStats()
+    existing = {}
+    pending_chunks, pending_ids, pending_metadatas = [], [], []
+    fields = ingest_metadata(tags)
+
+    def flush(limit: int):
+        while len(pending_chunks) >= limit and pending_chunks:
+            stats.merge(store_chunk_records(
+                collection, pending_chunks[:batch_size], pending_ids[:batch_size], pending_metadatas[:batch_size],
+                existing=existing if incremental else None, progress=progress
+            ))
+            del pending_chunks[:batch_size], pending_ids[:batch_size], pending_metadatas[:batch_size]
+
+    logger.info(f"Bulk ingesting {len(files)} files with {workers} chunking processes")
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max(1, workers), mp_context=context) as pool:
+        futures = {pool.submit(_chunk_file, path, chunking): source for path, source in files}
+        for future in as_completed(futures):
+            source = futures[future]
+            chunked, seconds = future.result()
+            chunks = [chunk for chunk, _ in chunked]
+            record_stage("ingest", "chunk", seconds)
+            if incremental:
+                existing.update(get_source_chunk_lines(collection, source))
+            elif force:
+                delete_source_documents(collection, source)
+            ids, metadatas = build_chunk_records(
+                chunks, source, occurrences=Counter(), chunk_metadatas=[{**fields, **metadata} for _, metadata in chunked]
+            )
+            pending_chunks.extend(chunks)
+            pending_ids.extend(ids)
+            pending_metadatas.extend(metadatas)
+            flush(batch_size)
+    flush(1)
+
+    if incremental:
+        delete_documents(collection, list(existing))
+        stats.deleted = len(existing)
+    logger.info(f"Bulk ingest finished: {stats.added} added, {stats.updated} updated, "
+                f"{stats.deleted} deleted, {stats.unchanged} unchanged, "
+                f"{stats.chunks_per_second:.1f} chunks/s")
+    return stats
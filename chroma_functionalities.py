@@ -1,50 +1,146 @@
+import hashlib
 import os
-import uuid
-import chromadb
-from chromadb.utils import embedding_functions
-from utils.enums import ChromaDBConfig, Messages, MetadataKeys
+import time
+from collections import Counter
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+from chromadb.api.types import validate_where, validate_where_document
+from collection_config import CollectionConfig
+from embedding_cache import content_hash
+from embedding_engine import IngestStats
+from lexical_index import get_lexical_index
+from resource_registry import CollectionNotFoundError, registry
+from section_chunker import iter_section_chunks
+from utils.enums import ChromaDBConfig, ChunkingConfig, ChunkingStrategy, IndexConfig, Messages, MetadataKeys
 from utils.logger import setup_logger
-from transformers import AutoTokenizer
+from utils.metrics import INGESTED_CHUNKS, INGESTED_TOKENS, record_stage
+from utils.read_data import ReadDataClass
 
 logger = setup_logger(__name__)
 
-# --- Initialize ChromaDB client ---
-persist_dir = os.path.join(os.getcwd(), ChromaDBConfig.DB_DIRECTORY)
-try:
-    if not os.path.isdir(os.path.dirname(persist_dir)):
-        logger.error(f"Invalid database directory path: {persist_dir}")
-        raise RuntimeError(f"Invalid database directory path: {persist_dir}")
-    _client = chromadb.PersistentClient(path=persist_dir)
-    logger.info(f"Initialized ChromaDB client at {persist_dir}")
-except Exception as e:
-    logger.error(f"Failed to initialize ChromaDB client: {str(e)}")
-    raise RuntimeError(f"Failed to initialize ChromaDB client: {str(e)}")
-
-# --- Initialize embedding function ---
-try:
-    _embedding_func = embedding_functions.SentenceTransformerEmbeddingFunction(
-        model_name=ChromaDBConfig.EMBEDDING_MODEL
-    )
-    logger.info(f"Initialized embedding function: {ChromaDBConfig.EMBEDDING_MODEL}")
-except Exception as e:
-    logger.error(f"Failed to initialize embedding function: {str(e)}")
-    raise RuntimeError(f"Failed to initialize embedding function: {str(e)}")
-
-# Direct client and collection reference
-client = chromadb.PersistentClient(path=ChromaDBConfig.DB_DIRECTORY)
-embedding_func = embedding_functions.SentenceTransformerEmbeddingFunction(
-    model_name=ChromaDBConfig.EMBEDDING_MODEL
-)
-collection = client.get_or_create_collection(
-    name=ChromaDBConfig.COLLECTION_NAME,
-    embedding_function=embedding_func,
-    metadata={"hnsw:space": "cosine"}  
-)
-
-# Tokenizer for chunking text
-tokenizer = AutoTokenizer.from_pretrained(
-    f"sentence-transformers/{ChromaDBConfig.EMBEDDING_MODEL}"
-)
+
+def _iter_chunk_spans(segments: Iterable[tuple[str, list[tuple[int, int]]]], max_tokens: int,
+                      overlap_tokens: int) -> Iterator[str]:
+    """
+    Cut token-window chunks out of consecutive text segments by character offset.
+
+    Only the text the current window can still reference is kept, so memory is bounded
+    by the segment size rather than by the whole document.
+
+    Args:
+        segments (Iterable[tuple[str, list[tuple[int, int]]]]): Consecutive pieces of one
+            document, each with the (start, end) character offsets of its tokens.
+        max_tokens (int): Maximum number of tokens per chunk.
+        overlap_tokens (int): Number of overlapping tokens between consecutive chunks.
+
+    Yields:
+        str: Chunks of the original text, from the first character of their first token
+        to the last character of their last token.
+    """
+    text = ""  # document text from the first character the window may still reference
+    base = 0  # position of text[0] in the document
+    window = []  # (start, end) document positions of the tokens not yet fully emitted
+    carried = 0  # tokens at the head of the window already emitted in the previous chunk
+
+    for segment, offsets in segments:
+        position = base + len(text)
+        window.extend((position + start, position + end) for start, end in offsets)
+        text += segment
+        head = 0
+        while len(window) - head >= max_tokens:
+            yield text[window[head][0] - base:window[head + max_tokens - 1][1] - base]
+            head += max_tokens - overlap_tokens
+            carried = overlap_tokens
+        del window[:head]
+        cut = window[0][0] if window else base + len(text)
+        text = text[cut - base:]
+        base = cut
+
+    if len(window) > carried:
+        yield text[window[0][0] - base:window[-1][1] - base]
+
+
+def _offset_mappings(tokenizer, texts: list[str]) -> list[list[tuple[int, int]]]:
+    """Tokenize texts in one batched call and return only their token offsets."""
+    return tokenizer(
+        texts, add_special_tokens=False, return_offsets_mapping=True,
+        return_attention_mask=False, return_token_type_ids=False
+    )["offset_mapping"]
+
+
+def iter_chunks_by_tokens(blocks: Iterable[str], max_tokens: int = 300, overlap_tokens: int = 50) -> Iterator[str]:
+    """
+    Incrementally split a stream of text blocks into token-based chunks.
+
+    Blocks are tokenized `TOKENIZE_BATCH_BLOCKS` at a time in one batched call, and the
+    chunks are sliced out of the original text using the fast tokenizer's offset
+    mapping, so they keep the exact source text and nothing is decoded back. Memory
+    is bounded by the block size rather than by the whole document.
+    Blocks must end on whitespace (see `ReadDataClass.stream_file`). Time spent reading
+    blocks and tokenizing is recorded as the `read` and `tokenize` ingest stages.
+
+    Args:
+        blocks (Iterable[str]): Consecutive pieces of the document text.
+        max_tokens (int): Maximum number of tokens per chunk.
+        overlap_tokens (int): Number of overlapping tokens between consecutive chunks.
+
+    Yields:
+        str: Non-empty text chunks that fit within the token constraints.
+    """
+    tokenizer = registry.tokenizer
+    timings = {"read": 0.0, "tokenize": 0.0}
+
+    def segments() -> Iterator[tuple[str, list[tuple[int, int]]]]:
+        remaining = iter(blocks)
+        while True:
+            start = time.perf_counter()
+            group = list(islice(remaining, ChromaDBConfig.TOKENIZE_BATCH_BLOCKS))
+            timings["read"] += time.perf_counter() - start
+            if not group:
+                return
+            start = time.perf_counter()
+            offsets = _offset_mappings(tokenizer, group)
+            timings["tokenize"] += time.perf_counter() - start
+            yield from zip(group, offsets)
+
+    try:
+        yield from _iter_chunk_spans(segments(), max_tokens, overlap_tokens)
+    finally:
+        record_stage("ingest", "read", timings["read"])
+        record_stage("ingest", "tokenize", timings["tokenize"])
+
+
+def chunk_texts_by_tokens(texts: list[str], max_tokens: int = 300, overlap_tokens: int = 50) -> list[list[str]]:
+    """
+    Split many texts into token-based chunks with a single batched tokenizer call.
+
+    Each text is cut into whitespace-bounded segments of at most `READ_BLOCK_SIZE`
+    characters first, so a very long text never becomes one giant token sequence.
+
+    Args:
+        texts (list[str]): The full texts to be chunked.
+        max_tokens (int): Maximum number of tokens per chunk.
+        overlap_tokens (int): Number of overlapping tokens between consecutive chunks.
+
+    Returns:
+        list[list[str]]: The chunks of each text, in input order.
+    """
+    documents = [list(ReadDataClass.iter_text_blocks(text)) for text in texts]
+    segments = [segment for document in documents for segment in document]
+    if not segments:
+        return [[] for _ in texts]
+
+    start = time.perf_counter()
+    offsets = _offset_mappings(registry.tokenizer, segments)
+    record_stage("ingest", "tokenize", time.perf_counter() - start)
+
+    results = []
+    position = 0
+    for document in documents:
+        spans = zip(document, offsets[position:position + len(document)])
+        results.append(list(_iter_chunk_spans(spans, max_tokens, overlap_tokens)))
+        position += len(document)
+    return results
 
 
 def chunk_text_by_tokens(text: str, max_tokens: int = 300, overlap_tokens: int = 50) -> list[str]:
@@ -61,35 +157,57 @@ def chunk_text_by_tokens(text: str, max_tokens: int = 300, overlap_tokens: int =
     Returns:
         list[str]: A list of text chunks that fit within the token constraints.
     """
-    tokens = tokenizer.encode(text, add_special_tokens=False)
-    chunks = []
-    start = 0
+    return chunk_texts_by_tokens([text], max_tokens, overlap_tokens)[0]
+
+
+def iter_chunks(blocks: Iterable[str], strategy: str = None,
+                max_tokens: int = ChunkingConfig.MAX_TOKENS) -> Iterator[tuple[str, dict]]:
+    """
+    Split a stream of text blocks into chunks with the selected chunking strategy.
 
-    while start < len(tokens):
-        end = start + max_tokens
-        chunk_tokens = tokens[start:end]
-        chunk_text = tokenizer.decode(chunk_tokens, skip_special_tokens=True)
-        chunks.append(chunk_text.strip())
-        start += max_tokens - overlap_tokens
+    - `token` -> fixed token windows with `OVERLAP_TOKENS` overlap, see `iter_chunks_by_tokens`.
+    - `structure` -> sections, paragraphs and sentences, see `iter_section_chunks`.
 
-    return [c for c in chunks if c]
+    Args:
+        blocks (Iterable[str]): Consecutive pieces of the document text.
+        strategy (str): Chunking strategy, see `ChunkingStrategy`; defaults to the configured one.
+        max_tokens (int): Maximum number of tokens per chunk.
 
+    Yields:
+        tuple[str, dict]: Each chunk with the metadata the strategy adds to it.
 
-def get_chroma_collection():
+    Raises:
+        ValueError: If the strategy is unknown.
+    """
+    strategy = strategy or ChunkingConfig.STRATEGY
+    if strategy == ChunkingStrategy.STRUCTURE:
+        return iter_section_chunks(blocks, max_tokens)
+    if strategy == ChunkingStrategy.TOKEN:
+        return ((chunk, {}) for chunk in iter_chunks_by_tokens(blocks, max_tokens, ChunkingConfig.OVERLAP_TOKENS))
+    raise ValueError(f"Unknown chunking strategy '{strategy}'")
+
+
+def get_chroma_collection(name: str = None):
     """
-    Retrieve or create the ChromaDB collection.
+    Retrieve a ChromaDB collection, creating the default one if needed.
+
+    Handles are cached by the resource registry, so every router queries the same
+    collection object.
+
+    Args:
+        name (str): Collection name; defaults to the configured collection.
 
     Returns:
         chromadb.api.models.Collection.Collection: The ChromaDB collection object.
 
     Raises:
+        CollectionNotFoundError: If a non-default collection does not exist.
         RuntimeError: If the collection cannot be retrieved or created.
     """
     try:
-        return _client.get_or_create_collection(
-            name=ChromaDBConfig.COLLECTION_NAME,
-            embedding_function=_embedding_func
-        )
+        return registry.get_collection(name)
+    except CollectionNotFoundError:
+        raise
     except Exception as e:
         logger.error(f"Failed to get or create collection: {str(e)}")
         raise RuntimeError(f"Failed to get or create collection: {str(e)}")
@@ -127,42 +245,205 @@ def read_text_file(file_path: str, max_tokens: int = 300, overlap_tokens: int =
         list[str]: List of chunked strings from the file.
     """
     logger.info(Messages.OPENING_FILE.format(file_path=file_path))
-    with open(file_path, "r", encoding="utf-8") as f:
-        full_text = f.read()
-    chunks = chunk_text_by_tokens(full_text, max_tokens, overlap_tokens)
+    chunks = list(iter_chunks_by_tokens(ReadDataClass.stream_file(file_path), max_tokens, overlap_tokens))
     logger.info(Messages.READ_LINES.format(count=len(chunks)))
     return chunks
 
 
 
 
-def store_in_collection(collection, chunks: list[str], file_path: str) -> None:
+def make_chunk_id(source: str, text: str, occurrence: int = 0) -> str:
+    """
+    Derive a deterministic document ID for a chunk.
+
+    Args:
+        source (str): Source name of the chunk.
+        text (str): Chunk text.
+        occurrence (int): Number of identical chunks that precede this one in the same source.
+
+    Returns:
+        str: A stable 32-character hex ID, identical for every ingest of the same content.
+    """
+    return hashlib.sha256(f"{source}\x00{occurrence}\x00{text}".encode("utf-8")).hexdigest()[:32]
+
+
+def write_chunks(collection, chunks: list[str], ids: list[str], metadatas: list[dict],
+                 progress: Callable[[str, int], None] = None) -> IngestStats:
     """
-    Store a list of text chunks into a ChromaDB collection.
+    Embed chunks and upsert them into the collection.
+
+    Embeddings are computed by the shared embedding engine of the collection's model in configurable batches
+    (reusing cached vectors of unchanged text) and passed to `collection.upsert` in
+    slices of `WRITE_BATCH_SIZE`.
 
     Args:
         collection (chromadb.api.models.Collection.Collection): ChromaDB collection object.
-        chunks (list[str]): List of text chunks to store.
-        file_path (str): Source file path for metadata.
+        chunks (list[str]): Text chunks to write.
+        ids (list[str]): Document ID per chunk.
+        metadatas (list[dict]): Metadata per chunk.
+        progress (Callable[[str, int], None]): Optional callback receiving ("embedded", n) and
+            ("written", n) as the batch advances.
+
+    Returns:
+        IngestStats: Chunk and token counts with embedding and write timings.
     """
-    if not chunks:
-        logger.info("No documents to add to the collection")
-        return
+    stats = IngestStats()
+
+    start = time.perf_counter()
+    embeddings = registry.embedding_func_for(collection).embed(chunks, stats=stats)
+    stats.embed_seconds = time.perf_counter() - start
+    record_stage("ingest", "embed", stats.embed_seconds)
+    if progress:
+        progress("embedded", len(chunks))
+
+    start = time.perf_counter()
+    step = ChromaDBConfig.WRITE_BATCH_SIZE
+    for i in range(0, len(chunks), step):
+        collection.upsert(
+            documents=chunks[i:i + step],
+            embeddings=embeddings[i:i + step],
+            ids=ids[i:i + step],
+            metadatas=metadatas[i:i + step]
+        )
+        if progress:
+            progress("written", len(ids[i:i + step]))
+    stats.write_seconds = time.perf_counter() - start
+    record_stage("ingest", "write", stats.write_seconds)
+    get_lexical_index(collection.name).add(ids, chunks, metadatas)
+    registry.mark_collection_changed(collection.name)
+
+    stats.chunks = len(chunks)
+    stats.tokens = sum(
+        len(token_ids) for token_ids in registry.tokenizer(chunks, add_special_tokens=False)["input_ids"]
+    )
+    INGESTED_CHUNKS.inc(stats.chunks)
+    INGESTED_TOKENS.inc(stats.tokens)
+    return stats
 
-    logger.info(Messages.ADDING_DOCUMENTS)
 
-    ids = [str(uuid.uuid4()) for _ in range(len(chunks))]
+def build_chunk_records(chunks: list[str], source: str, start_index: int = 0,
+                        occurrences: Counter = None,
+                        chunk_metadatas: list[dict] = None) -> tuple[list[str], list[dict]]:
+    """
+    Build the deterministic IDs and metadata of a source's chunks.
+
+    Args:
+        chunks (list[str]): Text chunks, in source order.
+        source (str): Source name stored in the chunk metadata.
+        start_index (int): Position of the first chunk within its source.
+        occurrences (Counter): Per-text counts of the chunks already seen in this source,
+            shared between batches of the same source.
+        chunk_metadatas (list[dict]): Optional extra metadata per chunk from the chunker,
+            e.g. its `section`.
+
+    Returns:
+        tuple[list[str], list[dict]]: One ID and one metadata dict per chunk.
+    """
+    occurrences = Counter() if occurrences is None else occurrences
+    ids = []
+    for chunk in chunks:
+        digest = content_hash(chunk)
+        ids.append(make_chunk_id(source, chunk, occurrences[digest]))
+        occurrences[digest] += 1
     metadatas = [
         {
-            MetadataKeys.LINE_NUMBER: i,
-            MetadataKeys.SOURCE: file_path,  # full path for consistency with delete()
+            **(chunk_metadatas[i] if chunk_metadatas else {}),
+            MetadataKeys.LINE_NUMBER: start_index + i,
+            MetadataKeys.SOURCE: source,  # full path for consistency with delete()
         }
         for i in range(len(chunks))
     ]
+    return ids, metadatas
 
-    collection.add(documents=chunks, ids=ids, metadatas=metadatas)
-    logger.info(Messages.DOCUMENTS_ADDED)
 
+def store_chunk_records(collection, chunks: list[str], ids: list[str], metadatas: list[dict],
+                        existing: dict[str, int] = None,
+                        progress: Callable[[str, int], None] = None) -> IngestStats:
+    """
+    Write chunks with prepared IDs and metadata, skipping the ones already stored.
+
+    Chunks whose ID is already stored are not embedded again; only their line number is
+    refreshed when it moved. All other chunks are embedded and upserted. The chunks may
+    come from several sources.
+
+    Args:
+        collection (chromadb.api.models.Collection.Collection): ChromaDB collection object.
+        chunks (list[str]): Text chunks to store.
+        ids (list[str]): Deterministic ID per chunk, from `build_chunk_records`.
+        metadatas (list[dict]): Metadata per chunk, from `build_chunk_records`.
+        existing (dict[str, int]): Stored IDs mapped to their line number (see
+            `get_source_chunk_lines`). Matched IDs are removed from it. Looked up by ID when omitted.
+        progress (Callable[[str, int], None]): Optional callback receiving ("processed", n),
+            ("embedded", n) and ("written", n) as the batch advances.
+
+    Returns:
+        IngestStats: Chunk and token counts with embedding and write timings.
+    """
+    if existing is None:
+        found = collection.get(ids=ids, include=['metadatas'])
+        stored_lines = {id: meta[MetadataKeys.LINE_NUMBER] for id, meta in zip(found['ids'], found['metadatas'])}
+    else:
+        stored_lines = {id: existing.pop(id) for id in ids if id in existing}
+
+    new = [i for i, id in enumerate(ids) if id not in stored_lines]
+    moved = [
+        i for i, id in enumerate(ids)
+        if id in stored_lines and stored_lines[id] != metadatas[i][MetadataKeys.LINE_NUMBER]
+    ]
+
+    stats = IngestStats()
+    if new:
+        stats = write_chunks(
+            collection, [chunks[i] for i in new], [ids[i] for i in new], [metadatas[i] for i in new],
+            progress=progress
+        )
+    if moved:
+        collection.update(ids=[ids[i] for i in moved], metadatas=[metadatas[i] for i in moved])
+        registry.mark_collection_changed(collection.name)
+    stats.added = len(new)
+    stats.updated = len(moved)
+    stats.unchanged = len(chunks) - len(new) - len(moved)
+    if progress:
+        progress("processed", len(chunks))
+    return stats
+
+
+def store_in_collection(collection, chunks: list[str], file_path: str, start_index: int = 0,
+                        occurrences: Counter = None, existing: dict[str, int] = None,
+                        progress: Callable[[str, int], None] = None,
+                        chunk_metadatas: list[dict] = None) -> IngestStats:
+    """
+    Store a list of text chunks into a ChromaDB collection, idempotently.
+
+    Every chunk gets a deterministic ID (see `make_chunk_id`), so storing the same
+    content twice never duplicates it (see `store_chunk_records`).
+
+    Args:
+        collection (chromadb.api.models.Collection.Collection): ChromaDB collection object.
+        chunks (list[str]): List of text chunks to store.
+        file_path (str): Source file path for metadata.
+        start_index (int): Position of the first chunk within its file, used when a file
+            is stored in several batches.
+        occurrences (Counter): Per-text counts of the chunks already seen in this file,
+            shared between batches of the same file.
+        existing (dict[str, int]): Stored IDs of this file mapped to their line number (see
+            `get_source_chunk_lines`). Matched IDs are removed from it. Looked up per batch when omitted.
+        progress (Callable[[str, int], None]): Optional callback receiving ("processed", n),
+            ("embedded", n) and ("written", n) as the batch advances.
+        chunk_metadatas (list[dict]): Optional extra metadata per chunk, see `build_chunk_records`.
+
+    Returns:
+        IngestStats: Chunk and token counts with embedding and write timings.
+    """
+    if not chunks:
+        logger.info("No documents to add to the collection")
+        return IngestStats()
+
+    logger.info(Messages.ADDING_DOCUMENTS)
+    ids, metadatas = build_chunk_records(chunks, file_path, start_index, occurrences, chunk_metadatas)
+    stats = store_chunk_records(collection, chunks, ids, metadatas, existing=existing, progress=progress)
+    logger.info(Messages.DOCUMENTS_ADDED)
+    return stats
 
 
 def get_collection_documents(collection) -> dict[str, tuple[str, str]]:
@@ -182,6 +463,212 @@ def get_collection_documents(collection) -> dict[str, tuple[str, str]]:
     }
 
 
+def build_where(source: str = None, where: dict = None) -> dict:
+    """
+    Combine a source filter and a metadata filter into one Chroma `where` clause.
+
+    Args:
+        source (str): Only match the chunks of this source.
+        where (dict): Additional Chroma metadata filter.
+
+    Returns:
+        dict | None: The combined filter, or None when there is nothing to filter on.
+    """
+    clauses = []
+    if source is not None:
+        clauses.append({MetadataKeys.SOURCE: source})
+    if where:
+        clauses.append(where)
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+def _check_where_operators(where: dict) -> None:
+    """Reject `$` keys other than `$and`/`$or` at the logical level, which Chroma only rejects at query time."""
+    for key, value in where.items():
+        if key in ("$and", "$or"):
+            for clause in value:
+                _check_where_operators(clause)
+        elif key.startswith("$"):
+            raise ValueError(f"Expected where to combine clauses with $and or $or, got {key}")
+
+
+def validate_filters(where: dict = None, where_document: dict = None) -> tuple[dict, dict]:
+    """
+    Check a metadata filter and a document filter before they are used in a query.
+
+    Args:
+        where (dict): Chroma metadata filter, e.g. `{"source": "HR_Policy_Dataset1.txt"}` or
+            `{"tags": {"$contains": "leave"}}`.
+        where_document (dict): Chroma document filter, e.g. `{"$contains": "sick leave"}`.
+
+    Returns:
+        tuple[dict, dict]: Both filters, with empty ones replaced by None.
+
+    Raises:
+        ValueError: If a filter is malformed.
+    """
+    where = where or None
+    where_document = where_document or None
+    if where is not None:
+        validate_where(where)
+        _check_where_operators(where)
+    if where_document is not None:
+        validate_where_document(where_document)
+    return where, where_document
+
+
+def get_matching_ids(collection, where: dict = None, where_document: dict = None) -> set[str]:
+    """
+    Return the IDs of the documents matching a metadata and/or document filter.
+
+    Only IDs are read, so the lookup is answered from Chroma's metadata index and
+    full-text index without loading documents or embeddings.
+
+    Args:
+        collection (chromadb.api.models.Collection.Collection): ChromaDB collection object.
+        where (dict): Optional Chroma metadata filter.
+        where_document (dict): Optional Chroma document filter.
+
+    Returns:
+        set[str]: IDs of the matching documents.
+    """
+    return set(collection.get(where=where, where_document=where_document, include=[])['ids'])
+
+
+def get_documents_page(collection, limit: int, offset: int = 0, where: dict = None) -> tuple[dict, int]:
+    """
+    Read one page of documents, with the limit and offset pushed down to Chroma.
+
+    One extra row is requested to find out whether another page follows.
+
+    Args:
+        collection (chromadb.api.models.Collection.Collection): ChromaDB collection object.
+        limit (int): Maximum number of documents to return.
+        offset (int): Number of matching documents to skip.
+        where (dict): Optional Chroma metadata filter.
+
+    Returns:
+        tuple[dict, int]: The `collection.get` result trimmed to `limit` rows, and the
+        offset of the next page (None on the last page).
+    """
+    results = collection.get(where=where, limit=limit + 1, offset=offset, include=['documents', 'metadatas'])
+    next_offset = None
+    if len(results['ids']) > limit:
+        next_offset = offset + limit
+        for key in ('ids', 'documents', 'metadatas'):
+            results[key] = results[key][:limit]
+    return results, next_offset
+
+
+def iter_collection_documents(collection, where: dict = None,
+                              page_size: int = ChromaDBConfig.STREAM_PAGE_SIZE) -> Iterator[tuple[str, str, dict]]:
+    """
+    Iterate over the documents of a collection page by page.
+
+    Only one page is held in memory at a time, whatever the collection size.
+
+    Args:
+        collection (chromadb.api.models.Collection.Collection): ChromaDB collection object.
+        where (dict): Optional Chroma metadata filter.
+        page_size (int): Number of documents read per `collection.get` call.
+
+    Yields:
+        tuple[str, str, dict]: (ID, document text, metadata) of each document.
+    """
+    offset = 0
+    while True:
+        results = collection.get(where=where, limit=page_size, offset=offset, include=['documents', 'metadatas'])
+        yield from zip(results['ids'], results['documents'], results['metadatas'])
+        if len(results['ids']) < page_size:
+            return
+        offset += page_size
+
+
+def get_loaded_lexical_index(collection):
+    """
+    Return the BM25 index of a collection, building it from the collection on first use.
+
+    The index is rebuilt when its size differs from the collection count, which picks
+    up chunks written or deleted by another process such as `ingest_cli.py`.
+
+    Args:
+        collection (chromadb.api.models.Collection.Collection): ChromaDB collection object.
+
+    Returns:
+        lexical_index.BM25Index: The collection's up-to-date lexical index.
+    """
+    index = get_lexical_index(collection.name)
+    index.ensure_current(collection.count(), lambda: iter_collection_documents(collection))
+    return index
+
+
+def copy_collection(source, target, progress: Callable[[str, int], None] = None,
+                    page_size: int = IndexConfig.REBUILD_PAGE_SIZE) -> IngestStats:
+    """
+    Copy every document of a collection into another, page by page.
+
+    Stored embeddings are copied as they are when both collections use the same
+    embedding model; otherwise the documents are re-embedded with the target's model.
+    Used to rebuild a collection with new index settings (see `ResourceRegistry.begin_rebuild`).
+
+    Args:
+        source (chromadb.api.models.Collection.Collection): Collection to copy from.
+        target (chromadb.api.models.Collection.Collection): Collection to copy into.
+        progress (Callable[[str, int], None]): Optional callback receiving ("processed", n),
+            ("embedded", n) and ("written", n) as pages are copied.
+        page_size (int): Documents read and written per page.
+
+    Returns:
+        IngestStats: Number of documents copied, with embedding and write timings.
+    """
+    reembed = CollectionConfig.from_collection(source).embedding_model != \
+        CollectionConfig.from_collection(target).embedding_model
+    include = ['documents', 'metadatas'] if reembed else ['documents', 'metadatas', 'embeddings']
+    stats = IngestStats()
+    offset = 0
+    while True:
+        page = source.get(limit=page_size, offset=offset, include=include)
+        if not page['ids']:
+            break
+        if reembed:
+            stats.merge(write_chunks(target, page['documents'], page['ids'], page['metadatas'], progress))
+        else:
+            start = time.perf_counter()
+            target.add(
+                ids=page['ids'], embeddings=page['embeddings'],
+                documents=page['documents'], metadatas=page['metadatas']
+            )
+            stats.write_seconds += time.perf_counter() - start
+            stats.chunks += len(page['ids'])
+            if progress:
+                progress("written", len(page['ids']))
+        if progress:
+            progress("processed", len(page['ids']))
+        offset += len(page['ids'])
+    stats.added = offset
+    logger.info(f"Copied {offset} documents from '{source.name}' into '{target.name}'")
+    return stats
+
+
+def get_source_chunk_lines(collection, source: str) -> dict[str, int]:
+    """
+    Retrieve the IDs and line numbers of the chunks stored for one source.
+
+    Only metadata is fetched, with a metadata-filtered get.
+
+    Args:
+        collection (chromadb.api.models.Collection.Collection): ChromaDB collection object.
+        source (str): Source name to look up.
+
+    Returns:
+        dict[str, int]: Mapping of document ID to its line number.
+    """
+    data = collection.get(where={MetadataKeys.SOURCE: source}, include=['metadatas'])
+    return {id: meta[MetadataKeys.LINE_NUMBER] for id, meta in zip(data['ids'], data['metadatas'])}
+
+
 def delete_documents(collection, ids: list[str]) -> None:
     """
     Delete documents from the collection by their IDs.
@@ -193,40 +680,144 @@ def delete_documents(collection, ids: list[str]) -> None:
     if ids:
         logger.info(f"Deleting {len(ids)} outdated documents")
         collection.delete(ids=ids)
+        get_lexical_index(collection.name).remove(ids)
+        registry.mark_collection_changed(collection.name)
 
 
+def delete_source_documents(collection, source: str) -> None:
+    """
+    Delete every chunk stored for a source.
 
+    Args:
+        collection (chromadb.api.models.Collection.Collection): ChromaDB collection object.
+        source (str): Source name whose chunks are deleted.
+    """
+    collection.delete(where={MetadataKeys.SOURCE: source})
+    get_lexical_index(collection.name).remove_source(source)
+    registry.mark_collection_changed(collection.name)
 
-def sync_text_file_with_collection(collection, file_path: str, force: bool = False) -> None:
+
+def ingest_metadata(tags: list[str] = None) -> dict:
     """
-    Store a text file's content into the ChromaDB collection.
+    Metadata written to every chunk of one ingest, so retrieval can filter on it.
 
-    - New file: always adds chunks (even duplicates).
-    - Same file (with force=True): deletes old chunks of that file, then adds updated ones.
+    Chunks that are already stored unchanged keep the values of the ingest that first
+    stored them; re-ingest with `force=True` to re-tag a source.
+
+    Args:
+        tags (list[str]): Optional labels, matched with `{"tags": {"$contains": "<tag>"}}`.
+
+    Returns:
+        dict: The upload time (`uploaded_at`, Unix seconds) and the tags, if any.
+    """
+    metadata = {MetadataKeys.UPLOADED_AT: int(time.time())}
+    tags = sorted({tag.strip() for tag in tags or () if tag.strip()})
+    if tags:
+        metadata[MetadataKeys.TAGS] = tags
+    return metadata
+
+
+def sync_text_stream_with_collection(collection, blocks: Iterable[str], source: str, force: bool = False,
+                                     incremental: bool = False,
+                                     batch_size: int = ChromaDBConfig.INGEST_BATCH_SIZE,
+                                     progress: Callable[[str, int], None] = None,
+                                     chunking: str = None, tags: list[str] = None) -> IngestStats:
     """
-    logger.info(f"Processing file '{file_path}' into collection '{ChromaDBConfig.COLLECTION_NAME}'")
+    Chunk a stream of text blocks and store it in the collection in bounded batches.
 
-    ensure_text_file_exists(file_path)
-    new_chunks = read_text_file(file_path)
-    if not new_chunks:
-        logger.info("No new documents to process")
-        return
+    At most `batch_size` chunks are held (and embedded) at a time, so peak memory
+    does not depend on the size of the source.
+
+    - New source: adds its chunks; chunks already stored under the same ID are skipped.
+    - Same source (with force=True): deletes old chunks of that source before the first batch is written.
+    - Same source (with incremental=True): diffs against the stored chunks of that source and only
+      adds new chunks, moves shifted ones and deletes vanished ones. Takes precedence over `force`.
+
+    Args:
+        collection (chromadb.api.models.Collection.Collection): ChromaDB collection object.
+        blocks (Iterable[str]): Text blocks of the source, e.g. from `ReadDataClass.stream_file`.
+        source (str): Source name stored in the chunk metadata.
+        force (bool): Replace the chunks previously stored for this source.
+        incremental (bool): Sync only the differences with the chunks stored for this source.
+        batch_size (int): Number of chunks embedded and written per batch.
+        progress (Callable[[str, int], None]): Optional progress callback, see `store_in_collection`.
+        chunking (str): Chunking strategy, see `iter_chunks`.
+        tags (list[str]): Optional tags stored on every chunk, see `ingest_metadata`.
 
-    # If force=True → remove existing chunks from this file
-    if force:
-        logger.info(f"Force mode ON -> deleting old chunks for file: {file_path}")
-        try:
-            collection.delete(where={"source": file_path})
-            logger.info(f"Old chunks for file '{file_path}' deleted successfully")
-        except Exception as e:
-            logger.warning(f"No existing chunks found for file '{file_path}': {str(e)}")
+    Returns:
+        IngestStats: Throughput counters of the whole ingest.
+    """
+    logger.info(f"Processing '{source}' into collection '{collection.name}'")
+
+    stats = IngestStats()
+    stored = 0
+    batch = []
+    batch_metadatas = []
+    occurrences = Counter()
+    existing = get_source_chunk_lines(collection, source) if incremental else None
+    fields = ingest_metadata(tags)
+
+    def flush():
+        nonlocal stored, batch, batch_metadatas
+        # If force=True → remove existing chunks from this source, once, before the first write
+        if force and not incremental and stored == 0:
+            logger.info(f"Force mode ON -> deleting old chunks for file: {source}")
+            try:
+                delete_source_documents(collection, source)
+                logger.info(f"Old chunks for file '{source}' deleted successfully")
+            except Exception as e:
+                logger.warning(f"No existing chunks found for file '{source}': {str(e)}")
+        stats.merge(store_in_collection(
+            collection, batch, source, start_index=stored, occurrences=occurrences, existing=existing,
+            progress=progress, chunk_metadatas=batch_metadatas
+        ))
+        stored += len(batch)
+        batch, batch_metadatas = [], []
+
+    for chunk, chunk_metadata in iter_chunks(blocks, chunking):
+        batch.append(chunk)
+        batch_metadatas.append({**fields, **chunk_metadata})
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    if incremental:
+        vanished = list(existing)
+        delete_documents(collection, vanished)
+        stats.deleted = len(vanished)
+        logger.info(f"Incremental sync of '{source}': {stats.added} added, {stats.updated} updated, "
+                    f"{stats.deleted} deleted, {stats.unchanged} unchanged")
+
+    if stored == 0:
+        logger.info("No new documents to process")
+    else:
+        logger.info(Messages.DOCS_ADDED)
+        logger.info(f"Ingested {stats.chunks} chunks from '{source}': "
+                    f"{stats.chunks_per_second:.1f} chunks/s, {stats.tokens_per_second:.1f} tokens/s, "
+                    f"{stats.cache_hits} embedding cache hits")
+    return stats
 
-    # Always add new chunks (with file metadata)
-    store_in_collection(collection, new_chunks, file_path)
-    logger.info(Messages.DOCS_ADDED)
 
+def sync_text_file_with_collection(collection, file_path: str, force: bool = False,
+                                   incremental: bool = False, chunking: str = None,
+                                   tags: list[str] = None) -> IngestStats:
+    """
+    Store a text file's content into the ChromaDB collection.
 
+    The file is streamed block by block, see `sync_text_stream_with_collection`.
 
+    - New file: adds its chunks; chunks already stored under the same ID are skipped.
+    - Same file (with force=True): deletes old chunks of that file, then adds updated ones.
+    - Same file (with incremental=True): only writes and deletes the chunks that differ.
+    - `chunking` selects the chunking strategy, see `iter_chunks`; `tags` are stored on every chunk.
+    """
+    ensure_text_file_exists(file_path)
+    logger.info(Messages.OPENING_FILE.format(file_path=file_path))
+    return sync_text_stream_with_collection(
+        collection, ReadDataClass.stream_file(file_path), file_path, force=force, incremental=incremental,
+        chunking=chunking, tags=tags
+    )
 
 
 def initialize_collection():
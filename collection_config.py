@@ -0,0 +1,96 @@
+from dataclasses import asdict, dataclass, replace
+from typing import Optional
+from utils.enums import ChromaDBConfig, IndexConfig
+
+# Collection metadata key holding the embedding model the collection was created with
+EMBEDDING_MODEL_KEY = "embedding_model"
+
+# HNSW parameters Chroma can change on an existing collection; the others need a rebuild
+SEARCH_PARAMETERS = ("ef_search", "batch_size", "sync_threshold")
+
+
+@dataclass
+class CollectionConfig:
+    """
+    Settings of one collection: its embedding model, distance metric and HNSW parameters.
+
+    The embedding model is stored in the collection metadata and the index parameters
+    in Chroma's collection configuration, so both persist with the collection and are
+    read back whenever it is opened. Defaults come from `ChromaDBConfig` and
+    `IndexConfig`; HNSW parameters left unset keep Chroma's defaults.
+    """
+    embedding_model: str = ChromaDBConfig.EMBEDDING_MODEL
+    space: str = ChromaDBConfig.DISTANCE_SPACE  # cosine, l2 or ip
+    max_neighbors: Optional[int] = IndexConfig.MAX_NEIGHBORS or None  # HNSW M: graph degree
+    ef_construction: Optional[int] = IndexConfig.EF_CONSTRUCTION or None  # candidate list size while building
+    ef_search: Optional[int] = IndexConfig.EF_SEARCH or None  # candidate list size while querying
+    batch_size: Optional[int] = IndexConfig.BATCH_SIZE or None  # vectors buffered before they enter the graph
+    sync_threshold: Optional[int] = IndexConfig.SYNC_THRESHOLD or None  # vectors added between flushes to disk
+
+    def chroma_configuration(self) -> dict:
+        """The `configuration` argument for `create_collection`."""
+        hnsw = {
+            "space": self.space,
+            "max_neighbors": self.max_neighbors,
+            "ef_construction": self.ef_construction,
+            "ef_search": self.ef_search,
+            "batch_size": self.batch_size,
+            "sync_threshold": self.sync_threshold,
+        }
+        return {"hnsw": {key: value for key, value in hnsw.items() if value is not None}}
+
+    def chroma_metadata(self) -> dict:
+        """The `metadata` argument for `create_collection`."""
+        return {EMBEDDING_MODEL_KEY: self.embedding_model}
+
+    def merged(self, **overrides) -> "CollectionConfig":
+        """Return a copy with the given settings replaced; `None` values keep the current ones."""
+        return replace(self, **{key: value for key, value in overrides.items() if value is not None})
+
+    def differences(self, stored: "CollectionConfig") -> dict:
+        """
+        Compare these settings with those a collection was created with.
+
+        Settings left unset here, and settings Chroma did not persist, are not compared.
+
+        Args:
+            stored (CollectionConfig): Settings read with `from_collection`.
+
+        Returns:
+            dict: Setting name -> (configured value, stored value) for every setting that differs.
+        """
+        configured, actual = self.as_dict(), stored.as_dict()
+        return {
+            key: (value, actual[key]) for key, value in configured.items()
+            if value is not None and actual[key] is not None and value != actual[key]
+        }
+
+    @classmethod
+    def from_collection(cls, collection) -> "CollectionConfig":
+        """
+        Read the settings of an existing collection.
+
+        Collections created before the embedding model was recorded use the default model.
+
+        Args:
+            collection (chromadb.api.models.Collection.Collection): ChromaDB collection object.
+
+        Returns:
+            CollectionConfig: The collection's settings.
+        """
+        metadata = collection.metadata or {}
+        # The raw JSON: `collection.configuration` would rebuild the embedding function from it
+        hnsw = (collection.configuration_json or {}).get("hnsw") or {}
+        return cls(
+            embedding_model=metadata.get(EMBEDDING_MODEL_KEY, ChromaDBConfig.EMBEDDING_MODEL),
+            space=hnsw.get("space", metadata.get("hnsw:space", ChromaDBConfig.DISTANCE_SPACE)),
+            max_neighbors=hnsw.get("max_neighbors"),
+            ef_construction=hnsw.get("ef_construction"),
+            ef_search=hnsw.get("ef_search"),
+            # Chroma does not persist the batch size; it is only known while the handle that set it is open
+            batch_size=hnsw.get("batch_size"),
+            sync_threshold=hnsw.get("sync_threshold"),
+        )
+
+    def as_dict(self) -> dict:
+        return asdict(self)
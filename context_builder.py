@@ -0,0 +1,153 @@
+import re
+from dataclasses import dataclass, field
+from resource_registry import registry
+from utils.enums import ContextConfig, MetadataKeys
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+@dataclass
+class Passage:
+    """A stretch of consecutive chunks of one source, as packed into the prompt."""
+    source: str
+    text: str
+    rank: int  # best relevance rank among the merged chunks
+    line_numbers: list = field(default_factory=list)
+    tokens: int = 0
+
+
+def merge_overlapping(first: str, second: str, min_overlap: int = ContextConfig.MIN_OVERLAP_CHARS) -> str:
+    """
+    Join two consecutive chunks, writing the text they share only once.
+
+    Token-window chunks are slices of the source text that overlap by a few tokens, so
+    the end of `first` reappears verbatim at the start of `second`. Chunks stored before
+    chunking used character offsets hold decoded text, where `second` may start with a
+    word-piece fragment; for those the overlap is located by finding the tail of `first`
+    in the first half of `second`. Chunks without any overlap, such as consecutive
+    section chunks, are joined with a space.
+
+    Args:
+        first (str): The earlier chunk.
+        second (str): The following chunk.
+        min_overlap (int): Shortest shared text, in characters, treated as an overlap.
+
+    Returns:
+        str: The merged text.
+    """
+    if second in first:
+        return first
+    for size in range(min(len(first), len(second)), min_overlap - 1, -1):
+        if first.endswith(second[:size]):
+            return first + second[size:]
+    tail = first[-min_overlap:]
+    position = second.find(tail, 0, len(second) // 2 + len(tail))
+    if len(first) >= min_overlap and position != -1:
+        return first + second[position + len(tail):]
+    return f"{first} {second}"
+
+
+def _words(text: str) -> set:
+    return set(WORD_PATTERN.findall(text.lower()))
+
+
+def _is_near_duplicate(words: set, kept: list[set], threshold: float) -> bool:
+    # Share of the passage's words already covered by a kept passage
+    return bool(words) and any(len(words & other) / len(words) >= threshold for other in kept)
+
+
+def merge_adjacent_chunks(documents: list[str], metadatas: list[dict]) -> list[Passage]:
+    """
+    Merge retrieved chunks that are the same or neighbouring chunks of one source.
+
+    Args:
+        documents (list[str]): Retrieved chunks, most relevant first.
+        metadatas (list[dict]): Metadata per chunk (`source` and `line_number`).
+
+    Returns:
+        list[Passage]: Merged passages, most relevant first.
+    """
+    by_source = {}
+    passages = []
+    for rank, (text, metadata) in enumerate(zip(documents, metadatas)):
+        metadata = metadata or {}
+        source = metadata.get(MetadataKeys.SOURCE, "unknown")
+        line_number = metadata.get(MetadataKeys.LINE_NUMBER)
+        if line_number is None:
+            passages.append(Passage(source=source, text=text, rank=rank))
+        else:
+            by_source.setdefault(source, {}).setdefault(line_number, (rank, text))
+
+    for source, chunks in by_source.items():
+        passage = None
+        for line_number in sorted(chunks):
+            rank, text = chunks[line_number]
+            if passage is not None and line_number == passage.line_numbers[-1] + 1:
+                passage.text = merge_overlapping(passage.text, text)
+                passage.rank = min(passage.rank, rank)
+                passage.line_numbers.append(line_number)
+            else:
+                passage = Passage(source=source, text=text, rank=rank, line_numbers=[line_number])
+                passages.append(passage)
+
+    return sorted(passages, key=lambda passage: passage.rank)
+
+
+def build_context(documents: list[str], metadatas: list[dict], token_budget: int = ContextConfig.TOKEN_BUDGET,
+                  dedup_threshold: float = ContextConfig.DEDUP_THRESHOLD) -> list[Passage]:
+    """
+    Pack retrieved chunks into a deduplicated, token-budgeted context.
+
+    Neighbouring chunks of a source are merged (their overlap is kept once), passages
+    whose words mostly repeat a more relevant passage are dropped, and the rest are
+    added in relevance order while they fit in `token_budget`. If even the most
+    relevant passage does not fit, it is cut to the budget at a token boundary, keeping
+    the original text rather than a decoded copy.
+
+    Args:
+        documents (list[str]): Retrieved chunks, most relevant first.
+        metadatas (list[dict]): Metadata per chunk.
+        token_budget (int): Maximum number of context tokens.
+        dedup_threshold (float): Share of a passage's words already present in a more relevant
+            passage above which it is dropped as a near-duplicate.
+
+    Returns:
+        list[Passage]: The passages to put in the prompt, most relevant first.
+    """
+    passages = merge_adjacent_chunks(documents, metadatas)
+
+    unique, kept_words = [], []
+    for passage in passages:
+        words = _words(passage.text)
+        if _is_near_duplicate(words, kept_words, dedup_threshold):
+            continue
+        unique.append(passage)
+        kept_words.append(words)
+
+    if not unique:
+        return []
+    token_ids = registry.tokenizer([passage.text for passage in unique], add_special_tokens=False)["input_ids"]
+    selected, used = [], 0
+    for passage, ids in zip(unique, token_ids):
+        passage.tokens = len(ids)
+        if used + passage.tokens <= token_budget:
+            selected.append(passage)
+            used += passage.tokens
+    if not selected:
+        first, ids = unique[0], token_ids[0]
+        first.tokens = min(len(ids), token_budget)
+        if first.tokens:
+            offsets = registry.tokenizer(
+                first.text, add_special_tokens=False, return_offsets_mapping=True
+            )["offset_mapping"]
+            first.text = first.text[:offsets[first.tokens - 1][1]]
+        else:
+            first.text = ""
+        selected.append(first)
+
+    logger.debug(f"Packed {len(documents)} chunks into {len(selected)} passages "
+                 f"({sum(passage.tokens for passage in selected)} tokens)")
+    return selected
@@ -1,7 +1,12 @@
 from pydantic import BaseModel
-from typing import Dict
+from typing import Any, Dict, Literal, Optional
 
 
 
 class AskRequest(BaseModel):
-     query: str
\ No newline at end of file
+     query: str
+     max_chars: Optional[int] = None
+     retrieval_mode: Optional[Literal["vector", "lexical", "hybrid"]] = None  # defaults to RAG_RETRIEVAL_MODE
+     rerank: Optional[bool] = None  # defaults to RERANK_ENABLED
+     where: Optional[Dict[str, Any]] = None  # Chroma metadata filter, e.g. {"source": "HR_Policy_Dataset1.txt"}
+     where_document: Optional[Dict[str, Any]] = None  # Chroma document filter, e.g. {"$contains": "leave"}
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+from dtos.query_request import QueryRequest
+
+
+class BatchQueryRequest(BaseModel):
+    queries: list[QueryRequest]
+    answer: bool = True  # False -> retrieval only, no Gemini calls
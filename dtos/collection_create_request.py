@@ -0,0 +1,13 @@
+from typing import Literal, Optional
+from pydantic import BaseModel
+
+
+class CollectionCreateRequest(BaseModel):
+    name: str
+    embedding_model: Optional[str] = None  # defaults to the configured embedding model
+    space: Optional[Literal["cosine", "l2", "ip"]] = None  # defaults to the configured distance
+    max_neighbors: Optional[int] = None  # HNSW M; unset -> HNSW_MAX_NEIGHBORS or the Chroma default
+    ef_construction: Optional[int] = None
+    ef_search: Optional[int] = None
+    batch_size: Optional[int] = None
+    sync_threshold: Optional[int] = None
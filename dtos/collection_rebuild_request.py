@@ -0,0 +1,13 @@
+from typing import Literal, Optional
+from pydantic import BaseModel
+
+
+class CollectionRebuildRequest(BaseModel):
+    # Unset settings keep the collection's current value
+    embedding_model: Optional[str] = None  # a different model re-embeds every document
+    space: Optional[Literal["cosine", "l2", "ip"]] = None
+    max_neighbors: Optional[int] = None  # HNSW M
+    ef_construction: Optional[int] = None
+    ef_search: Optional[int] = None
+    batch_size: Optional[int] = None
+    sync_threshold: Optional[int] = None
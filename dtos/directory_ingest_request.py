@@ -0,0 +1,11 @@
+from typing import Literal, Optional
+from pydantic import BaseModel
+
+
+class DirectoryIngestRequest(BaseModel):
+    path: str
+    recursive: bool = True
+    force: bool = False
+    incremental: bool = False
+    chunking: Optional[Literal["token", "structure"]] = None
+    tags: Optional[list[str]] = None
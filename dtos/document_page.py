@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from typing import Optional
+from dtos.document import Document
+
+
+# One page of documents returned by the paginated /data endpoint.
+class DocumentPage(BaseModel):
+    items: list[Document]
+    limit: int
+    offset: int
+    next_offset: Optional[int] = None
@@ -0,0 +1,9 @@
+from typing import Optional
+from pydantic import BaseModel
+
+
+class IndexUpdateRequest(BaseModel):
+    # HNSW parameters that apply without a rebuild; unset ones are left unchanged
+    ef_search: Optional[int] = None
+    batch_size: Optional[int] = None
+    sync_threshold: Optional[int] = None
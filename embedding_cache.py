@@ -0,0 +1,130 @@
+import hashlib
+import sqlite3
+import threading
+import time
+import numpy as np
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def content_hash(text: str) -> str:
+    """Return the SHA-256 hex digest of a chunk's text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Persistent, size-bounded cache of embedding vectors.
+
+    Vectors are stored in a SQLite file keyed by (embedding model, SHA-256 of the chunk
+    text), so re-ingesting unchanged text skips the model entirely. When the cache grows
+    beyond `max_entries`, the least recently used vectors are evicted.
+    """
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "model TEXT NOT NULL, digest TEXT NOT NULL, vector BLOB NOT NULL, last_used REAL NOT NULL, "
+            "PRIMARY KEY (model, digest))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used)")
+        self._conn.commit()
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        logger.info(f"Opened embedding cache at {path} with {self._entries} entries")
+
+    def get_many(self, model: str, texts: list[str]) -> list:
+        """
+        Look up cached vectors for a list of texts.
+
+        Args:
+            model (str): Identifier of the embedding model.
+            texts (list[str]): Texts to look up.
+
+        Returns:
+            list[numpy.ndarray | None]: The cached vector per text, or None on a miss.
+        """
+        digests = [content_hash(text) for text in texts]
+        found = {}
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for i in range(0, len(digests), 500):
+                part = digests[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT digest, vector FROM embeddings WHERE model = ? AND digest IN ({','.join('?' * len(part))})",
+                    [model, *part]
+                ).fetchall()
+                found.update(rows)
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND digest = ?",
+                    [(now, model, digest) for digest in found]
+                )
+                self._conn.commit()
+
+        vectors = [
+            np.frombuffer(found[digest], dtype=np.float32) if digest in found else None
+            for digest in digests
+        ]
+        hits = sum(vector is not None for vector in vectors)
+        self.hits += hits
+        self.misses += len(vectors) - hits
+        return vectors
+
+    def put_many(self, model: str, texts: list[str], vectors: list) -> None:
+        """
+        Store vectors for a list of texts and evict the oldest entries beyond `max_entries`.
+
+        Args:
+            model (str): Identifier of the embedding model.
+            texts (list[str]): Texts the vectors were computed from.
+            vectors (list[numpy.ndarray]): One vector per text.
+        """
+        if not texts:
+            return
+        now = time.time()
+        rows = [
+            (model, content_hash(text), np.asarray(vector, dtype=np.float32).tobytes(), now)
+            for text, vector in zip(texts, vectors)
+        ]
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (model, digest, vector, last_used) VALUES (?, ?, ?, ?)", rows
+            )
+            self._entries += self._conn.total_changes - before
+            overflow = self._entries - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE rowid IN "
+                    "(SELECT rowid FROM embeddings ORDER BY last_used LIMIT ?)",
+                    (overflow,)
+                )
+                self._entries -= overflow
+                logger.info(f"Evicted {overflow} least recently used embeddings from the cache")
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """
+        Report cache size and hit/miss counters since process start.
+
+        Returns:
+            dict: Entry count, capacity, hits, misses and hit rate.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": self._entries,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
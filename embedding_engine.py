@@ -0,0 +1,177 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
+from embedding_cache import EmbeddingCache
+from utils.enums import EmbeddingConfig
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+@dataclass
+class IngestStats:
+    """Throughput and sync counters of one ingest run."""
+    chunks: int = 0
+    tokens: int = 0
+    embed_seconds: float = 0.0
+    write_seconds: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    added: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+
+    @property
+    def chunks_per_second(self) -> float:
+        elapsed = self.embed_seconds + self.write_seconds
+        return self.chunks / elapsed if elapsed else 0.0
+
+    @property
+    def tokens_per_second(self) -> float:
+        elapsed = self.embed_seconds + self.write_seconds
+        return self.tokens / elapsed if elapsed else 0.0
+
+    def merge(self, other: "IngestStats") -> None:
+        """Add the counters of another run (e.g. one batch) to this one."""
+        self.chunks += other.chunks
+        self.tokens += other.tokens
+        self.embed_seconds += other.embed_seconds
+        self.write_seconds += other.write_seconds
+        self.cache_hits += other.cache_hits
+        self.cache_misses += other.cache_misses
+        self.added += other.added
+        self.updated += other.updated
+        self.deleted += other.deleted
+        self.unchanged += other.unchanged
+
+    def as_dict(self) -> dict:
+        return {
+            "chunks": self.chunks,
+            "tokens": self.tokens,
+            "embed_seconds": round(self.embed_seconds, 3),
+            "write_seconds": round(self.write_seconds, 3),
+            "chunks_per_second": round(self.chunks_per_second, 2),
+            "tokens_per_second": round(self.tokens_per_second, 2),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "added": self.added,
+            "updated": self.updated,
+            "deleted": self.deleted,
+            "unchanged": self.unchanged,
+        }
+
+
+class EmbeddingEngine(SentenceTransformerEmbeddingFunction):
+    """
+    SentenceTransformer embedding function that embeds in configurable batches.
+
+    Batches are encoded on a small thread pool (the model releases the GIL while it
+    runs), and the model can be loaded with the ONNX or OpenVINO backend, optionally
+    from a quantized model file. It stays a `SentenceTransformerEmbeddingFunction`,
+    so Chroma treats it exactly like the function the collection was created with.
+
+    With an `EmbeddingCache`, document embeddings are looked up by content hash first
+    and only the misses are run through the model.
+    """
+
+    # Loaded models by model name, device and backend options, shared by every engine using them
+    _loaded_models = {}
+    _models_lock = threading.Lock()
+
+    def __init__(self, model_name: str, cache: EmbeddingCache = None, batch_size: int = EmbeddingConfig.BATCH_SIZE,
+                 num_workers: int = EmbeddingConfig.NUM_WORKERS, backend: str = EmbeddingConfig.BACKEND,
+                 device: str = EmbeddingConfig.DEVICE, onnx_file_name: str = EmbeddingConfig.ONNX_FILE_NAME,
+                 torch_threads: int = EmbeddingConfig.TORCH_THREADS):
+        kwargs = {}
+        if backend != "torch":
+            kwargs["backend"] = backend
+            if onnx_file_name:
+                kwargs["model_kwargs"] = {"file_name": onnx_file_name}
+        if torch_threads > 0:
+            import torch
+            torch.set_num_threads(torch_threads)
+
+        # Not `super().__init__`: its model cache is keyed by model name only, so an engine with
+        # another backend or model file would silently get the first one loaded
+        self.model_name = model_name
+        self.device = device
+        self.normalize_embeddings = False
+        self.kwargs = kwargs
+        self._model = self._load_model(model_name, device, kwargs)
+        self.cache = cache
+        # Vectors differ between backends and model files, so they are cached separately
+        self.cache_key = f"{model_name}|{backend}|{onnx_file_name}|{self.normalize_embeddings}"
+        self.batch_size = max(1, batch_size)
+        self.num_workers = max(1, num_workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.num_workers, thread_name_prefix="embed") \
+            if self.num_workers > 1 else None
+        logger.info(f"Embedding engine ready: backend={backend}, batch_size={self.batch_size}, "
+                    f"workers={self.num_workers}")
+
+    @classmethod
+    def _load_model(cls, model_name: str, device: str, kwargs: dict):
+        """Return the SentenceTransformer for these settings, loading it on first use."""
+        key = (model_name, device, json.dumps(kwargs, sort_keys=True))
+        with cls._models_lock:
+            if key not in cls._loaded_models:
+                try:
+                    from sentence_transformers import SentenceTransformer
+                except ImportError:
+                    raise ValueError(
+                        "The sentence_transformers python package is not installed. "
+                        "Please install it with `pip install sentence_transformers`"
+                    )
+                cls._loaded_models[key] = SentenceTransformer(model_name_or_path=model_name, device=device, **kwargs)
+            return cls._loaded_models[key]
+
+    def _encode(self, texts: list[str]):
+        return self._model.encode(
+            texts,
+            batch_size=len(texts),
+            convert_to_numpy=True,
+            normalize_embeddings=self.normalize_embeddings,
+        )
+
+    def _embed_uncached(self, texts: list[str]) -> list:
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        if self._executor is not None and len(batches) > 1:
+            results = self._executor.map(self._encode, batches)
+        else:
+            results = map(self._encode, batches)
+        return [vector.astype("float32") for batch in results for vector in batch]
+
+    def embed(self, texts: list[str], use_cache: bool = True, stats: IngestStats = None) -> list:
+        """
+        Embed texts in batches of `batch_size`, spread over the worker threads.
+
+        Args:
+            texts (list[str]): Texts to embed.
+            use_cache (bool): Reuse and store vectors in the embedding cache, if one is configured.
+            stats (IngestStats): Optional counters that receive the cache hits and misses.
+
+        Returns:
+            list[numpy.ndarray]: One float32 vector per text, in input order.
+        """
+        if not texts:
+            return []
+        if self.cache is None or not use_cache:
+            return self._embed_uncached(texts)
+
+        vectors = self.cache.get_many(self.cache_key, texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            computed = self._embed_uncached([texts[i] for i in missing])
+            for i, vector in zip(missing, computed):
+                vectors[i] = vector
+            self.cache.put_many(self.cache_key, [texts[i] for i in missing], computed)
+        if stats is not None:
+            stats.cache_hits += len(texts) - len(missing)
+            stats.cache_misses += len(missing)
+        return vectors
+
+    def __call__(self, input):
+        # Query embeddings are not worth a cache round trip
+        return self.embed(list(input), use_cache=False)
@@ -1,30 +1,219 @@
+import asyncio
+import json
 import os
-from dotenv import load_dotenv
+import random
+import time
+from typing import AsyncIterator
 import google.generativeai as genai
+import httpx
+from google.api_core import exceptions as google_exceptions
+from utils.enums import GeminiConfig
+from utils.logger import setup_logger
+from utils.metrics import LLM_ERRORS, record_stage, timed
 
-# Load environment variables
-load_dotenv()
+logger = setup_logger(__name__)
 
-# Get API key
-API_KEY = os.getenv("GEMINI_API_KEY")
-if not API_KEY:
-    raise RuntimeError(" GEMINI_API_KEY is not configured in .env file")
+# Errors worth another attempt: rate limiting, transient server errors and timeouts
+RETRYABLE_ERRORS = (
+    asyncio.TimeoutError,
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.DeadlineExceeded,
+)
 
-# Configure Gemini API
-genai.configure(api_key=API_KEY)
 
-# Create a reusable model instance
-_model = genai.GenerativeModel("gemini-2.5-flash")
+class GeminiClient:
+    """
+    Shared, non-blocking Gemini client.
+
+    Calls go through the SDK's async API on one reusable model instance (and therefore
+    one connection pool), each attempt is bounded by a timeout, transient failures are
+    retried with exponential backoff, and a semaphore caps the number of calls in flight.
+    Call durations (including the wait for a free slot) are recorded as the `llm` stage.
 
-def ask_gemini(question: str) -> str:
+    When `api_endpoint` is set, the same calls are made against that Gemini-compatible
+    REST endpoint over one pooled async HTTP client instead.
     """
-    Sends a question to the Gemini API and returns the answer as plain text.
+
+    def __init__(self, model_name: str = GeminiConfig.MODEL_NAME, timeout: float = GeminiConfig.TIMEOUT_SECONDS,
+                 max_retries: int = GeminiConfig.MAX_RETRIES, backoff: float = GeminiConfig.RETRY_BACKOFF_SECONDS,
+                 max_concurrency: int = GeminiConfig.MAX_CONCURRENCY, api_endpoint: str = GeminiConfig.API_ENDPOINT):
+        api_key = os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            raise RuntimeError("GEMINI_API_KEY is not set in environment variables")
+        genai.configure(api_key=api_key)
+        self.model_name = model_name
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._model = genai.GenerativeModel(model_name)
+        self._http = None
+        if api_endpoint:
+            self._http = httpx.AsyncClient(
+                base_url=api_endpoint.rstrip("/"),
+                params={"key": api_key},
+                timeout=None,  # attempts are bounded by asyncio.wait_for
+                limits=httpx.Limits(max_connections=max_concurrency)
+            )
+            logger.info(f"Gemini calls go to the REST endpoint {api_endpoint}")
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        logger.info(f"Initialized Gemini client for {model_name} (max {max_concurrency} concurrent calls)")
+
+    def _rest_path(self, method: str) -> str:
+        return f"/v1beta/models/{self.model_name}:{method}"
+
+    @staticmethod
+    def _rest_body(prompt: str) -> dict:
+        return {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+
+    @staticmethod
+    def _rest_text(payload: dict) -> str:
+        candidates = payload.get("candidates") or [{}]
+        parts = (candidates[0].get("content") or {}).get("parts") or []
+        return "".join(part.get("text", "") for part in parts)
+
+    @staticmethod
+    def _raise_for_status(response: httpx.Response) -> None:
+        if response.is_error:
+            # Map to the SDK's exceptions so the retry policy treats both transports alike
+            raise google_exceptions.from_http_status(response.status_code, response.reason_phrase)
+
+    async def _complete(self, prompt: str) -> str:
+        """Run one generation and return its raw text."""
+        if self._http is None:
+            response = await self._model.generate_content_async(prompt)
+            return response.text or ""
+        response = await self._http.post(self._rest_path("generateContent"), json=self._rest_body(prompt))
+        self._raise_for_status(response)
+        return self._rest_text(response.json())
+
+    async def _pieces(self, prompt: str) -> AsyncIterator[str]:
+        """Run one streamed generation and yield the text of each piece."""
+        if self._http is None:
+            response = await self._model.generate_content_async(prompt, stream=True)
+            async for piece in response:
+                yield piece.text or ""
+            return
+        async with self._http.stream(
+            "POST", self._rest_path("streamGenerateContent"), params={"alt": "sse"}, json=self._rest_body(prompt)
+        ) as response:
+            self._raise_for_status(response)
+            async for line in response.aiter_lines():
+                if line.startswith("data:"):
+                    yield self._rest_text(json.loads(line[len("data:"):]))
+
+    async def generate(self, prompt: str, timeout: float = None) -> str:
+        """
+        Generate a completion for a prompt.
+
+        Args:
+            prompt (str): The prompt to send.
+            timeout (float): Per-attempt timeout in seconds; defaults to the configured one.
+
+        Returns:
+            str: The stripped answer text.
+
+        Raises:
+            asyncio.TimeoutError: If the last attempt timed out.
+            Exception: Any non-retryable error from the Gemini API, or the last retryable one.
+        """
+        timeout = timeout or self.timeout
+        try:
+            with timed("retrieval", "llm"):
+                async with self._semaphore:
+                    for attempt in range(self.max_retries + 1):
+                        try:
+                            return (await asyncio.wait_for(self._complete(prompt), timeout)).strip()
+                        except RETRYABLE_ERRORS as e:
+                            if attempt == self.max_retries:
+                                raise
+                            delay = self.backoff * (2 ** attempt) * (1 + random.random())
+                            logger.warning(f"Gemini call failed ({type(e).__name__}), retrying in {delay:.2f}s")
+                            await asyncio.sleep(delay)
+        except Exception as e:
+            LLM_ERRORS.inc(reason=type(e).__name__)
+            raise
+
+    async def stream(self, prompt: str, max_chars: int = None, timeout: float = None) -> AsyncIterator[str]:
+        """
+        Stream a completion for a prompt, piece by piece, as Gemini produces it.
+
+        Retries only happen before the first piece is received. Once `max_chars`
+        characters have been produced the stream is closed, which stops generation
+        instead of discarding the rest afterwards. The time to the first piece is
+        recorded as the `llm_first_token` stage and the whole stream as `llm`.
+
+        Args:
+            prompt (str): The prompt to send.
+            max_chars (int): Optional cap on the number of characters produced.
+            timeout (float): Timeout in seconds for the first piece and between pieces.
+
+        Yields:
+            str: Consecutive pieces of the answer text.
+        """
+        timeout = timeout or self.timeout
+        start = time.perf_counter()
+        pieces = self._stream(prompt, max_chars, timeout, start)
+        try:
+            async for text in pieces:
+                yield text
+        except Exception as e:
+            LLM_ERRORS.inc(reason=type(e).__name__)
+            raise
+        finally:
+            await pieces.aclose()
+            record_stage("retrieval", "llm", time.perf_counter() - start)
+
+    async def _stream(self, prompt: str, max_chars: int, timeout: float, start: float) -> AsyncIterator[str]:
+        """The retrying, capped stream behind `stream`; `start` is when the call was made."""
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                pieces = self._pieces(prompt)
+                try:
+                    text = await asyncio.wait_for(pieces.__anext__(), timeout)
+                    record_stage("retrieval", "llm_first_token", time.perf_counter() - start)
+                    break
+                except StopAsyncIteration:
+                    return
+                except RETRYABLE_ERRORS as e:
+                    await pieces.aclose()
+                    if attempt == self.max_retries:
+                        raise
+                    delay = self.backoff * (2 ** attempt) * (1 + random.random())
+                    logger.warning(f"Gemini stream failed ({type(e).__name__}), retrying in {delay:.2f}s")
+                    await asyncio.sleep(delay)
+
+            try:
+                produced = 0
+                while True:
+                    if max_chars is not None and produced + len(text) >= max_chars:
+                        yield text[:max_chars - produced]
+                        logger.info(f"Gemini stream stopped at the {max_chars}-character cap")
+                        return
+                    produced += len(text)
+                    if text:
+                        yield text
+                    try:
+                        text = await asyncio.wait_for(pieces.__anext__(), timeout)
+                    except StopAsyncIteration:
+                        return
+            finally:
+                # Closing the underlying stream is what stops generation early
+                await pieces.aclose()
+
+
+_client = None
+
+
+def get_gemini_client() -> GeminiClient:
+    """
+    Return the process-wide Gemini client, creating it on first use.
+
+    Raises:
+        RuntimeError: If GEMINI_API_KEY is not configured.
     """
-    try:
-        response = _model.generate_content(question)
-        return response.text.strip()
-    except Exception as e:
-        return f"Error from Gemini API: {str(e)}"
-    
-
-    
+    global _client
+    if _client is None:
+        _client = GeminiClient()
+    return _client
@@ -0,0 +1,62 @@
+import argparse
+import json
+import os
+import shutil
+import tempfile
+from bulk_ingest import bulk_ingest, collect_text_files, extract_zip
+from chroma_functionalities import get_chroma_collection
+from utils.enums import ChromaDBConfig, ChunkingConfig, ChunkingStrategy, IngestConfig
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def main():
+    """
+    Bulk-ingest .txt files, directories of .txt files and .zip archives into the collection.
+
+    Example:
+        python ingest_cli.py raw_data/ --incremental
+    """
+    parser = argparse.ArgumentParser(description="Bulk ingest text files into ChromaDB.")
+    parser.add_argument("paths", nargs="+", help=".txt files, directories or .zip archives")
+    parser.add_argument("--force", action="store_true", help="replace the chunks stored for each file")
+    parser.add_argument("--incremental", action="store_true", help="only sync the chunks that changed")
+    parser.add_argument("--no-recursive", action="store_true", help="do not descend into sub-directories")
+    parser.add_argument("--workers", type=int, default=IngestConfig.CHUNK_PROCESSES, help="chunking processes")
+    parser.add_argument("--batch-size", type=int, default=ChromaDBConfig.INGEST_BATCH_SIZE,
+                        help="chunks embedded and written per batch")
+    parser.add_argument("--chunking", default=ChunkingConfig.STRATEGY,
+                        choices=[ChunkingStrategy.TOKEN, ChunkingStrategy.STRUCTURE], help="chunking strategy")
+    parser.add_argument("--collection", default=ChromaDBConfig.COLLECTION_NAME,
+                        help="collection to ingest into (created beforehand, except the default one)")
+    parser.add_argument("--tag", action="append", dest="tags", help="tag stored on every chunk (repeatable)")
+    args = parser.parse_args()
+
+    temp_dir = tempfile.mkdtemp(prefix="bulk_ingest_")
+    try:
+        files = []
+        for path in args.paths:
+            if os.path.isdir(path):
+                files.extend(collect_text_files(path, recursive=not args.no_recursive))
+            elif path.endswith(".zip"):
+                files.extend(extract_zip(path, os.path.join(temp_dir, str(len(files)))))
+            elif path.endswith(".txt"):
+                files.append((path, os.path.basename(path)))
+            else:
+                logger.warning(f"Skipping unsupported path '{path}'")
+        if not files:
+            parser.error("no .txt files found to ingest")
+
+        stats = bulk_ingest(
+            get_chroma_collection(args.collection), files, force=args.force, incremental=args.incremental,
+            workers=args.workers, batch_size=args.batch_size, chunking=args.chunking,
+            tags=args.tags
+        )
+        print(json.dumps({"files": len(files), **stats.as_dict()}, indent=2))
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
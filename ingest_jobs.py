@@ -0,0 +1,161 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable
+from utils.enums import IngestConfig, JobStatus
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+@dataclass
+class IngestJob:
+    """State and progress of one background ingestion."""
+    id: str
+    source: str
+    collection: str = None
+    status: str = JobStatus.QUEUED
+    chunks_processed: int = 0
+    chunks_embedded: int = 0
+    chunks_written: int = 0
+    created_at: float = field(default_factory=time.time)
+    started_at: float = None
+    finished_at: float = None
+    stats: dict = None
+    error: str = None
+
+    def report_progress(self, stage: str, count: int) -> None:
+        """Progress callback passed to the ingest functions."""
+        if stage == "processed":
+            self.chunks_processed += count
+        elif stage == "embedded":
+            self.chunks_embedded += count
+        elif stage == "written":
+            self.chunks_written += count
+
+    def as_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "source": self.source,
+            "collection": self.collection,
+            "status": self.status,
+            "chunks_processed": self.chunks_processed,
+            "chunks_embedded": self.chunks_embedded,
+            "chunks_written": self.chunks_written,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "stats": self.stats,
+            "error": self.error,
+        }
+
+
+class JobQueueFullError(RuntimeError):
+    """Raised when too many ingestion jobs are already waiting."""
+
+
+class IngestJobManager:
+    """
+    Runs ingestion jobs on a bounded thread pool, off the event loop.
+
+    Jobs of the same source in the same collection run one after another, so two
+    uploads of one file never interleave their writes. A job whose source is busy waits
+    in that source's queue rather than on a worker thread, and is handed to the pool
+    when the previous job finishes. Finished jobs are kept for status queries until
+    `max_jobs_kept` newer jobs exist.
+    """
+
+    def __init__(self, max_workers: int = IngestConfig.WORKERS, max_pending: int = IngestConfig.MAX_PENDING_JOBS,
+                 max_jobs_kept: int = IngestConfig.JOBS_KEPT):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingest")
+        self._max_pending = max_pending
+        self._max_jobs_kept = max_jobs_kept
+        self._jobs = OrderedDict()
+        # (collection, source) -> jobs waiting for the running job of that source; a key
+        # is present only while one of its jobs is running, so idle sources cost nothing
+        self._waiting = {}
+        self._lock = threading.Lock()
+
+    def submit(self, source: str, task: Callable, cleanup: Callable = None, collection: str = None) -> IngestJob:
+        """
+        Queue an ingestion.
+
+        Args:
+            source (str): Source name being ingested, used for reporting and per-source ordering.
+            task (Callable): Called with the job; must return an `IngestStats`.
+            cleanup (Callable): Optional callable run after the task, whatever its outcome.
+            collection (str): Collection the job writes to; sources are only ordered within one collection.
+
+        Returns:
+            IngestJob: The queued job.
+
+        Raises:
+            JobQueueFullError: If `max_pending` jobs are already queued.
+        """
+        with self._lock:
+            pending = sum(job.status == JobStatus.QUEUED for job in self._jobs.values())
+            if pending >= self._max_pending:
+                raise JobQueueFullError(f"Too many pending ingestion jobs ({pending})")
+            job = IngestJob(id=uuid.uuid4().hex, source=source, collection=collection)
+            self._jobs[job.id] = job
+            while len(self._jobs) > self._max_jobs_kept:
+                oldest_id, oldest = next(iter(self._jobs.items()))
+                if oldest.status in (JobStatus.QUEUED, JobStatus.RUNNING):
+                    break
+                del self._jobs[oldest_id]
+            key = (collection, source)
+            busy = key in self._waiting
+            if busy:
+                self._waiting[key].append((job, task, cleanup))
+            else:
+                self._waiting[key] = deque()
+
+        if not busy:
+            self._executor.submit(self._run, key, job, task, cleanup)
+        logger.info(f"Queued ingestion job {job.id} for '{source}'")
+        return job
+
+    def _run(self, key: tuple, job: IngestJob, task: Callable, cleanup: Callable) -> None:
+        try:
+            job.status = JobStatus.RUNNING
+            job.started_at = time.time()
+            stats = task(job)
+            job.stats = stats.as_dict()
+            job.status = JobStatus.COMPLETED
+            logger.info(f"Ingestion job {job.id} completed: {job.chunks_processed} chunks")
+        except Exception as e:
+            job.status = JobStatus.FAILED
+            job.error = str(e)
+            logger.error(f"Ingestion job {job.id} failed: {str(e)}")
+        finally:
+            job.finished_at = time.time()
+            try:
+                if cleanup is not None:
+                    cleanup()
+            finally:
+                self._start_next(key)
+
+    def _start_next(self, key: tuple) -> None:
+        """Hand the next waiting job of a source to the pool, or forget the source once it is idle."""
+        with self._lock:
+            waiting = self._waiting[key]
+            if not waiting:
+                del self._waiting[key]
+                return
+            job, task, cleanup = waiting.popleft()
+        self._executor.submit(self._run, key, job, task, cleanup)
+
+    def get(self, job_id: str) -> IngestJob:
+        """Return the job with the given ID, or None if it is unknown."""
+        return self._jobs.get(job_id)
+
+    def list(self) -> list[IngestJob]:
+        """Return the known jobs, oldest first."""
+        with self._lock:
+            return list(self._jobs.values())
+
+
+job_manager = IngestJobManager()
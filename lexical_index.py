@@ -0,0 +1,229 @@
+import heapq
+import math
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Callable, Collection, Iterable
+from utils.enums import LexicalConfig, MetadataKeys
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Words, numbers and dotted section numbers such as "1.2" or "e.g"
+TOKEN_PATTERN = re.compile(r"\w+(?:\.\w+)*")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase lexical terms."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    """
+    In-process BM25 inverted index over the chunks of one collection.
+
+    The index is built from the collection on first search and then kept in sync by
+    the write and delete helpers of `chroma_functionalities`. Updates that arrive
+    before the first build are ignored, since the build reads the collection anyway.
+    Writes made by another process (e.g. `ingest_cli.py`) bypass those helpers; they
+    are caught by comparing the index size with the collection count, see `ensure_current`.
+    """
+
+    def __init__(self, k1: float = LexicalConfig.K1, b: float = LexicalConfig.B,
+                 reload_interval: float = LexicalConfig.RELOAD_INTERVAL_SECONDS):
+        self.k1 = k1
+        self.b = b
+        self.reload_interval = reload_interval
+        self.loaded = False
+        self.loaded_at = None  # time.monotonic() of the last build
+        self._postings = defaultdict(dict)  # term -> {doc_id: term frequency}
+        self._lengths = {}  # doc_id -> number of terms
+        self._terms = {}  # doc_id -> distinct terms, to unindex a document
+        self._sources = defaultdict(set)  # source -> doc_ids
+        self._doc_sources = {}  # doc_id -> source
+        self._total_length = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def _remove(self, doc_id: str) -> None:
+        if doc_id not in self._lengths:
+            return
+        for term in self._terms.pop(doc_id):
+            postings = self._postings[term]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(doc_id)
+        source = self._doc_sources.pop(doc_id, None)
+        if source is not None:
+            self._sources[source].discard(doc_id)
+            if not self._sources[source]:
+                del self._sources[source]
+
+    def _add(self, doc_id: str, text: str, source: str = None) -> None:
+        self._remove(doc_id)
+        frequencies = Counter(tokenize(text))
+        for term, frequency in frequencies.items():
+            self._postings[term][doc_id] = frequency
+        length = sum(frequencies.values())
+        self._lengths[doc_id] = length
+        self._terms[doc_id] = tuple(frequencies)
+        self._total_length += length
+        if source is not None:
+            self._sources[source].add(doc_id)
+            self._doc_sources[doc_id] = source
+
+    def load(self, rows: Iterable[tuple[str, str, dict]]) -> None:
+        """
+        (Re)build the index from (ID, document text, metadata) rows.
+
+        Args:
+            rows (Iterable[tuple[str, str, dict]]): Every document of the collection.
+        """
+        with self._lock:
+            self.clear(loaded=False)
+            for doc_id, text, metadata in rows:
+                self._add(doc_id, text or "", (metadata or {}).get(MetadataKeys.SOURCE))
+            self.loaded = True
+            self.loaded_at = time.monotonic()
+        logger.info(f"Built BM25 index over {len(self)} documents")
+
+    def _is_current(self, count: int) -> bool:
+        if not self.loaded:
+            return False
+        # In-process writes briefly leave the sizes apart, so rebuild at most once per interval
+        return len(self) == count or time.monotonic() - self.loaded_at < self.reload_interval
+
+    def ensure_current(self, count: int, rows: Callable[[], Iterable[tuple[str, str, dict]]]) -> None:
+        """
+        Build the index, or rebuild it when its size no longer matches the collection.
+
+        A size mismatch means the collection was written to by another process, so the
+        index is rebuilt from the collection, at most once per `reload_interval` seconds.
+
+        Args:
+            count (int): Current number of documents in the collection.
+            rows (Callable[[], Iterable[tuple[str, str, dict]]]): Returns the rows to build from, see `load`.
+        """
+        if self._is_current(count):
+            return
+        with self._lock:
+            if self._is_current(count):
+                return
+            if self.loaded:
+                logger.info(f"Collection holds {count} documents but the BM25 index {len(self)}; rebuilding")
+            self.load(rows())
+
+    def add(self, ids: list[str], documents: list[str], metadatas: list[dict] = None) -> None:
+        """Index (or re-index) documents; a no-op until the index has been built."""
+        with self._lock:
+            if not self.loaded:
+                return
+            metadatas = metadatas or [None] * len(ids)
+            for doc_id, text, metadata in zip(ids, documents, metadatas):
+                self._add(doc_id, text or "", (metadata or {}).get(MetadataKeys.SOURCE))
+
+    def remove(self, ids: Iterable[str]) -> None:
+        """Unindex documents by ID."""
+        with self._lock:
+            for doc_id in ids:
+                self._remove(doc_id)
+
+    def remove_source(self, source: str) -> None:
+        """Unindex every document of a source."""
+        with self._lock:
+            for doc_id in list(self._sources.get(source, ())):
+                self._remove(doc_id)
+
+    def clear(self, loaded: bool = True) -> None:
+        """
+        Empty the index.
+
+        Args:
+            loaded (bool): Whether the empty index reflects the collection (e.g. after a
+                reset), or must be rebuilt before the next search.
+        """
+        with self._lock:
+            self._postings.clear()
+            self._lengths.clear()
+            self._terms.clear()
+            self._sources.clear()
+            self._doc_sources.clear()
+            self._total_length = 0
+            self.loaded = loaded
+
+    def search(self, query: str, k: int, allowed: Collection[str] = None) -> list[tuple[str, float]]:
+        """
+        Rank documents against a query with BM25.
+
+        Args:
+            query (str): Query text.
+            k (int): Number of results to return.
+            allowed (Collection[str]): Only rank these document IDs, e.g. the ones matching
+                a metadata filter. Statistics still cover the whole index.
+
+        Returns:
+            list[tuple[str, float]]: (document ID, score) pairs, best first.
+        """
+        with self._lock:
+            count = len(self._lengths)
+            if not count:
+                return []
+            average_length = self._total_length / count
+            scores = defaultdict(float)
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, frequency in postings.items():
+                    if allowed is not None and doc_id not in allowed:
+                        continue
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / average_length)
+                    scores[doc_id] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+            return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_lexical_index(collection_name: str) -> BM25Index:
+    """Return the BM25 index of a collection, creating an empty, unbuilt one on first use."""
+    with _indexes_lock:
+        if collection_name not in _indexes:
+            _indexes[collection_name] = BM25Index()
+        return _indexes[collection_name]
+
+
+def drop_lexical_index(collection_name: str) -> None:
+    """Forget the index of one collection, e.g. after it was deleted or evicted."""
+    with _indexes_lock:
+        _indexes.pop(collection_name, None)
+
+
+def drop_lexical_indexes() -> None:
+    """Forget every index, e.g. after the database was dropped."""
+    with _indexes_lock:
+        _indexes.clear()
+
+
+def reciprocal_rank_fusion(rankings: list[list[str]], k: int = LexicalConfig.RRF_K) -> list[str]:
+    """
+    Fuse several rankings of document IDs with reciprocal-rank fusion.
+
+    Args:
+        rankings (list[list[str]]): Document IDs of each ranking, best first.
+        k (int): Damping constant; larger values flatten the contribution of top ranks.
+
+    Returns:
+        list[str]: Every ranked ID, ordered by fused score.
+    """
+    scores = defaultdict(float)
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking):
+            scores[doc_id] += 1 / (k + rank + 1)
+    return sorted(scores, key=scores.get, reverse=True)
@@ -1,28 +1,58 @@
 import os
+import threading
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from dotenv import load_dotenv
 import google.generativeai as genai
 
 from routers.home_router import router as home_router
-from routers.chroma_router import router as chroma_router
-from routers.gemini_router import router as gemini_router
+from routers.chroma_router import collection_router as chroma_collection_router, router as chroma_router
+from routers.collections_router import router as collections_router
+from routers.gemini_router import collection_router as rag_collection_router, router as gemini_router
+from routers.jobs_router import router as jobs_router
 from chroma_functionalities import initialize_collection
+from resource_registry import registry
+from utils.enums import Endpoints
 from utils.logger import setup_logger
+from utils.request_timing import RequestTimingMiddleware
 
 # Initialize logger
 logger = setup_logger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Warm up the shared client, embedding model and tokenizer in the background,
+    so the server answers `/` and `/ready` while the model is still loading.
+    """
+    threading.Thread(target=registry.warm_up, name="resource-warm-up", daemon=True).start()
+    yield
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="AI & Chroma API",
     description="API with ChromaDB and Gemini AI integration",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Time every request: Prometheus metrics, optional Server-Timing header and slow-request log
+app.add_middleware(RequestTimingMiddleware)
+
 # Include routers
 app.include_router(home_router)
 app.include_router(chroma_router)
+app.include_router(chroma_collection_router)
+app.include_router(jobs_router)
 app.include_router(gemini_router, prefix="/api")
+app.include_router(rag_collection_router, prefix="/api")
+
+# The same data and RAG routes, scoped to one named collection
+app.include_router(collections_router)
+app.include_router(chroma_collection_router, prefix=Endpoints.COLLECTION_BY_NAME)
+app.include_router(rag_collection_router, prefix=Endpoints.COLLECTION_BY_NAME)
 
 
 
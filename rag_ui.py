@@ -1,3 +1,4 @@
+import json
 import streamlit as st
 import requests
 
@@ -39,27 +40,49 @@ st.write("Ask a question and choose your preferred mode in the sidebar to get an
 query = st.text_area("Enter your question here:", placeholder="e.g., What is the policy for remote work?")
 ask_btn = st.button("Get Answer", use_container_width=True, type="primary")
 
+def iter_sse(response):
+    """Yield (event, data) pairs from a Server-Sent Events response."""
+    event = "message"
+    for line in response.iter_lines(decode_unicode=True):
+        if line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            yield event, json.loads(line[len("data:"):].strip())
+            event = "message"
+
+
 if ask_btn and query.strip():
     with st.spinner("Fetching answer..."):
         try:
             if mode == "Based on my documents":
-                endpoint = f"{BASE_URL}/ask_rag"
+                endpoint = f"{BASE_URL}/ask_rag/stream"
                 payload = {"query": query}
             else:
-                endpoint = f"{BASE_URL}/ask-gemini"
+                endpoint = f"{BASE_URL}/ask-gemini/stream"
                 payload = {"question": query}
 
-            response = requests.post(endpoint, json=payload)
+            response = requests.post(endpoint, json=payload, stream=True)
 
             if response.status_code == 200:
-                data = response.json()
+                events = {}
+
+                def answer_tokens():
+                    # Render tokens as they arrive; keep the other events for later
+                    for event, data in iter_sse(response):
+                        if event == "token":
+                            yield data
+                        else:
+                            events[event] = data
+
                 st.subheader("Answer")
-                st.write(data.get("answer", "No answer returned."))
+                st.write_stream(answer_tokens())
+                if "error" in events:
+                    st.error(events["error"].get("detail", "Streaming failed."))
 
                 # Optional: show retrieved documents only in "Based on my documents" mode
-                # if mode == "Based on my documents" and "documents_used" in data:
+                # if mode == "Based on my documents" and "sources" in events:
                     # with st.expander("📄 Documents Used"):
-                    #     for i, doc in enumerate(data["documents_used"]):
+                    #     for i, doc in enumerate(events["sources"]):
                     #         st.markdown(f"**Source {i+1}:** {doc['metadata'].get('source','unknown')}")
                     #         st.text_area(
                     #             f"Document {i+1}",
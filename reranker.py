@@ -0,0 +1,132 @@
+import threading
+import time
+from collections import OrderedDict
+from embedding_cache import content_hash
+from utils.enums import EmbeddingConfig, RerankConfig
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class Reranker:
+    """
+    Optional cross-encoder reranking stage.
+
+    Candidate chunks are scored against their query by a small local cross-encoder,
+    all pairs of a request in one batched forward pass. Scores are kept in an LRU cache
+    keyed on (query, chunk content), and a latency budget skips reranking when scoring
+    the uncached pairs is expected to take longer than allowed.
+    """
+
+    def __init__(self, model_name: str = RerankConfig.MODEL_NAME, batch_size: int = RerankConfig.BATCH_SIZE,
+                 latency_budget_ms: float = RerankConfig.LATENCY_BUDGET_MS,
+                 cache_max_entries: int = RerankConfig.CACHE_MAX_ENTRIES):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.latency_budget = latency_budget_ms / 1000
+        self.cache_max_entries = cache_max_entries
+        self._model = None
+        self._scores = OrderedDict()  # (query, chunk hash) -> score
+        self._seconds_per_pair = None  # moving average of the measured scoring cost
+        self._lock = threading.Lock()
+        self.reranked = 0
+        self.skipped = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def model(self):
+        """The cross-encoder, loaded on first use."""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    from sentence_transformers import CrossEncoder
+                    self._model = CrossEncoder(self.model_name, device=EmbeddingConfig.DEVICE)
+                    logger.info(f"Initialized cross-encoder: {self.model_name}")
+        return self._model
+
+    def _score(self, pairs: list[tuple[str, str]]) -> list[float]:
+        start = time.perf_counter()
+        scores = self.model.predict(pairs, batch_size=self.batch_size, show_progress_bar=False)
+        cost = (time.perf_counter() - start) / len(pairs)
+        with self._lock:
+            if self._seconds_per_pair is None:
+                self._seconds_per_pair = cost
+            else:
+                self._seconds_per_pair = 0.8 * self._seconds_per_pair + 0.2 * cost
+        return [float(score) for score in scores]
+
+    def rerank_many(self, queries: list[str], candidates: list[tuple[list[str], list[dict]]],
+                    top_k: list[int]) -> list[tuple[list[str], list[dict]]]:
+        """
+        Rerank the candidates of several queries and keep the best of each.
+
+        When the estimated time to score the uncached pairs exceeds the latency budget,
+        the candidates keep their retrieval order instead.
+
+        Args:
+            queries (list[str]): Query texts.
+            candidates (list[tuple[list[str], list[dict]]]): Retrieved documents and their
+                metadata per query, best first.
+            top_k (list[int]): Number of documents to keep for each query.
+
+        Returns:
+            list[tuple[list[str], list[dict]]]: The kept documents and metadata per query, best first.
+        """
+        keys = [[(query, content_hash(doc)) for doc in docs] for query, (docs, _) in zip(queries, candidates)]
+        with self._lock:
+            scores = {key: self._scores[key] for row in keys for key in row if key in self._scores}
+            for key in scores:
+                self._scores.move_to_end(key)
+            seconds_per_pair = self._seconds_per_pair
+
+        missing = {}
+        for query, (docs, _), row in zip(queries, candidates, keys):
+            for doc, key in zip(docs, row):
+                if key not in scores:
+                    missing[key] = (query, doc)
+        self.cache_hits += sum(len(row) for row in keys) - len(missing)
+        self.cache_misses += len(missing)
+
+        if missing and seconds_per_pair is not None and len(missing) * seconds_per_pair > self.latency_budget:
+            self.skipped += len(queries)
+            logger.warning(f"Skipping rerank: {len(missing)} pairs would exceed the "
+                           f"{self.latency_budget * 1000:.0f} ms budget")
+            return [(docs[:k], metadatas[:k]) for (docs, metadatas), k in zip(candidates, top_k)]
+
+        if missing:
+            scores.update(zip(missing, self._score(list(missing.values()))))
+            with self._lock:
+                for key in missing:
+                    self._scores[key] = scores[key]
+                while len(self._scores) > self.cache_max_entries:
+                    self._scores.popitem(last=False)
+
+        self.reranked += len(queries)
+        results = []
+        for (docs, metadatas), row, k in zip(candidates, keys, top_k):
+            order = sorted(range(len(docs)), key=lambda i: scores[row[i]], reverse=True)[:k]
+            results.append(([docs[i] for i in order], [metadatas[i] for i in order]))
+        return results
+
+    def stats(self) -> dict:
+        """
+        Report reranking and score-cache counters since process start.
+
+        Returns:
+            dict: Reranked and skipped query counts, cache size and hit rate, and the
+            current per-pair cost estimate.
+        """
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "model": self.model_name,
+            "reranked_queries": self.reranked,
+            "skipped_queries": self.skipped,
+            "latency_budget_ms": self.latency_budget * 1000,
+            "ms_per_pair": round(self._seconds_per_pair * 1000, 3) if self._seconds_per_pair is not None else None,
+            "cache_entries": len(self._scores),
+            "cache_hit_rate": round(self.cache_hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+reranker = Reranker()
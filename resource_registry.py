@@ -0,0 +1,575 @@
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+import chromadb
+from chromadb.errors import NotFoundError
+from transformers import AutoTokenizer
+from collection_config import CollectionConfig
+from embedding_cache import EmbeddingCache
+from embedding_engine import EmbeddingEngine
+from lexical_index import drop_lexical_index, drop_lexical_indexes, get_lexical_index
+from reranker import reranker
+from utils.enums import ChromaDBConfig, EmbeddingConfig, IndexConfig, RerankConfig
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class CollectionNotFoundError(LookupError):
+    """Raised when a request targets a collection that does not exist."""
+
+
+class CollectionExistsError(ValueError):
+    """Raised when creating a collection under a name that is already taken."""
+
+
+class CollectionBusyError(RuntimeError):
+    """Raised when a collection is being rebuilt, or was written to while it was rebuilt."""
+
+
+class ResourceRegistry:
+    """
+    Process-wide owner of the heavy shared resources.
+
+    Holds exactly one ChromaDB client, one embedding function per embedding model (and
+    therefore one copy of each model) and one tokenizer per process, plus the open
+    collection handles. Every resource is built lazily on first access, or up front by
+    `warm_up()` from the FastAPI lifespan hook, so importing a module never loads a model.
+
+    A collection is addressed by its name. After a rebuild the name is an alias of the
+    Chroma collection built by it (see `begin_rebuild`); the aliases are kept in a JSON
+    file in the database directory so they survive restarts.
+    """
+
+    def __init__(self, max_open_collections: int = ChromaDBConfig.MAX_OPEN_COLLECTIONS):
+        self._lock = threading.RLock()
+        self._client = None
+        self._embedding_func = None
+        self._embedding_funcs = {}  # model name -> engine, for collections using another model
+        self._embedding_cache = None
+        self._tokenizer = None
+        self._collections = OrderedDict()  # name -> open handle, least recently used first
+        self.max_open_collections = max(1, max_open_collections)
+        self._collection_version = 0
+        self._changes = Counter()  # Chroma collection name -> writes, checked by rebuilds
+        self._aliases = None  # name -> Chroma collection serving it, loaded on first use
+        self._rebuilds = {}  # name -> Chroma collection a running rebuild copies into
+        self._ready = threading.Event()
+        self._warm_up_error = None
+        self._warm_up_seconds = None
+
+    @property
+    def client(self):
+        """
+        The shared persistent ChromaDB client.
+
+        Raises:
+            RuntimeError: If the client cannot be initialized.
+        """
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    persist_dir = os.path.join(os.getcwd(), ChromaDBConfig.DB_DIRECTORY)
+                    try:
+                        if not os.path.isdir(os.path.dirname(persist_dir)):
+                            raise RuntimeError(f"Invalid database directory path: {persist_dir}")
+                        self._client = chromadb.PersistentClient(path=persist_dir)
+                        logger.info(f"Initialized ChromaDB client at {persist_dir}")
+                    except Exception as e:
+                        logger.error(f"Failed to initialize ChromaDB client: {str(e)}")
+                        raise RuntimeError(f"Failed to initialize ChromaDB client: {str(e)}")
+        return self._client
+
+    @property
+    def embedding_cache(self):
+        """The shared persistent embedding cache, or None when it is disabled."""
+        if self._embedding_cache is None and EmbeddingConfig.CACHE_ENABLED:
+            with self._lock:
+                if self._embedding_cache is None:
+                    self._embedding_cache = EmbeddingCache(
+                        path=EmbeddingConfig.CACHE_PATH,
+                        max_entries=EmbeddingConfig.CACHE_MAX_ENTRIES
+                    )
+        return self._embedding_cache
+
+    @property
+    def embedding_func(self):
+        """
+        The shared embedding engine (a batched SentenceTransformer embedding function).
+
+        Raises:
+            RuntimeError: If the embedding model cannot be loaded.
+        """
+        if self._embedding_func is None:
+            with self._lock:
+                if self._embedding_func is None:
+                    try:
+                        self._embedding_func = EmbeddingEngine(
+                            model_name=ChromaDBConfig.EMBEDDING_MODEL,
+                            cache=self.embedding_cache
+                        )
+                        logger.info(f"Initialized embedding function: {ChromaDBConfig.EMBEDDING_MODEL}")
+                    except Exception as e:
+                        logger.error(f"Failed to initialize embedding function: {str(e)}")
+                        raise RuntimeError(f"Failed to initialize embedding function: {str(e)}")
+        return self._embedding_func
+
+    def get_embedding_func(self, model_name: str = None):
+        """
+        Return the shared embedding engine of a model, loading the model on first use.
+
+        Args:
+            model_name (str): Embedding model; defaults to the configured one.
+
+        Raises:
+            RuntimeError: If the embedding model cannot be loaded.
+        """
+        if model_name is None or model_name == ChromaDBConfig.EMBEDDING_MODEL:
+            return self.embedding_func
+        if model_name not in self._embedding_funcs:
+            with self._lock:
+                if model_name not in self._embedding_funcs:
+                    try:
+                        self._embedding_funcs[model_name] = EmbeddingEngine(
+                            model_name=model_name,
+                            cache=self.embedding_cache
+                        )
+                        logger.info(f"Initialized embedding function: {model_name}")
+                    except Exception as e:
+                        logger.error(f"Failed to initialize embedding function: {str(e)}")
+                        raise RuntimeError(f"Failed to initialize embedding function: {str(e)}")
+        return self._embedding_funcs[model_name]
+
+    def embedding_func_for(self, collection):
+        """Return the embedding engine of the model a collection was created with."""
+        return self.get_embedding_func(CollectionConfig.from_collection(collection).embedding_model)
+
+    @property
+    def tokenizer(self):
+        """The shared tokenizer used for chunking text."""
+        if self._tokenizer is None:
+            with self._lock:
+                if self._tokenizer is None:
+                    self._tokenizer = AutoTokenizer.from_pretrained(
+                        f"sentence-transformers/{ChromaDBConfig.EMBEDDING_MODEL}"
+                    )
+                    logger.info(f"Initialized tokenizer for: {ChromaDBConfig.EMBEDDING_MODEL}")
+        return self._tokenizer
+
+    @property
+    def aliases(self) -> dict:
+        """Collection name -> name of the Chroma collection serving it, for rebuilt collections."""
+        if self._aliases is None:
+            with self._lock:
+                if self._aliases is None:
+                    path = os.path.join(os.getcwd(), ChromaDBConfig.DB_DIRECTORY, IndexConfig.ALIASES_FILE)
+                    try:
+                        with open(path, encoding="utf-8") as f:
+                            self._aliases = json.load(f)
+                    except FileNotFoundError:
+                        self._aliases = {}
+        return self._aliases
+
+    def _save_aliases(self, aliases: dict) -> None:
+        """Replace the alias file in one rename, so a crash leaves either the old or the new mapping."""
+        path = os.path.join(os.getcwd(), ChromaDBConfig.DB_DIRECTORY, IndexConfig.ALIASES_FILE)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(aliases, f)
+        os.replace(f"{path}.tmp", path)
+        self._aliases = aliases
+
+    def _hidden_names(self) -> set[str]:
+        """Chroma collections not addressable by their own name: alias targets and rebuilds in progress."""
+        return set(self.aliases.values()) | set(self._rebuilds.values())
+
+    def physical_name(self, name: str = None) -> str:
+        """Name of the Chroma collection currently serving a collection name."""
+        name = name or ChromaDBConfig.COLLECTION_NAME
+        return self.aliases.get(name, name)
+
+    def _remember(self, name: str, collection):
+        """Cache an open handle, closing the least recently used one beyond `max_open_collections`."""
+        self._collections[name] = collection
+        self._collections.move_to_end(name)
+        while len(self._collections) > self.max_open_collections:
+            evicted, handle = self._collections.popitem(last=False)
+            drop_lexical_index(handle.name)
+            logger.info(f"Evicted collection '{evicted}' from the open handles")
+        return collection
+
+    def _create(self, name: str, config: CollectionConfig, metadata: dict = None):
+        return self.client.create_collection(
+            name=name,
+            configuration=config.chroma_configuration(),
+            metadata={**(metadata or {}), **config.chroma_metadata()},
+            embedding_function=self.get_embedding_func(config.embedding_model)
+        )
+
+    def get_collection(self, name: str = None):
+        """
+        Return the cached handle of a collection, opening it if needed.
+
+        The default collection is created with the default configuration on first use;
+        any other collection must have been created with `create_collection`. At most
+        `max_open_collections` handles are kept; the least recently used one is closed
+        first, together with its lexical index.
+
+        Args:
+            name (str): Collection name; defaults to the configured collection.
+
+        Returns:
+            chromadb.api.models.Collection.Collection: The ChromaDB collection object.
+
+        Raises:
+            CollectionNotFoundError: If a non-default collection does not exist.
+        """
+        name = name or ChromaDBConfig.COLLECTION_NAME
+        with self._lock:
+            collection = self._collections.get(name)
+            if collection is not None:
+                self._collections.move_to_end(name)
+                return collection
+            physical = self.physical_name(name)
+            if name == ChromaDBConfig.COLLECTION_NAME:
+                config = CollectionConfig()
+                collection = self.client.get_or_create_collection(
+                    name=physical,
+                    configuration=config.chroma_configuration(),
+                    metadata=config.chroma_metadata(),
+                    embedding_function=self.embedding_func
+                )
+                # An existing collection keeps the settings it was created with
+                differences = config.differences(CollectionConfig.from_collection(collection))
+                if differences:
+                    changes = ", ".join(
+                        f"{key}={stored!r} (configured {configured!r})"
+                        for key, (configured, stored) in differences.items()
+                    )
+                    logger.warning(f"Collection '{name}' keeps the settings it was created with: {changes}. "
+                                   f"POST /collections/{name}/rebuild applies the configured ones")
+            else:
+                missing = CollectionNotFoundError(f"Collection '{name}' does not exist")
+                if name in self._hidden_names():
+                    raise missing
+                try:
+                    stored = self.client.get_collection(name=physical)
+                except NotFoundError:
+                    raise missing
+                collection = self.client.get_collection(
+                    name=physical, embedding_function=self.embedding_func_for(stored)
+                )
+            return self._remember(name, collection)
+
+    def create_collection(self, name: str, config: CollectionConfig):
+        """
+        Create a collection with its own embedding model and index parameters.
+
+        Args:
+            name (str): Collection name (3-512 characters from [a-zA-Z0-9._-]).
+            config (CollectionConfig): Settings of the new collection.
+
+        Returns:
+            chromadb.api.models.Collection.Collection: The new collection.
+
+        Raises:
+            CollectionExistsError: If a collection with this name already exists.
+        """
+        with self._lock:
+            taken = {collection.name for collection in self.client.list_collections()} | set(self.aliases)
+            if name in taken:
+                raise CollectionExistsError(f"Collection '{name}' already exists")
+            collection = self._create(name, config)
+            logger.info(f"Created collection '{name}' with {config.as_dict()}")
+            return self._remember(name, collection)
+
+    def list_collections(self) -> list[str]:
+        """Names of every collection in the database, rebuilt ones under their alias."""
+        with self._lock:
+            serving = {physical: name for name, physical in self.aliases.items()}
+            # A Chroma collection named like an alias is a leftover of an interrupted switchover
+            hidden = set(self._rebuilds.values()) | set(self.aliases)
+            return sorted(
+                serving.get(collection.name, collection.name)
+                for collection in self.client.list_collections() if collection.name not in hidden
+            )
+
+    def delete_collection(self, name: str) -> None:
+        """
+        Delete a collection, its open handle and its lexical index.
+
+        Raises:
+            CollectionNotFoundError: If the collection does not exist.
+            CollectionBusyError: If the collection is being rebuilt.
+        """
+        with self._lock:
+            if name in self._rebuilds:
+                raise CollectionBusyError(f"Collection '{name}' is being rebuilt")
+            missing = CollectionNotFoundError(f"Collection '{name}' does not exist")
+            if name in self._hidden_names():
+                raise missing
+            physical = self.physical_name(name)
+            try:
+                self.client.delete_collection(name=physical)
+            except NotFoundError:
+                raise missing
+            if name in self.aliases:
+                self._save_aliases({alias: target for alias, target in self.aliases.items() if alias != name})
+            self._collections.pop(name, None)
+            drop_lexical_index(physical)
+            self._collection_version += 1
+            logger.info(f"Deleted collection '{name}'")
+
+    def reset_collection(self, name: str = None) -> int:
+        """
+        Empty a collection by dropping and recreating it with the same configuration.
+
+        This takes constant time whatever the collection size, and leaves no deleted
+        entries behind in the vector index.
+
+        Args:
+            name (str): Collection name; defaults to the configured collection.
+
+        Returns:
+            int: Number of documents the collection held before the reset.
+        """
+        name = name or ChromaDBConfig.COLLECTION_NAME
+        with self._lock:
+            collection = self.get_collection(name)
+            count = collection.count()
+            config = CollectionConfig.from_collection(collection)
+            self.client.delete_collection(name=collection.name)
+            self._collections[name] = self._create(collection.name, config, self._user_metadata(collection))
+            get_lexical_index(collection.name).clear()
+            self._changes[collection.name] += 1
+            self._collection_version += 1
+            logger.info(f"Reset collection '{name}' ({count} documents dropped)")
+            return count
+
+    @staticmethod
+    def _user_metadata(collection) -> dict:
+        # Index parameters live in the configuration; legacy `hnsw:` metadata would conflict with it
+        return {key: value for key, value in (collection.metadata or {}).items() if not key.startswith("hnsw:")}
+
+    def update_search_parameters(self, name: str = None, **parameters) -> CollectionConfig:
+        """
+        Change the HNSW parameters that apply without rebuilding the graph.
+
+        Args:
+            name (str): Collection name; defaults to the configured collection.
+            **parameters: Any of `collection_config.SEARCH_PARAMETERS`; `None` values are left unchanged.
+
+        Returns:
+            CollectionConfig: The collection's settings after the change.
+        """
+        hnsw = {key: value for key, value in parameters.items() if value is not None}
+        with self._lock:
+            collection = self.get_collection(name)
+            if hnsw:
+                collection.modify(configuration={"hnsw": hnsw})
+                # Answers cached with the old parameters may differ from what a search returns now
+                self._collection_version += 1
+                logger.info(f"Updated search parameters of collection '{name}': {hnsw}")
+            return CollectionConfig.from_collection(collection)
+
+    def begin_rebuild(self, name: str, config: CollectionConfig) -> tuple:
+        """
+        Start rebuilding a collection: create the Chroma collection its data is copied into.
+
+        The collection keeps serving reads from its current index until `switch_collection`.
+        Writes should be refused meanwhile (see `is_rebuilding`); any that still happen make
+        the switchover fail rather than be lost.
+
+        Args:
+            name (str): Collection name; defaults to the configured collection.
+            config (CollectionConfig): Settings of the rebuilt collection.
+
+        Returns:
+            tuple: (current collection, new empty collection, write count of the current one),
+            the last to be passed to `switch_collection`.
+
+        Raises:
+            CollectionBusyError: If the collection is already being rebuilt.
+            CollectionNotFoundError: If the collection does not exist.
+        """
+        name = name or ChromaDBConfig.COLLECTION_NAME
+        with self._lock:
+            if name in self._rebuilds:
+                raise CollectionBusyError(f"Collection '{name}' is already being rebuilt")
+            source = self.get_collection(name)
+            target = self._create(f"{name}-{uuid.uuid4().hex[:12]}", config, self._user_metadata(source))
+            self._rebuilds[name] = target.name
+            logger.info(f"Rebuilding collection '{name}' into '{target.name}' with {config.as_dict()}")
+            return source, target, self._changes[source.name]
+
+    def is_rebuilding(self, name: str = None) -> bool:
+        """Whether a rebuild of the collection is in progress."""
+        return (name or ChromaDBConfig.COLLECTION_NAME) in self._rebuilds
+
+    def switch_collection(self, name: str, expected_changes: int) -> str:
+        """
+        Finish a rebuild: point the collection name at the rebuilt collection and drop the old one.
+
+        The alias file is replaced and the cached handle dropped under the registry lock,
+        so every request opened afterwards uses the new index.
+
+        Args:
+            name (str): Collection name; defaults to the configured collection.
+            expected_changes (int): Write count returned by `begin_rebuild`.
+
+        Returns:
+            str: Name of the Chroma collection that was replaced.
+
+        Raises:
+            CollectionBusyError: If the collection was written to during the rebuild.
+        """
+        name = name or ChromaDBConfig.COLLECTION_NAME
+        with self._lock:
+            source = self.physical_name(name)
+            if self._changes[source] != expected_changes:
+                raise CollectionBusyError(f"Collection '{name}' was modified during the rebuild; run it again")
+            aliases = {alias: target for alias, target in self.aliases.items() if alias != name}
+            aliases[name] = self._rebuilds.pop(name)
+            self._save_aliases(aliases)
+            self._collections.pop(name, None)
+            self._collection_version += 1
+            self.client.delete_collection(name=source)
+            drop_lexical_index(source)
+            logger.info(f"Collection '{name}' switched from '{source}' to '{aliases[name]}'")
+            return source
+
+    def abort_rebuild(self, name: str = None) -> None:
+        """Forget a failed rebuild and delete the partly filled collection it created."""
+        name = name or ChromaDBConfig.COLLECTION_NAME
+        with self._lock:
+            target = self._rebuilds.pop(name, None)
+            if target is None:
+                return
+            try:
+                self.client.delete_collection(name=target)
+            except NotFoundError:
+                pass
+            drop_lexical_index(target)
+            logger.info(f"Abandoned the rebuild of collection '{name}' into '{target}'")
+
+    def index_disk_bytes(self, collection) -> int:
+        """
+        Size on disk of a collection's HNSW index, or None if it cannot be located.
+
+        The index files live in a directory named after the collection's vector segment.
+        They are written every `sync_threshold` additions, so a recently filled index may
+        be larger than reported.
+        """
+        persist_dir = os.path.join(os.getcwd(), ChromaDBConfig.DB_DIRECTORY)
+        try:
+            conn = sqlite3.connect(f"file:{os.path.join(persist_dir, 'chroma.sqlite3')}?mode=ro", uri=True)
+            try:
+                row = conn.execute(
+                    "SELECT id FROM segments WHERE collection = ? AND scope = 'VECTOR'", (str(collection.id),)
+                ).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not locate the index of collection '{collection.name}': {str(e)}")
+            return None
+        if row is None:
+            return None
+        segment_dir = os.path.join(persist_dir, row[0])
+        if not os.path.isdir(segment_dir):
+            return 0
+        return sum(entry.stat().st_size for entry in os.scandir(segment_dir) if entry.is_file())
+
+    def drop_database(self) -> str:
+        """
+        Close the shared ChromaDB client and delete the database directory.
+
+        The client and the collection handle are rebuilt lazily on next access, so the
+        application keeps serving without a restart.
+
+        Returns:
+            str: The deleted database directory.
+
+        Raises:
+            FileNotFoundError: If the database directory does not exist.
+        """
+        persist_dir = os.path.join(os.getcwd(), ChromaDBConfig.DB_DIRECTORY)
+        with self._lock:
+            if not os.path.isdir(persist_dir):
+                raise FileNotFoundError(persist_dir)
+            if self._client is not None:
+                self._client.close()
+                # Forget the cached system so the next client opens a fresh database
+                self._client.clear_system_cache()
+            self._client = None
+            self._collections.clear()
+            self._aliases = None
+            self._rebuilds.clear()
+            shutil.rmtree(persist_dir)
+            drop_lexical_indexes()
+            self._collection_version += 1
+            logger.info(f"Dropped database at {persist_dir}; the client will be re-initialized on next use")
+            return persist_dir
+
+    @property
+    def collection_version(self) -> int:
+        """Counter bumped on every write to any collection; caches compare it to detect staleness."""
+        return self._collection_version
+
+    def mark_collection_changed(self, name: str = None) -> None:
+        """
+        Record that a collection's content changed, invalidating derived caches.
+
+        Args:
+            name (str): Name of the Chroma collection written to (`collection.name`), so a
+                rebuild of it can tell that its copy is stale.
+        """
+        with self._lock:
+            self._collection_version += 1
+            if name is not None:
+                self._changes[name] += 1
+
+    def warm_up(self) -> None:
+        """
+        Build every shared resource and run one embedding so the model weights are loaded.
+
+        Any failure is recorded and reported through `status()` instead of being raised,
+        so a failed warm-up never takes the process down.
+        """
+        start = time.perf_counter()
+        try:
+            self.get_collection()
+            self.tokenizer
+            self.embedding_func(["warm-up"])
+            if RerankConfig.ENABLED:
+                reranker.model
+            self._warm_up_seconds = round(time.perf_counter() - start, 3)
+            self._ready.set()
+            logger.info(f"Resource warm-up finished in {self._warm_up_seconds}s")
+        except Exception as e:
+            self._warm_up_error = str(e)
+            logger.error(f"Resource warm-up failed: {str(e)}")
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether warm-up has completed successfully."""
+        return self._ready.is_set()
+
+    def status(self) -> dict:
+        """
+        Report the readiness of the shared resources.
+
+        Returns:
+            dict: Readiness flag, warm-up duration and the warm-up error, if any.
+        """
+        return {
+            "ready": self.is_ready,
+            "warm_up_seconds": self._warm_up_seconds,
+            "error": self._warm_up_error,
+        }
+
+
+registry = ResourceRegistry()
@@ -183,42 +183,121 @@
 #         raise HTTPException(status_code=500, detail=str(e))
     
 
-from fastapi import APIRouter, HTTPException, UploadFile, File
-from typing import Any
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import Any, Literal, Optional
+from dtos.directory_ingest_request import DirectoryIngestRequest
 from dtos.document import Document
-from utils.enums import Endpoints, Messages, ChromaDBConfig, MetadataKeys
-from chroma_functionalities import get_chroma_collection, sync_text_file_with_collection
+from dtos.document_page import DocumentPage
+from utils.enums import Endpoints, Messages, ChromaDBConfig, IngestConfig
+from bulk_ingest import bulk_ingest, collect_text_files, extract_zip
+from chroma_functionalities import (
+    build_where, delete_documents, get_chroma_collection, get_documents_page, iter_collection_documents,
+    sync_text_stream_with_collection
+)
+import json
 import os
 import shutil
+import tempfile
+from ingest_jobs import job_manager, JobQueueFullError
+from resource_registry import registry
+from routers.collections_router import resolve_collection_name, resolve_writable_collection_name
 from utils.logger import setup_logger
+from utils.read_data import ReadDataClass
 
 logger = setup_logger(__name__)
 router = APIRouter()
+# Routes served for the default collection and again under /collections/{collection}
+collection_router = APIRouter()
 
-@router.get(Endpoints.DATA, response_model=list[Document], tags=["Data Management"])
-def get_all_data():
-    """Retrieve all documents from the ChromaDB collection."""
+def parse_where(where: Optional[str]) -> Optional[dict]:
+    """
+    Parse the JSON `where` query parameter into a Chroma metadata filter.
+
+    Raises:
+        HTTPException: 400 if the parameter is not a JSON object.
+    """
+    if not where:
+        return None
     try:
-        collection = get_chroma_collection()
-        results = collection.get(ids=None, include=['documents', 'metadatas'])
-        return [
-            Document(
-                id=results['ids'][i],
-                text=results['documents'][i],
-                metadata=results['metadatas'][i]
-            )
-            for i in range(len(results.get('ids', [])))
-        ]
+        parsed = json.loads(where)
+    except json.JSONDecodeError:
+        parsed = None
+    if not isinstance(parsed, dict):
+        raise HTTPException(status_code=400, detail=Messages.INVALID_WHERE_FILTER)
+    return parsed
+
+
+@collection_router.get(Endpoints.DATA, response_model=DocumentPage, tags=["Data Management"])
+def get_all_data(
+    limit: int = Query(ChromaDBConfig.DATA_PAGE_SIZE, ge=1, le=ChromaDBConfig.DATA_MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    source: Optional[str] = None,
+    where: Optional[str] = None,
+    name: str = Depends(resolve_collection_name),
+):
+    """
+    Retrieve one page of documents from the ChromaDB collection.
+
+    - `source` -> only documents of this source file.
+    - `where` -> JSON Chroma metadata filter, e.g. `{"line_number": {"$lt": 10}}`.
+    - Follow `next_offset` to read the next page; it is null on the last page.
+    """
+    try:
+        collection = get_chroma_collection(name)
+        results, next_offset = get_documents_page(
+            collection, limit, offset=offset, where=build_where(source, parse_where(where))
+        )
+        return DocumentPage(
+            items=[
+                Document(
+                    id=results['ids'][i],
+                    text=results['documents'][i],
+                    metadata=results['metadatas'][i]
+                )
+                for i in range(len(results.get('ids', [])))
+            ],
+            limit=limit,
+            offset=offset,
+            next_offset=next_offset,
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(Messages.ERROR_GENERAL.format(error=str(e)))
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get(Endpoints.DATA_BY_ID, response_model=Document, tags=["Data Management"])
-def get_document_by_id(doc_id: str):
+# Registered before DATA_BY_ID so that "stream" is not taken for a document ID
+@collection_router.get(Endpoints.DATA_STREAM, tags=["Data Management"])
+def stream_all_data(source: Optional[str] = None, where: Optional[str] = None,
+                    name: str = Depends(resolve_collection_name)):
+    """
+    Stream every matching document as newline-delimited JSON (one document per line).
+
+    The collection is read page by page while the response is written, so memory
+    stays flat whatever the collection size.
+    """
+    filters = build_where(source, parse_where(where))
+    try:
+        collection = get_chroma_collection(name)
+    except Exception as e:
+        logger.error(Messages.ERROR_GENERAL.format(error=str(e)))
+        raise HTTPException(status_code=500, detail=str(e))
+
+    def rows():
+        for doc_id, text, metadata in iter_collection_documents(collection, where=filters):
+            yield json.dumps({"id": doc_id, "text": text, "metadata": metadata}) + "\n"
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+
+@collection_router.get(Endpoints.DATA_BY_ID, response_model=Document, tags=["Data Management"])
+def get_document_by_id(doc_id: str, name: str = Depends(resolve_collection_name)):
     """Retrieve a single document by ID."""
     try:
-        collection = get_chroma_collection()
+        collection = get_chroma_collection(name)
         results = collection.get(ids=[doc_id], include=['documents', 'metadatas'])
         if not results.get('ids'):
             raise HTTPException(status_code=404, detail=Messages.DOC_NOT_FOUND)
@@ -234,12 +313,20 @@ def get_document_by_id(doc_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get(Endpoints.RAW_DATA, tags=["Data Management"])
-def get_raw_data() -> dict[str, Any]:
-    """Retrieve all documents from ChromaDB in raw format."""
+@collection_router.get(Endpoints.RAW_DATA, tags=["Data Management"])
+def get_raw_data(
+    limit: int = Query(ChromaDBConfig.DATA_PAGE_SIZE, ge=1, le=ChromaDBConfig.DATA_MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    source: Optional[str] = None,
+    where: Optional[str] = None,
+    name: str = Depends(resolve_collection_name),
+) -> dict[str, Any]:
+    """Retrieve one page of documents from ChromaDB in raw format; see `/data` for the parameters."""
     try:
-        collection = get_chroma_collection()
-        results = collection.get(ids=None, include=['documents', 'metadatas'])
+        collection = get_chroma_collection(name)
+        results, next_offset = get_documents_page(
+            collection, limit, offset=offset, where=build_where(source, parse_where(where))
+        )
         return {
             'documents': results.get('documents', []),
             'ids': results.get('ids', []),
@@ -248,21 +335,24 @@ def get_raw_data() -> dict[str, Any]:
             'distances': None,
             'uris': None,
             'data': None,
+            'next_offset': next_offset,
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(Messages.ERROR_GENERAL.format(error=str(e)))
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.delete(Endpoints.DATA_BY_ID, tags=["Data Management"])
-def delete_document_by_id(doc_id: str):
+@collection_router.delete(Endpoints.DATA_BY_ID, tags=["Data Management"])
+def delete_document_by_id(doc_id: str, name: str = Depends(resolve_writable_collection_name)):
     """Delete a document by ID."""
     try:
-        collection = get_chroma_collection()
+        collection = get_chroma_collection(name)
         results = collection.get(ids=[doc_id])
         if not results['ids']:
             raise HTTPException(status_code=404, detail=Messages.DOC_NOT_FOUND)
-        collection.delete(ids=[doc_id])
+        delete_documents(collection, [doc_id])
         return {"message": Messages.DOC_DELETED.format(doc_id=doc_id)}
     except HTTPException:
         raise
@@ -271,51 +361,181 @@ def delete_document_by_id(doc_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.delete(Endpoints.DATA, tags=["Data Management"])
-def delete_all_data():
-    """Delete all documents from ChromaDB."""
+@collection_router.delete(Endpoints.DATA, tags=["Data Management"])
+def delete_all_data(name: str = Depends(resolve_writable_collection_name)):
+    """
+    Delete all documents from ChromaDB.
+
+    The collection is dropped and recreated with the same configuration, which takes
+    constant time instead of deleting every document by ID.
+    """
     try:
-        collection = get_chroma_collection()
-        count_before_delete = collection.count()
+        count_before_delete = registry.reset_collection(name)
         if count_before_delete == 0:
             return {"message": "No documents to delete"}
-        ids = collection.get(ids=None, include=[])['ids']
-        if ids:
-            collection.delete(ids=ids)
-        count_after_delete = collection.count()
-        if count_after_delete == 0:
-            return {"message": Messages.ALL_DOCS_DELETED.format(count_before_delete=count_before_delete)}
-        else:
-            raise HTTPException(status_code=500, detail=Messages.DELETE_FAILED)
+        return {"message": Messages.ALL_DOCS_DELETED.format(count_before_delete=count_before_delete)}
     except Exception as e:
         logger.error(Messages.ERROR_DELETION.format(error=str(e)))
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post(Endpoints.UPLOAD_TEXT_FILE, tags=["File Handling"])
-async def upload_text_file(file: UploadFile = File(...), force: bool = False):
+@collection_router.post(Endpoints.UPLOAD_TEXT_FILE, status_code=202, tags=["File Handling"])
+async def upload_text_file(file: UploadFile = File(...), force: bool = False, incremental: bool = False,
+                           chunking: Optional[Literal["token", "structure"]] = None,
+                           tags: Optional[list[str]] = Query(None),
+                           name: str = Depends(resolve_writable_collection_name)):
     """
-    Upload a text file and store its contents in ChromaDB.
+    Upload a text file and queue its ingestion into ChromaDB.
+
+    The upload is spooled to a temporary file and a background job streams it
+    through the chunker in bounded batches, off the event loop. Poll
+    `GET /jobs/{job_id}` for progress.
+
+    - `force=True` -> old chunks of the file removed, then all chunks added.
+    - `incremental=True` -> only new, changed and vanished chunks are written or deleted.
+    - `chunking=structure` -> chunks follow headings, paragraphs and sentences and carry
+      `section` metadata; `chunking=token` -> fixed token windows. Defaults to `CHUNKING_STRATEGY`.
+    - `tags=leave&tags=benefits` -> stored on every chunk with its `uploaded_at` time, for filtered
+      retrieval with `{"tags": {"$contains": "leave"}}`.
     """
+    temp_file_path = None
     try:
         if not file.filename.endswith('.txt'):
             raise HTTPException(status_code=400, detail=Messages.INVALID_FILE_TYPE)
 
-        temp_file_path = f"temp_{file.filename}"
-        with open(temp_file_path, "wb") as temp_file:
-            content = await file.read()
-            temp_file.write(content)
+        with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as temp_file:
+            temp_file_path = temp_file.name
+            await run_in_threadpool(shutil.copyfileobj, file.file, temp_file, ChromaDBConfig.READ_BLOCK_SIZE)
 
-        try:
-            collection = get_chroma_collection()
-            sync_text_file_with_collection(collection, temp_file_path, force=force)
-            return {"message": Messages.FILE_UPLOADED.format(file_name=file.filename)}
-        finally:
-            if os.path.exists(temp_file_path):
-                os.remove(temp_file_path)
+        source = file.filename
+        path = temp_file_path
 
+        def ingest(job):
+            collection = get_chroma_collection(name)
+            return sync_text_stream_with_collection(
+                collection, ReadDataClass.stream_file(path), source,
+                force=force, incremental=incremental, progress=job.report_progress, chunking=chunking,
+                tags=tags
+            )
+
+        job = job_manager.submit(source, ingest, cleanup=lambda: os.remove(path), collection=name)
+        temp_file_path = None  # owned by the job from here on
+        return {
+            "message": Messages.FILE_QUEUED,
+            "job_id": job.id,
+            "status_url": Endpoints.JOB_BY_ID.format(job_id=job.id),
+        }
+
+    except HTTPException:
+        raise
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except Exception as e:
+        logger.error(Messages.ERROR_FILE_UPLOAD.format(error=str(e)))
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if temp_file_path and os.path.exists(temp_file_path):
+            os.remove(temp_file_path)
+
+
+@collection_router.post(Endpoints.UPLOAD_TEXT_FILES, status_code=202, tags=["File Handling"])
+async def upload_text_files(files: list[UploadFile] = File(...), force: bool = False, incremental: bool = False,
+                            chunking: Optional[Literal["token", "structure"]] = None,
+                            tags: Optional[list[str]] = Query(None),
+                            name: str = Depends(resolve_writable_collection_name)):
+    """
+    Upload many .txt files and/or .zip archives of .txt files and queue one bulk ingestion job.
+
+    Files are chunked in parallel processes and embedded in one shared batched stream.
+    `chunking` and `tags` work as for a single upload.
+    """
+    temp_dir = tempfile.mkdtemp(prefix="bulk_upload_")
+    try:
+        paths = []
+        for upload in files:
+            if not upload.filename.endswith(('.txt', '.zip')):
+                raise HTTPException(status_code=400, detail=Messages.INVALID_BULK_FILE_TYPE)
+            path = os.path.join(temp_dir, f"{len(paths)}_{os.path.basename(upload.filename)}")
+            with open(path, "wb") as temp_file:
+                await run_in_threadpool(shutil.copyfileobj, upload.file, temp_file, ChromaDBConfig.READ_BLOCK_SIZE)
+            paths.append((path, upload.filename))
+
+        text_files = []
+        for path, filename in paths:
+            if filename.endswith('.zip'):
+                text_files.extend(await run_in_threadpool(extract_zip, path, f"{path}_extracted"))
+            else:
+                text_files.append((path, filename))
+        if not text_files:
+            raise HTTPException(status_code=400, detail=Messages.NO_TEXT_FILES)
+
+        def ingest(job):
+            return bulk_ingest(
+                get_chroma_collection(name), text_files, force=force, incremental=incremental,
+                progress=job.report_progress, chunking=chunking, tags=tags
+            )
+
+        job = job_manager.submit(
+            f"{len(text_files)} uploaded files", ingest, cleanup=lambda: shutil.rmtree(temp_dir, ignore_errors=True),
+            collection=name
+        )
+        temp_dir = None  # owned by the job from here on
+        return {
+            "message": Messages.FILE_QUEUED,
+            "job_id": job.id,
+            "files": len(text_files),
+            "status_url": Endpoints.JOB_BY_ID.format(job_id=job.id),
+        }
+
+    except HTTPException:
+        raise
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except Exception as e:
+        logger.error(Messages.ERROR_FILE_UPLOAD.format(error=str(e)))
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+@collection_router.post(Endpoints.INGEST_DIRECTORY, status_code=202, tags=["File Handling"])
+def ingest_directory(req: DirectoryIngestRequest, name: str = Depends(resolve_writable_collection_name)):
+    """
+    Queue a bulk ingestion of the .txt files in a server-side directory.
+
+    The directory must be inside the configured ingest root (`INGEST_DIRECTORY_ROOT`).
+    """
+    try:
+        root = os.path.realpath(IngestConfig.DIRECTORY_ROOT)
+        directory = os.path.realpath(os.path.join(root, req.path))
+        if os.path.commonpath([root, directory]) != root:
+            raise HTTPException(status_code=403, detail=Messages.DIRECTORY_NOT_ALLOWED)
+
+        text_files = collect_text_files(directory, recursive=req.recursive)
+        if not text_files:
+            raise HTTPException(status_code=400, detail=Messages.NO_TEXT_FILES)
+
+        def ingest(job):
+            return bulk_ingest(
+                get_chroma_collection(name), text_files, force=req.force, incremental=req.incremental,
+                progress=job.report_progress, chunking=req.chunking, tags=req.tags
+            )
+
+        job = job_manager.submit(directory, ingest, collection=name)
+        return {
+            "message": Messages.FILE_QUEUED,
+            "job_id": job.id,
+            "files": len(text_files),
+            "status_url": Endpoints.JOB_BY_ID.format(job_id=job.id),
+        }
+
+    except HTTPException:
+        raise
     except FileNotFoundError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+        raise HTTPException(status_code=404, detail=str(e))
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except Exception as e:
         logger.error(Messages.ERROR_FILE_UPLOAD.format(error=str(e)))
         raise HTTPException(status_code=500, detail=str(e))
@@ -323,20 +543,33 @@ async def upload_text_file(file: UploadFile = File(...), force: bool = False):
 
 @router.delete(Endpoints.DROP_DATABASE, tags=["ChromaDB"])
 def drop_database():
-    """Delete the entire ChromaDB database folder."""
+    """
+    Delete the entire ChromaDB database folder.
+
+    The shared client is closed first and re-initialized on next use, so no server
+    restart is needed.
+    """
     try:
-        db_directory = os.path.abspath(ChromaDBConfig.DB_DIRECTORY)
-        if not os.path.exists(db_directory):
-            raise HTTPException(
-                status_code=404,
-                detail=Messages.DATABASE_NOT_FOUND.format(db_directory=db_directory)
-            )
-        shutil.rmtree(db_directory, ignore_errors=False)
+        db_directory = registry.drop_database()
         logger.info(Messages.DATABASE_DROPPED.format(db_directory=db_directory))
         return {"message": Messages.DATABASE_DROPPED.format(db_directory=db_directory)}
+    except FileNotFoundError as e:
+        raise HTTPException(
+            status_code=404,
+            detail=Messages.DATABASE_NOT_FOUND.format(db_directory=str(e))
+        )
     except PermissionError as e:
         logger.error(f"Permission denied while deleting DB folder: {str(e)}")
         raise HTTPException(status_code=403, detail="Permission denied while deleting DB folder.")
     except Exception as e:
         logger.error(Messages.ERROR_GENERAL.format(error=str(e)))
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get(Endpoints.EMBEDDING_CACHE, tags=["ChromaDB"])
+def get_embedding_cache_stats():
+    """Report the size and hit/miss counters of the embedding cache."""
+    cache = registry.embedding_cache
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
@@ -0,0 +1,219 @@
+from fastapi import APIRouter, Depends, HTTPException
+from chromadb.errors import InvalidArgumentError
+from chroma_functionalities import copy_collection
+from collection_config import SEARCH_PARAMETERS, CollectionConfig
+from dtos.collection_create_request import CollectionCreateRequest
+from dtos.collection_rebuild_request import CollectionRebuildRequest
+from dtos.index_update_request import IndexUpdateRequest
+from ingest_jobs import JobQueueFullError, job_manager
+from resource_registry import CollectionBusyError, CollectionExistsError, CollectionNotFoundError, registry
+from utils.enums import ChromaDBConfig, Endpoints, Messages
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+router = APIRouter()
+
+
+def resolve_collection_name(collection: str = ChromaDBConfig.COLLECTION_NAME) -> str:
+    """
+    Dependency resolving the collection a request targets.
+
+    On the `/collections/{collection}/...` routes the name comes from the path; the
+    unprefixed routes serve the default collection, or the one named by `?collection=`.
+
+    Raises:
+        HTTPException: 404 if the collection does not exist, 500 if it cannot be opened.
+    """
+    try:
+        registry.get_collection(collection)
+    except CollectionNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(Messages.ERROR_GENERAL.format(error=str(e)))
+        raise HTTPException(status_code=500, detail=str(e))
+    return collection
+
+
+def resolve_writable_collection_name(name: str = Depends(resolve_collection_name)) -> str:
+    """
+    Dependency resolving the collection a write request targets.
+
+    Raises:
+        HTTPException: 409 while the collection is being rebuilt, besides the errors of
+            `resolve_collection_name`.
+    """
+    if registry.is_rebuilding(name):
+        raise HTTPException(status_code=409, detail=Messages.COLLECTION_REBUILDING.format(collection=name))
+    return name
+
+
+def describe_collection(name: str) -> dict:
+    """Report the document count and settings of a collection."""
+    collection = registry.get_collection(name)
+    return {
+        "name": name,
+        "count": collection.count(),
+        "default": name == ChromaDBConfig.COLLECTION_NAME,
+        "rebuilding": registry.is_rebuilding(name),
+        "config": CollectionConfig.from_collection(collection).as_dict(),
+    }
+
+
+def describe_index(name: str) -> dict:
+    """Report the vector index of a collection: its size, dimension and every HNSW parameter in effect."""
+    collection = registry.get_collection(name)
+    sample = collection.get(limit=1, include=['embeddings'])
+    return {
+        "name": name,
+        "collection": collection.name,
+        "count": collection.count(),
+        "dimension": len(sample['embeddings'][0]) if sample['ids'] else None,
+        "disk_bytes": registry.index_disk_bytes(collection),
+        "rebuilding": registry.is_rebuilding(name),
+        "embedding_model": CollectionConfig.from_collection(collection).embedding_model,
+        "hnsw": (collection.configuration_json or {}).get("hnsw") or {},
+    }
+
+
+@router.get(Endpoints.COLLECTIONS, tags=["Collections"])
+def list_collections():
+    """List every collection with its document count and settings."""
+    try:
+        return [describe_collection(name) for name in registry.list_collections()]
+    except Exception as e:
+        logger.error(Messages.ERROR_GENERAL.format(error=str(e)))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post(Endpoints.COLLECTIONS, status_code=201, tags=["Collections"])
+def create_collection(req: CollectionCreateRequest):
+    """
+    Create a collection with its own embedding model, distance metric and HNSW parameters.
+
+    Its data and RAG routes are then served under `/collections/{name}/...`, e.g.
+    `/collections/{name}/data`, `/collections/{name}/upload-text-file` and
+    `/collections/{name}/ask_rag`. Unset settings use the configured defaults.
+    """
+    config = CollectionConfig().merged(**req.model_dump(exclude={"name"}))
+    try:
+        registry.create_collection(req.name, config)
+        return {"message": Messages.COLLECTION_CREATED, **describe_collection(req.name)}
+    except CollectionExistsError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except (InvalidArgumentError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(Messages.ERROR_GENERAL.format(error=str(e)))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get(Endpoints.COLLECTION_BY_NAME, tags=["Collections"])
+def get_collection(collection: str):
+    """Report the document count and settings of one collection."""
+    try:
+        return describe_collection(collection)
+    except CollectionNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(Messages.ERROR_GENERAL.format(error=str(e)))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete(Endpoints.COLLECTION_BY_NAME, tags=["Collections"])
+def delete_collection(collection: str):
+    """
+    Delete a collection with all its documents, and close its handle and lexical index.
+
+    Deleting the default collection empties it; it is recreated on next use.
+    """
+    try:
+        registry.delete_collection(collection)
+        return {"message": Messages.COLLECTION_DELETED, "name": collection}
+    except CollectionNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except CollectionBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        logger.error(Messages.ERROR_GENERAL.format(error=str(e)))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get(Endpoints.COLLECTION_INDEX, tags=["Collections"])
+def get_index_stats(name: str = Depends(resolve_collection_name)):
+    """
+    Report the HNSW index of a collection: document count, embedding dimension, size on
+    disk and the parameters in effect, including Chroma's defaults for unset ones.
+    """
+    try:
+        return describe_index(name)
+    except Exception as e:
+        logger.error(Messages.ERROR_GENERAL.format(error=str(e)))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.patch(Endpoints.COLLECTION_INDEX, tags=["Collections"])
+def update_index(req: IndexUpdateRequest, name: str = Depends(resolve_collection_name)):
+    """
+    Change the index parameters that apply without a rebuild: `ef_search` (higher means
+    better recall and slower queries), `batch_size` and `sync_threshold`.
+
+    The graph parameters (`max_neighbors`, `ef_construction`, `space`) and the embedding
+    model can only be changed by `POST /collections/{collection}/rebuild`.
+    """
+    try:
+        registry.update_search_parameters(name, **req.model_dump(include=set(SEARCH_PARAMETERS)))
+        return {"message": Messages.INDEX_UPDATED, **describe_index(name)}
+    except (InvalidArgumentError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(Messages.ERROR_GENERAL.format(error=str(e)))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post(Endpoints.COLLECTION_REBUILD, status_code=202, tags=["Collections"])
+def rebuild_collection(req: CollectionRebuildRequest, name: str = Depends(resolve_collection_name)):
+    """
+    Rebuild a collection's index with new settings and switch over to it when done.
+
+    A background job copies the documents into a new index built with the requested
+    settings (unset ones keep their current value), re-embedding them only if the
+    embedding model changes. Queries keep using the old index during the copy, while
+    uploads and deletions are refused with 409. When the copy completes the collection
+    switches to the new index in one step and the old one is deleted; if the
+    collection changed meanwhile the rebuild fails and the old index stays. Poll
+    `GET /jobs/{job_id}` for progress.
+    """
+    try:
+        config = CollectionConfig.from_collection(registry.get_collection(name)).merged(**req.model_dump())
+        source, target, changes = registry.begin_rebuild(name, config)
+    except CollectionBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except (InvalidArgumentError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(Messages.ERROR_GENERAL.format(error=str(e)))
+        raise HTTPException(status_code=500, detail=str(e))
+
+    def rebuild(job):
+        try:
+            stats = copy_collection(source, target, progress=job.report_progress)
+            registry.switch_collection(name, changes)
+            return stats
+        except Exception:
+            registry.abort_rebuild(name)
+            raise
+
+    try:
+        job = job_manager.submit(f"rebuild:{name}", rebuild, collection=name)
+    except Exception as e:
+        registry.abort_rebuild(name)
+        if isinstance(e, JobQueueFullError):
+            raise HTTPException(status_code=429, detail=str(e))
+        logger.error(Messages.ERROR_GENERAL.format(error=str(e)))
+        raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "message": Messages.REBUILD_QUEUED,
+        "job_id": job.id,
+        "status_url": Endpoints.JOB_BY_ID.format(job_id=job.id),
+        "config": config.as_dict(),
+    }
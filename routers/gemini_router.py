@@ -101,102 +101,534 @@
     
 
 
-import os
-from dotenv import load_dotenv
-import google.generativeai as genai
-from fastapi import APIRouter, HTTPException
+import asyncio
+import json
+from typing import AsyncIterator
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from dtos.question_request import QuestionRequest
 from dtos.ask_request import AskRequest
-from chroma_functionalities import collection
-
-# --- Load environment variables ---
-load_dotenv()
-API_KEY = os.getenv("GEMINI_API_KEY")
-if not API_KEY:
-    raise RuntimeError("GEMINI_API_KEY is not set in environment variables")
-
-# --- Configure Gemini API ---
-genai.configure(api_key=API_KEY)
-MODEL_NAME = "gemini-2.0-flash"
-model = genai.GenerativeModel(MODEL_NAME)
+from dtos.batch_query_request import BatchQueryRequest
+from chroma_functionalities import get_chroma_collection, get_loaded_lexical_index, get_matching_ids, validate_filters
+from context_builder import build_context
+from gemini_client import get_gemini_client
+from lexical_index import reciprocal_rank_fusion
+from resource_registry import registry
+from routers.collections_router import resolve_collection_name
+from reranker import reranker
+from semantic_cache import answer_cache
+from utils.enums import ChromaDBConfig, GeminiConfig, RAGConfig, RerankConfig, RetrievalMode, SemanticCacheConfig
+from utils.logger import setup_logger
+from utils.metrics import timed
+from utils.sse import format_sse
+
+logger = setup_logger(__name__)
 
 router = APIRouter()
+# RAG routes served for the default collection and again under /collections/{collection}
+collection_router = APIRouter()
 
 # --- Normal Gemini question answering ---
 @router.post("/ask-gemini", tags=["Gemini"])
 async def ask_gemini_endpoint(req: QuestionRequest):
     """
     Sends the question to Gemini and returns an answer (max 500 characters).
+
+    Generation is streamed and stopped once the cap is passed, rather than
+    produced in full and truncated afterwards.
     """
     try:
-        response = model.generate_content(req.question)
-        answer = (response.text or "").strip()
+        max_chars = GeminiConfig.ANSWER_MAX_CHARS
+        pieces = [piece async for piece in get_gemini_client().stream(req.question, max_chars=max_chars + 1)]
+        answer = "".join(pieces).strip()
 
-        if len(answer) > 500:
-            answer = answer[:500].rstrip() + "..."
+        if len(answer) > max_chars:
+            answer = answer[:max_chars].rstrip() + "..."
 
         return {
             "question": req.question,
             "answer": answer
         }
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Gemini API timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error from Gemini API: {str(e)}")
 
 
+async def stream_answer_events(prompt: str, max_chars: int = None, result: dict = None) -> AsyncIterator[str]:
+    """
+    Stream a Gemini answer as Server-Sent Events.
+
+    Emits a `sources` event first when `result` carries retrieved documents, then one
+    `token` event per generated piece, and finally a `done` event with the full answer
+    (or an `error` event if generation fails midway).
+
+    Args:
+        prompt (str): The prompt to send to Gemini.
+        max_chars (int): Optional cap on the number of generated characters.
+        result (dict): Response fields sent in the `done` event; its `answer` is filled in.
+
+    Yields:
+        str: Formatted SSE events.
+    """
+    result = {} if result is None else result
+    if "documents_used" in result:
+        yield format_sse("sources", result["documents_used"])
+    pieces = []
+    try:
+        async for piece in get_gemini_client().stream(prompt, max_chars=max_chars):
+            pieces.append(piece)
+            yield format_sse("token", piece)
+    except asyncio.TimeoutError:
+        logger.error("Gemini stream timed out")
+        yield format_sse("error", {"detail": "Gemini API timed out"})
+        return
+    except Exception as e:
+        logger.error(f"Gemini stream failed: {str(e)}")
+        yield format_sse("error", {"detail": f"Error from Gemini API: {str(e)}"})
+        return
+    result["answer"] = "".join(pieces).strip()
+    yield format_sse("done", result)
+
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    """Wrap an SSE event iterator in an unbuffered `text/event-stream` response."""
+    return StreamingResponse(
+        events, media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/ask-gemini/stream", tags=["Gemini"])
+async def ask_gemini_stream_endpoint(req: QuestionRequest):
+    """
+    Stream Gemini's answer as Server-Sent Events (`token`, then `done` or `error`).
+
+    Generation stops once the 500-character cap is reached.
+    """
+    return sse_response(stream_answer_events(
+        req.question, max_chars=GeminiConfig.ANSWER_MAX_CHARS, result={"question": req.question}
+    ))
+
+
+def retrieve_documents_batch(query_texts: list[str], query_embeddings: list, n_results: list[int],
+                             mode: str = RAGConfig.RETRIEVAL_MODE, where: dict = None,
+                             where_document: dict = None,
+                             collection_name: str = None) -> list[tuple[list[str], list[dict]]]:
+    """
+    Retrieve documents for many queries at once.
+
+    - `vector` -> one multi-query collection lookup for the largest requested `n_results`.
+    - `lexical` -> BM25 search over the in-process inverted index.
+    - `hybrid` -> both rankings, over-fetched to `HYBRID_CANDIDATES` and fused with
+      reciprocal-rank fusion.
+
+    Filters restrict every query to the matching documents: they are pushed into the
+    vector query, and BM25 only ranks the IDs Chroma's metadata index returns for them.
+    Each query's hits are then trimmed to its own count.
+
+    Args:
+        query_texts (list[str]): One text per query, for lexical search.
+        query_embeddings (list): One embedding per query, for vector search.
+        n_results (list[int]): Number of documents wanted for each query.
+        mode (str): Retrieval mode, see `RetrievalMode`.
+        where (dict): Optional Chroma metadata filter, see `validate_filters`.
+        where_document (dict): Optional Chroma document filter.
+        collection_name (str): Collection to search; defaults to the configured collection.
+
+    Returns:
+        list[tuple[list[str], list[dict]]]: Retrieved documents and their metadata, per query.
+    """
+    collection = get_chroma_collection(collection_name)
+    candidates = max(n_results)
+    if mode != RetrievalMode.VECTOR:
+        candidates = max(candidates, RAGConfig.HYBRID_CANDIDATES)
+    rows = {}  # document ID -> (document, metadata)
+
+    vector_rankings = [[] for _ in query_texts]
+    if mode != RetrievalMode.LEXICAL:
+        retrieved = collection.query(
+            query_embeddings=list(query_embeddings),
+            n_results=candidates,
+            where=where,
+            where_document=where_document
+        )
+        for i, ids in enumerate(retrieved["ids"]):
+            vector_rankings[i] = ids
+            rows.update(zip(ids, zip(retrieved["documents"][i], retrieved["metadatas"][i])))
+
+    lexical_rankings = [[] for _ in query_texts]
+    if mode != RetrievalMode.VECTOR:
+        index = get_loaded_lexical_index(collection)
+        allowed = get_matching_ids(collection, where, where_document) if where or where_document else None
+        lexical_rankings = [
+            [doc_id for doc_id, _ in index.search(text, candidates, allowed)] for text in query_texts
+        ]
+        missing = list({doc_id for ranking in lexical_rankings for doc_id in ranking if doc_id not in rows})
+        if missing:
+            fetched = collection.get(ids=missing, include=["documents", "metadatas"])
+            rows.update(zip(fetched["ids"], zip(fetched["documents"], fetched["metadatas"])))
+
+    results = []
+    for i, k in enumerate(n_results):
+        if mode == RetrievalMode.HYBRID:
+            ranking = reciprocal_rank_fusion([vector_rankings[i], lexical_rankings[i]])
+        elif mode == RetrievalMode.LEXICAL:
+            ranking = lexical_rankings[i]
+        else:
+            ranking = vector_rankings[i]
+        ranking = [doc_id for doc_id in ranking if doc_id in rows][:k]
+        results.append(([rows[doc_id][0] for doc_id in ranking], [rows[doc_id][1] for doc_id in ranking]))
+    return results
+
+
+def retrieve_documents(query_text: str, query_embedding, n_results: int = RAGConfig.TOP_K,
+                       mode: str = RAGConfig.RETRIEVAL_MODE, where: dict = None,
+                       where_document: dict = None, collection_name: str = None) -> tuple[list[str], list[dict]]:
+    """
+    Retrieve documents for one query, see `retrieve_documents_batch`.
+
+    Returns:
+        tuple[list[str], list[dict]]: Retrieved documents and their metadata.
+    """
+    return retrieve_documents_batch(
+        [query_text], [query_embedding], [n_results], mode, where=where, where_document=where_document,
+        collection_name=collection_name
+    )[0]
+
+
+def filters_key(where: dict = None, where_document: dict = None) -> str:
+    """Canonical text of a pair of filters, so equal filters compare equal whatever their key order."""
+    return json.dumps([where, where_document], sort_keys=True, default=str)
+
+
+def cache_scope(top_k: int, mode: str, rerank: bool, where: dict = None, where_document: dict = None,
+                collection_name: str = None) -> str:
+    """Answer-cache scope of a RAG request; answers built from different retrievals never mix."""
+    collection_name = collection_name or ChromaDBConfig.COLLECTION_NAME
+    scope = f"collection={collection_name};top_k={top_k};mode={mode};rerank={rerank}"
+    if where or where_document:
+        scope += f";filters={filters_key(where, where_document)}"
+    return scope
+
+
+def candidate_count(top_k: int, rerank: bool) -> int:
+    """Number of chunks to retrieve for a query; reranked queries over-fetch candidates."""
+    return max(top_k, RerankConfig.CANDIDATES) if rerank else top_k
+
+
+def build_rag_result(query_text: str, retrieved_docs: list[str], retrieved_metadata: list[dict]) -> dict:
+    """Build the response fields describing the documents a RAG answer is based on."""
+    return {
+        "query": query_text,
+        "documents_used": [
+            {
+                "doc": retrieved_docs[i],
+                "metadata": retrieved_metadata[i]
+            }
+            for i in range(len(retrieved_docs))
+        ]
+    }
+
+
+def build_rag_prompt(query_text: str, retrieved_docs: list[str], retrieved_metadata: list[dict]) -> str:
+    """
+    Build the Gemini prompt that answers a question from retrieved documents.
+
+    The documents are packed by `build_context`: neighbouring chunks are merged,
+    near-duplicates dropped and the context capped to the configured token budget.
+    """
+    context_text = "\n\n".join([
+        f"Source: {passage.source}\nContent: {passage.text}"
+        for passage in build_context(retrieved_docs, retrieved_metadata)
+    ])
+    return (
+        f"You are an assistant with access to the following policy documents:\n\n"
+        f"{context_text}\n\n"
+        f"Answer the following question based only on the above context. "
+        f"Do not include document names, file names, section numbers, or citations in your response. "
+        f"Respond in plain natural language only.\n\n"
+        f"Question: {query_text}"
+    )
+
+
+async def prepare_rag(query_text: str, use_cache: bool = True, top_k: int = RAGConfig.TOP_K,
+                      mode: str = None, rerank: bool = None, where: dict = None,
+                      where_document: dict = None, collection_name: str = None) -> dict:
+    """
+    Run the retrieval half of the RAG pipeline.
+
+    The query is embedded once; the vector serves both the answer cache and the search.
+
+    Args:
+        query_text (str): The user's question.
+        use_cache (bool): Consult the semantic answer cache.
+        top_k (int): Number of documents to retrieve.
+        mode (str): Retrieval mode; defaults to the configured one.
+        rerank (bool): Over-fetch candidates and keep the best `top_k` by cross-encoder
+            score; defaults to the configured setting.
+        where (dict): Optional Chroma metadata filter on source, section, `uploaded_at` or tags.
+        where_document (dict): Optional Chroma document filter.
+        collection_name (str): Collection to search; defaults to the configured collection.
+
+    Returns:
+        dict: `embedding`, `version` and cache `scope`, plus either `cached` (the cached
+        response) or `prompt` and the response fields (`query`, `documents_used`).
+
+    Raises:
+        HTTPException: 400 if a filter is malformed, 404 if no documents match the query.
+    """
+    mode = mode or RAGConfig.RETRIEVAL_MODE
+    rerank = RerankConfig.ENABLED if rerank is None else rerank
+    try:
+        where, where_document = validate_filters(where, where_document)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid filter: {str(e)}")
+    # Queries are embedded with the model of the collection they search
+    embedding_func = registry.embedding_func_for(get_chroma_collection(collection_name))
+    with timed("retrieval", "embed"):
+        query_embedding = (await run_in_threadpool(embedding_func, [query_text]))[0]
+    version = registry.collection_version
+    scope = cache_scope(top_k, mode, rerank, where, where_document, collection_name)
+    state = {"embedding": query_embedding, "version": version, "scope": scope, "cached": None}
+    if use_cache and SemanticCacheConfig.ENABLED:
+        with timed("retrieval", "cache"):
+            state["cached"] = answer_cache.lookup(query_embedding, version, scope=state["scope"])
+        if state["cached"] is not None:
+            return state
+
+    with timed("retrieval", "search"):
+        retrieved_docs, retrieved_metadata = await run_in_threadpool(
+            retrieve_documents, query_text, query_embedding, candidate_count(top_k, rerank), mode,
+            where, where_document, collection_name
+        )
+    if rerank and retrieved_docs:
+        with timed("retrieval", "rerank"):
+            retrieved_docs, retrieved_metadata = (await run_in_threadpool(
+                reranker.rerank_many, [query_text], [(retrieved_docs, retrieved_metadata)], [top_k]
+            ))[0]
+    if not retrieved_docs:
+        raise HTTPException(status_code=404, detail="No documents found for the query.")
+
+    with timed("retrieval", "prompt"):
+        state["prompt"] = await run_in_threadpool(build_rag_prompt, query_text, retrieved_docs, retrieved_metadata)
+    state["result"] = build_rag_result(query_text, retrieved_docs, retrieved_metadata)
+    return state
+
+
 # --- RAG with ChromaDB ---
-@router.post("/ask_rag", tags=["RAG"])
-def ask_with_rag(req: AskRequest):
+@collection_router.post("/ask_rag", tags=["RAG"])
+async def ask_with_rag(req: AskRequest, name: str = Depends(resolve_collection_name)):
     """
     Retrieve documents from ChromaDB and answer using Gemini.
+
+    `where` and `where_document` restrict retrieval to matching chunks, e.g.
+    `{"where": {"$and": [{"tags": {"$contains": "leave"}}, {"uploaded_at": {"$gte": 1767225600}}]}}`.
+    Answers are cached on the query embedding: a new query similar enough to a cached
+    one is answered from the cache without retrieval or an LLM call. Embedding and
+    retrieval run in the threadpool and the Gemini call is awaited, so the event loop
+    is never blocked.
     """
     try:
         if not hasattr(req, "query"):
             raise HTTPException(status_code=400, detail="Missing 'query' field in request body")
 
-        query_text = req.query  
+        query_text = req.query
+        # Capped answers are partial, so they neither come from nor go into the cache
+        use_cache = req.max_chars is None
 
-        # Step 1: Retrieve documents
-        retrieved = collection.query(
-            query_texts=[query_text],
-            n_results=3
+        # Steps 1-3: Embed, check the answer cache, retrieve and build the prompt
+        state = await prepare_rag(
+            query_text, use_cache=use_cache, mode=req.retrieval_mode, rerank=req.rerank,
+            where=req.where, where_document=req.where_document, collection_name=name
         )
-        retrieved_docs = retrieved.get("documents", [[]])[0]
-        retrieved_metadata = retrieved.get("metadatas", [[]])[0]
+        if state["cached"] is not None:
+            return {**state["cached"], "query": query_text, "cached": True}
+
+        # Step 4: Ask Gemini with context
+        if req.max_chars is None:
+            answer = await get_gemini_client().generate(state["prompt"])
+        else:
+            pieces = [piece async for piece in get_gemini_client().stream(state["prompt"], max_chars=req.max_chars)]
+            answer = "".join(pieces).strip()
+
+        # Step 5: Cache and return results
+        result = {**state["result"], "answer": answer}
+        if use_cache and SemanticCacheConfig.ENABLED:
+            answer_cache.store(state["embedding"], result, state["version"], scope=state["scope"])
+        return {**result, "cached": False}
+
+    except HTTPException:
+        raise
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="RAG pipeline failed: Gemini API timed out")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"RAG pipeline failed: {str(e)}")
 
-        if not retrieved_docs:
-            raise HTTPException(status_code=404, detail="No documents found for the query.")
 
-        # Step 2: Build context
-        context_text = "\n\n".join([
-            f"Source: {retrieved_metadata[i].get('source', 'unknown')}\nContent: {retrieved_docs[i]}"
-            for i in range(len(retrieved_docs))
-        ])
-
-        # Step 3: Ask Gemini with context
-        prompt = (
-            f"You are an assistant with access to the following policy documents:\n\n"
-            f"{context_text}\n\n"
-            f"Answer the following question based only on the above context. "
-            f"Do not include document names, file names, section numbers, or citations in your response. "
-            f"Respond in plain natural language only.\n\n"
-            f"Question: {query_text}"
+@collection_router.post("/ask_rag/stream", tags=["RAG"])
+async def ask_with_rag_stream(req: AskRequest, name: str = Depends(resolve_collection_name)):
+    """
+    Retrieve documents from ChromaDB and stream Gemini's answer as Server-Sent Events.
+
+    Retrieval finishes before the response starts, so retrieval errors still come back
+    as regular HTTP errors. The stream then sends a `sources` event with the retrieved
+    documents, `token` events while Gemini generates, and a final `done` event with the
+    full response (or `error`). A semantic cache hit is replayed as a single token.
+    """
+    try:
+        use_cache = req.max_chars is None
+        state = await prepare_rag(
+            req.query, use_cache=use_cache, mode=req.retrieval_mode, rerank=req.rerank,
+            where=req.where, where_document=req.where_document, collection_name=name
         )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"RAG pipeline failed: {str(e)}")
 
-        response = model.generate_content(prompt)
-        answer = response.text.strip()
+    if state["cached"] is not None:
+        cached = {**state["cached"], "query": req.query, "cached": True}
 
-        # Step 4: Return results
-        return {
-            "query": query_text,
-            "answer": answer,
-            "documents_used": [
-                {
-                    "doc": retrieved_docs[i],
-                    "metadata": retrieved_metadata[i]
-                }
-                for i in range(len(retrieved_docs))
-            ]
-        }
+        async def replay() -> AsyncIterator[str]:
+            yield format_sse("sources", cached.get("documents_used", []))
+            yield format_sse("token", cached["answer"])
+            yield format_sse("done", cached)
+
+        return sse_response(replay())
+
+    async def generate() -> AsyncIterator[str]:
+        result = {**state["result"], "cached": False}
+        async for event in stream_answer_events(state["prompt"], max_chars=req.max_chars, result=result):
+            yield event
+        if "answer" in result and use_cache and SemanticCacheConfig.ENABLED:
+            result.pop("cached")
+            answer_cache.store(state["embedding"], result, state["version"], scope=state["scope"])
+
+    return sse_response(generate())
+
+
+@collection_router.post("/ask_rag/batch", tags=["RAG"])
+async def ask_with_rag_batch(req: BatchQueryRequest, name: str = Depends(resolve_collection_name)):
+    """
+    Answer many questions in one request, each with its own `top_k`.
+
+    All questions are embedded in one batched call and retrieved with a single
+    multi-query lookup per retrieval mode and filter; reranked questions share one cross-encoder
+    pass. The Gemini calls then run concurrently, bounded by
+    the shared client's concurrency cap. Cached answers are reused, and a failure on
+    one question is reported in its own result instead of failing the whole batch.
 
+    - `answer=False` -> retrieval only, no Gemini calls.
+    """
+    if not req.queries:
+        raise HTTPException(status_code=400, detail="At least one query is required.")
+    if len(req.queries) > RAGConfig.BATCH_MAX_QUERIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A batch may contain at most {RAGConfig.BATCH_MAX_QUERIES} queries."
+        )
+    if any(query.top_k < 1 for query in req.queries):
+        raise HTTPException(status_code=400, detail="top_k must be at least 1.")
+    try:
+        filters = [validate_filters(query.where, query.where_document) for query in req.queries]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid filter: {str(e)}")
+
+    try:
+        questions = [query.question for query in req.queries]
+        use_cache = req.answer and SemanticCacheConfig.ENABLED
+
+        # Step 1: Embed every question in one batched call
+        embedding_func = registry.embedding_func_for(get_chroma_collection(name))
+        with timed("retrieval", "embed"):
+            embeddings = await run_in_threadpool(embedding_func, questions)
+        version = registry.collection_version
+
+        # Step 2: Answer what the cache can, retrieve the rest with one multi-query lookup
+        modes = [query.retrieval_mode or RAGConfig.RETRIEVAL_MODE for query in req.queries]
+        reranks = [RerankConfig.ENABLED if query.rerank is None else query.rerank for query in req.queries]
+        scopes = [
+            cache_scope(query.top_k, modes[i], reranks[i], *filters[i], collection_name=name)
+            for i, query in enumerate(req.queries)
+        ]
+        results = [None] * len(questions)
+        pending = {}  # (retrieval mode, filters) -> indexes of the questions still to answer
+        with timed("retrieval", "cache"):
+            for i, query in enumerate(req.queries):
+                cached = answer_cache.lookup(embeddings[i], version, scope=scopes[i]) if use_cache else None
+                if cached is not None:
+                    results[i] = {**cached, "query": query.question, "cached": True}
+                else:
+                    pending.setdefault((modes[i], filters_key(*filters[i])), []).append(i)
+
+        retrieved = {}
+        for (mode, _), indexes in pending.items():
+            where, where_document = filters[indexes[0]]
+            with timed("retrieval", "search"):
+                hits = await run_in_threadpool(
+                    retrieve_documents_batch,
+                    [questions[i] for i in indexes],
+                    [embeddings[i] for i in indexes],
+                    [candidate_count(req.queries[i].top_k, reranks[i]) for i in indexes],
+                    mode, where, where_document, name
+                )
+            retrieved.update(zip(indexes, hits))
+
+        # Step 3: Rerank the over-fetched candidates of every reranked question in one pass
+        to_rerank = [i for i in retrieved if reranks[i] and retrieved[i][0]]
+        if to_rerank:
+            with timed("retrieval", "rerank"):
+                reranked = await run_in_threadpool(
+                    reranker.rerank_many,
+                    [questions[i] for i in to_rerank],
+                    [retrieved[i] for i in to_rerank],
+                    [req.queries[i].top_k for i in to_rerank]
+                )
+            retrieved.update(zip(to_rerank, reranked))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"RAG pipeline failed: {str(e)}")
+
+    # Step 4: Fan out the Gemini calls; the client's semaphore bounds concurrency
+    async def answer(i: int, retrieved_docs: list[str], retrieved_metadata: list[dict]) -> None:
+        query = req.queries[i]
+        result = build_rag_result(query.question, retrieved_docs, retrieved_metadata)
+        if not retrieved_docs:
+            results[i] = {**result, "answer": None, "cached": False, "error": "No documents found for the query."}
+            return
+        if not req.answer:
+            results[i] = {**result, "cached": False}
+            return
+        try:
+            with timed("retrieval", "prompt"):
+                prompt = await run_in_threadpool(build_rag_prompt, query.question, retrieved_docs, retrieved_metadata)
+            result["answer"] = await get_gemini_client().generate(prompt)
+        except asyncio.TimeoutError:
+            results[i] = {**result, "answer": None, "cached": False, "error": "Gemini API timed out"}
+            return
+        except Exception as e:
+            results[i] = {**result, "answer": None, "cached": False, "error": f"Error from Gemini API: {str(e)}"}
+            return
+        if use_cache:
+            answer_cache.store(embeddings[i], result, version, scope=scopes[i])
+        results[i] = {**result, "cached": False}
+
+    await asyncio.gather(*(answer(i, docs, metas) for i, (docs, metas) in retrieved.items()))
+    return {
+        "count": len(results),
+        "failed": sum("error" in result for result in results),
+        "results": results,
+    }
+
+
+@router.get("/reranker", tags=["RAG"])
+def get_reranker_stats():
+    """Report the reranking counters, score-cache size and measured cost of the cross-encoder."""
+    return {"enabled_by_default": RerankConfig.ENABLED, **reranker.stats()}
+
+
+@router.get("/answer-cache", tags=["RAG"])
+def get_answer_cache_stats():
+    """Report the size and hit/miss counters of the semantic answer cache."""
+    return {"enabled": SemanticCacheConfig.ENABLED, **answer_cache.stats()}
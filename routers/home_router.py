@@ -1,5 +1,8 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse, PlainTextResponse
+from resource_registry import registry
 from utils.enums import Messages, Endpoints
+from utils.metrics import metrics
 
 router = APIRouter()
 
@@ -9,3 +12,22 @@ def read_root():
     A simple root endpoint to check if the server is running.
     """
     return {"message": Messages.APP_RUNNING}
+
+
+@router.get(Endpoints.READY, tags=["Home"])
+def read_ready():
+    """
+    Readiness probe: 200 once the shared resources are warmed up, 503 until then.
+    """
+    status = registry.status()
+    if not status["ready"]:
+        return JSONResponse(status_code=503, content={"message": Messages.APP_WARMING_UP, **status})
+    return status
+
+
+@router.get(Endpoints.METRICS, tags=["Home"], response_class=PlainTextResponse)
+def read_metrics():
+    """
+    Request, pipeline-stage and ingestion metrics in the Prometheus text format.
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
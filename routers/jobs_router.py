@@ -0,0 +1,20 @@
+from fastapi import APIRouter, HTTPException
+from ingest_jobs import job_manager
+from utils.enums import Endpoints, Messages
+
+router = APIRouter()
+
+
+@router.get(Endpoints.JOBS, tags=["Jobs"])
+def list_jobs():
+    """List the known ingestion jobs, oldest first."""
+    return [job.as_dict() for job in job_manager.list()]
+
+
+@router.get(Endpoints.JOB_BY_ID, tags=["Jobs"])
+def get_job(job_id: str):
+    """Report the status and progress (chunks embedded and written) of an ingestion job."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=Messages.JOB_NOT_FOUND)
+    return job.as_dict()
@@ -0,0 +1,181 @@
+import os
+import re
+import time
+from collections import deque
+from itertools import islice
+from typing import Iterable, Iterator, NamedTuple
+from resource_registry import registry
+from utils.enums import ChromaDBConfig, ChunkingConfig, MetadataKeys
+from utils.metrics import record_stage
+
+# A short single line such as "1. Introduction", "2.3 Disciplinary Actions" or "## Leave"
+HEADING_PATTERN = re.compile(r"^(?:(\d+(?:\.\d+)*)\.?|(#{1,6}))[ \t]+\S[^\n]*$")
+PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n\s*")
+SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+")
+HEADING_MAX_CHARS = 120
+
+
+class _Piece(NamedTuple):
+    text: str
+    gap: str  # whitespace between this piece and the next in the source
+    path: tuple[str, ...]  # headings of the section the piece belongs to
+    heading: bool
+    tokens: int
+
+
+def heading_depth(paragraph: str) -> int:
+    """
+    Return the nesting depth of a heading paragraph, or 0 if it is not a heading.
+
+    "1. Introduction" has depth 1, "1.1 Purpose" depth 2 and "### Notes" depth 3.
+    Lines ending in punctuation are treated as numbered list items, not headings.
+    """
+    paragraph = paragraph.strip()
+    if len(paragraph) > HEADING_MAX_CHARS or paragraph.endswith((".", ":", ";", ",")):
+        return 0
+    match = HEADING_PATTERN.match(paragraph)
+    if not match:
+        return 0
+    number, hashes = match.groups()
+    return number.count(".") + 1 if number else len(hashes)
+
+
+def _split_paragraphs(text: str, final: bool) -> tuple[list[tuple[str, str]], str]:
+    """Split text on blank lines into (paragraph, following whitespace) pairs and the unfinished rest."""
+    paragraphs = []
+    start = 0
+    for match in PARAGRAPH_BREAK.finditer(text):
+        if text[start:match.start()].strip():
+            paragraphs.append((text[start:match.start()], match.group()))
+        start = match.end()
+    rest = text[start:]
+    if final and rest.strip():
+        paragraphs.append((rest, ""))
+        rest = ""
+    return paragraphs, rest
+
+
+def _iter_paragraph_groups(blocks: Iterable[str]) -> Iterator[list[tuple[str, str]]]:
+    """Yield the complete paragraphs of every `TOKENIZE_BATCH_BLOCKS` blocks."""
+    remaining = iter(blocks)
+    pending = ""
+    while True:
+        group = list(islice(remaining, ChromaDBConfig.TOKENIZE_BATCH_BLOCKS))
+        if not group:
+            break
+        paragraphs, pending = _split_paragraphs(pending + "".join(group), final=False)
+        if paragraphs:
+            yield paragraphs
+    paragraphs, _ = _split_paragraphs(pending, final=True)
+    if paragraphs:
+        yield paragraphs
+
+
+def _token_offsets(texts: list[str]) -> list[list[tuple[int, int]]]:
+    start = time.perf_counter()
+    offsets = registry.tokenizer(
+        texts, add_special_tokens=False, return_offsets_mapping=True,
+        return_attention_mask=False, return_token_type_ids=False
+    )["offset_mapping"]
+    record_stage("ingest", "tokenize", time.perf_counter() - start)
+    return offsets
+
+
+def _split_oversized(paragraph: str, separator: str, max_tokens: int) -> Iterator[tuple[str, str, int]]:
+    """
+    Split a paragraph longer than `max_tokens` into sentences, and sentences that are
+    still too long into windows of `max_tokens` tokens.
+
+    Yields:
+        tuple[str, str, int]: (piece, following whitespace, token count).
+    """
+    sentences = []
+    start = 0
+    for match in SENTENCE_BREAK.finditer(paragraph):
+        sentences.append((paragraph[start:match.start()], match.group()))
+        start = match.end()
+    sentences.append((paragraph[start:], separator))
+
+    for (sentence, gap), offsets in zip(sentences, _token_offsets([sentence for sentence, _ in sentences])):
+        if len(offsets) <= max_tokens:
+            yield sentence, gap, len(offsets)
+            continue
+        for i in range(0, len(offsets), max_tokens):
+            window = offsets[i:i + max_tokens]
+            following = offsets[i + max_tokens][0] if i + max_tokens < len(offsets) else len(sentence)
+            yield sentence[window[0][0]:window[-1][1]], sentence[window[-1][1]:following] or gap, len(window)
+
+
+def iter_section_chunks(blocks: Iterable[str], max_tokens: int = ChunkingConfig.MAX_TOKENS,
+                        min_tokens: int = ChunkingConfig.SECTION_MIN_TOKENS) -> Iterator[tuple[str, dict]]:
+    """
+    Split a stream of text blocks into chunks that follow the document's structure.
+
+    Paragraphs (separated by blank lines) are packed into chunks of at most `max_tokens`
+    tokens. A numbered or Markdown heading starts a new chunk, except that a subsection
+    heading is kept with the previous one while that chunk is below `min_tokens`, so
+    short sections are not stored as tiny chunks. Paragraphs longer than `max_tokens` are
+    split on sentences, and over-long sentences on token windows; so are paragraphs that
+    would not fit next to the heading they follow. Chunks never overlap;
+    each is a contiguous slice of the source text.
+
+    Args:
+        blocks (Iterable[str]): Consecutive pieces of the document text, each ending on
+            whitespace (see `ReadDataClass.stream_file`).
+        max_tokens (int): Maximum number of tokens per chunk.
+        min_tokens (int): Size below which a chunk absorbs the next subsection.
+
+    Yields:
+        tuple[str, dict]: The chunk text and its `section` metadata: the heading path
+        shared by everything in the chunk, e.g. "4. Leave Policies > 4.2 Sick Leave".
+    """
+    headings = []  # (depth, heading) of the current section and its parents
+    pieces = []  # pieces of the chunk being built
+    size = 0  # tokens in `pieces`
+
+    def take(carry_headings: bool = False) -> tuple[str, dict]:
+        """Turn the collected pieces into a chunk, optionally carrying trailing headings over."""
+        nonlocal pieces, size
+        split = len(pieces)
+        while carry_headings and split and pieces[split - 1].heading:
+            split -= 1
+        taken, pieces = pieces[:split], pieces[split:]
+        size = sum(piece.tokens for piece in pieces)
+        if not taken:
+            return None
+        text = "".join(piece.text + piece.gap for piece in taken[:-1]) + taken[-1].text
+        section = os.path.commonprefix([piece.path for piece in taken])
+        return text.strip(), {MetadataKeys.SECTION: " > ".join(section)}
+
+    for group in _iter_paragraph_groups(blocks):
+        for (paragraph, separator), offsets in zip(group, _token_offsets([paragraph for paragraph, _ in group])):
+            depth = heading_depth(paragraph)
+            if depth:
+                if pieces and not pieces[-1].heading and (depth == 1 or size >= min_tokens):
+                    yield take()
+                while headings and headings[-1][0] >= depth:
+                    headings.pop()
+                headings.append((depth, paragraph.strip()))
+            path = tuple(heading for _, heading in headings)
+
+            if len(offsets) > max_tokens:
+                parts = deque(_split_oversized(paragraph, separator, max_tokens))
+            else:
+                parts = deque([(paragraph, separator, len(offsets))])
+            while parts:
+                text, gap, tokens = parts.popleft()
+                if pieces and size + tokens > max_tokens:
+                    chunk = take(carry_headings=True)
+                    if chunk:
+                        yield chunk
+                    if pieces and size + tokens > max_tokens:
+                        # Only carried-over headings are pending: split the piece to fit next to them
+                        if size < max_tokens:
+                            parts.extendleft(reversed(list(_split_oversized(text, gap, max_tokens - size))))
+                            continue
+                        yield take()
+                pieces.append(_Piece(text, gap, path, bool(depth), tokens))
+                size += tokens
+
+    if pieces:
+        yield take()
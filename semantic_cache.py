@@ -0,0 +1,117 @@
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from utils.enums import SemanticCacheConfig
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class SemanticCache:
+    """
+    In-memory answer cache keyed on query embeddings.
+
+    A lookup returns the stored answer of the most similar cached query when its cosine
+    similarity reaches `threshold`. Entries expire after `ttl_seconds`, the least recently
+    used entry is evicted beyond `max_entries`, and the whole cache is dropped as soon as
+    the collection version it was filled against changes.
+    """
+
+    def __init__(self, threshold: float = SemanticCacheConfig.SIMILARITY_THRESHOLD,
+                 ttl_seconds: float = SemanticCacheConfig.TTL_SECONDS,
+                 max_entries: int = SemanticCacheConfig.MAX_ENTRIES):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (unit vector, scope, payload, created_at)
+        self._next_key = 0
+        self._version = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _check_version(self, version: int) -> None:
+        if version != self._version:
+            if self._entries:
+                logger.info("Collection changed; clearing the semantic answer cache")
+            self._entries.clear()
+            self._version = version
+
+    def lookup(self, vector, version: int, scope: str = "") -> dict:
+        """
+        Find a cached answer for a query embedding.
+
+        Args:
+            vector (Sequence[float]): Embedding of the query.
+            version (int): Current collection version; a mismatch clears the cache.
+            scope (str): Request options that change the answer (e.g. filters); only
+                entries stored with the same scope can match.
+
+        Returns:
+            dict | None: The cached payload, or None on a miss.
+        """
+        query = self._normalize(vector)
+        now = time.time()
+        with self._lock:
+            self._check_version(version)
+            expired = [key for key, entry in self._entries.items() if now - entry[3] > self.ttl_seconds]
+            for key in expired:
+                del self._entries[key]
+
+            candidates = [(key, entry) for key, entry in self._entries.items() if entry[1] == scope]
+            if candidates:
+                matrix = np.stack([entry[0] for _, entry in candidates])
+                similarities = matrix @ query
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.threshold:
+                    key, entry = candidates[best]
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[2]
+            self.misses += 1
+            return None
+
+    def store(self, vector, payload: dict, version: int, scope: str = "") -> None:
+        """
+        Cache the answer payload of a query.
+
+        Args:
+            vector (Sequence[float]): Embedding of the query.
+            payload (dict): Response to return for similar queries.
+            version (int): Collection version the answer was computed against.
+            scope (str): Request options that change the answer, see `lookup`.
+        """
+        with self._lock:
+            self._check_version(version)
+            self._entries[self._next_key] = (self._normalize(vector), scope, payload, time.time())
+            self._next_key += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        """
+        Report cache size and hit/miss counters since process start.
+
+        Returns:
+            dict: Entry count, capacity, threshold, hits, misses and hit rate.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "similarity_threshold": self.threshold,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+answer_cache = SemanticCache()
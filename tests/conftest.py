@@ -0,0 +1,66 @@
+import hashlib
+import os
+import sys
+
+# The application modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chromadb
+import numpy as np
+import pytest
+from chromadb.api.types import EmbeddingFunction
+from tokenizers import Tokenizer
+from tokenizers.models import WordLevel
+from tokenizers.pre_tokenizers import Whitespace
+from transformers import PreTrainedTokenizerFast
+from resource_registry import registry
+
+
+@pytest.fixture
+def word_tokenizer(monkeypatch):
+    """Install a tokenizer with one token per word or punctuation mark, so no model download is needed."""
+    tokenizer = Tokenizer(WordLevel({"[UNK]": 0}, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = Whitespace()
+    fast = PreTrainedTokenizerFast(tokenizer_object=tokenizer, unk_token="[UNK]")
+    monkeypatch.setattr(registry, "_tokenizer", fast)
+    return fast
+
+
+class HashEmbedding(EmbeddingFunction):
+    """Deterministic embeddings derived from a hash of the text, so no model has to be loaded."""
+
+    def __init__(self):
+        pass
+
+    def __call__(self, input):
+        return self.embed(list(input))
+
+    def embed(self, texts, use_cache=True, stats=None):
+        return [np.frombuffer(hashlib.sha256(text.encode()).digest(), dtype=np.uint8)[:8].astype(np.float32) + 1
+                for text in texts]
+
+    @staticmethod
+    def name():
+        return "hash"
+
+    def get_config(self):
+        return {}
+
+    @staticmethod
+    def build_from_config(config):
+        return HashEmbedding()
+
+
+@pytest.fixture
+def hash_embedding(monkeypatch):
+    """Install `HashEmbedding` as the shared embedding function."""
+    embedding = HashEmbedding()
+    monkeypatch.setattr(registry, "_embedding_func", embedding)
+    return embedding
+
+
+@pytest.fixture
+def collection(tmp_path, hash_embedding):
+    """An empty collection in a temporary database, embedded with `HashEmbedding`."""
+    client = chromadb.PersistentClient(path=str(tmp_path / "db"))
+    return client.create_collection("test_docs", embedding_function=hash_embedding)
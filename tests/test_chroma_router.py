@@ -0,0 +1,52 @@
+import io
+import zipfile
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import routers.chroma_router as chroma_router
+from routers.collections_router import resolve_writable_collection_name
+
+
+class _Job:
+    id = "job"
+
+    def report_progress(self, stage, count):
+        pass
+
+
+def _client(monkeypatch, collection: str):
+    """Client for the collection routes, recording the collection and files every queued job ingests."""
+    app = FastAPI()
+    app.include_router(chroma_router.collection_router)
+    app.dependency_overrides[resolve_writable_collection_name] = lambda: collection
+    ingested = []
+
+    def submit(source, task, cleanup=None, collection=None):
+        try:
+            task(_Job())
+        finally:
+            if cleanup is not None:
+                cleanup()
+        return _Job()
+
+    monkeypatch.setattr(chroma_router.job_manager, "submit", submit)
+    monkeypatch.setattr(chroma_router, "get_chroma_collection", lambda name=None: name)
+    monkeypatch.setattr(
+        chroma_router, "bulk_ingest",
+        lambda collection, files, **kwargs: ingested.append((collection, [name for _, name in files]))
+    )
+    return TestClient(app), ingested
+
+
+def test_upload_text_files_ingests_into_the_requested_collection(monkeypatch):
+    client, ingested = _client(monkeypatch, "hr")
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("benefits.txt", "Dental cover starts after probation.")
+
+    response = client.post("/upload-text-files", files=[
+        ("files", ("policy.txt", b"Employees get 20 days of leave.")),
+        ("files", ("more.zip", archive.getvalue())),
+    ])
+
+    assert response.status_code == 202
+    assert ingested == [("hr", ["policy.txt", "benefits.txt"])]
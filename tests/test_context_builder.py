@@ -0,0 +1,18 @@
+from context_builder import build_context, merge_overlapping
+
+
+def test_oversized_passage_is_cut_to_the_budget_on_the_original_text(word_tokenizer):
+    text = "Employees accrue 1.5 days of paid leave per month, up to 18 days a year."
+
+    passages = build_context([text], [{"source": "hr.txt", "line_number": 0}], token_budget=6)
+
+    assert len(passages) == 1
+    assert passages[0].text == "Employees accrue 1.5 days"  # "1.5" is three tokens
+    assert passages[0].tokens == 6
+
+
+def test_merge_overlapping_keeps_the_shared_slice_once():
+    source = "Sick leave requires a note from a doctor after three consecutive days."
+    first, second = source[:40], source[15:]
+
+    assert merge_overlapping(first, second) == source
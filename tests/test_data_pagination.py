@@ -0,0 +1,75 @@
+import json
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import routers.chroma_router as chroma_router
+from chroma_functionalities import iter_collection_documents
+from routers.collections_router import resolve_collection_name
+
+
+def _fill(collection, count: int = 5):
+    collection.add(
+        ids=[f"doc-{i}" for i in range(count)],
+        documents=[f"line {i}" for i in range(count)],
+        metadatas=[{"source": "a.txt" if i % 2 == 0 else "b.txt", "line_number": i} for i in range(count)],
+    )
+
+
+def _client(monkeypatch, collection) -> TestClient:
+    monkeypatch.setattr(chroma_router, "get_chroma_collection", lambda *args, **kwargs: collection)
+    app = FastAPI()
+    app.include_router(chroma_router.collection_router)
+    app.dependency_overrides[resolve_collection_name] = lambda: collection.name
+    return TestClient(app)
+
+
+def test_following_next_offset_visits_every_document_once(monkeypatch, collection):
+    _fill(collection)
+    client = _client(monkeypatch, collection)
+
+    seen, offset = [], 0
+    while offset is not None:
+        page = client.get("/data", params={"limit": 2, "offset": offset}).json()
+        assert len(page["items"]) <= 2
+        seen += [item["id"] for item in page["items"]]
+        offset = page["next_offset"]
+
+    assert sorted(seen) == [f"doc-{i}" for i in range(5)]
+
+
+def test_pages_apply_source_and_where_filters(monkeypatch, collection):
+    _fill(collection)
+    client = _client(monkeypatch, collection)
+
+    page = client.get("/data", params={"source": "a.txt", "where": json.dumps({"line_number": {"$gt": 0}})}).json()
+
+    assert sorted(item["id"] for item in page["items"]) == ["doc-2", "doc-4"]
+    assert page["next_offset"] is None
+    assert client.get("/data", params={"where": "[1]"}).status_code == 400
+
+
+def test_stream_returns_one_json_document_per_line(monkeypatch, collection):
+    _fill(collection)
+    client = _client(monkeypatch, collection)
+
+    response = client.get("/data/stream", params={"source": "b.txt"})
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(row["id"] for row in rows) == ["doc-1", "doc-3"]
+    assert all(row["metadata"]["source"] == "b.txt" for row in rows)
+
+
+def test_iterating_a_collection_reads_it_page_by_page(collection):
+    _fill(collection)
+    reads = []
+    get = collection.get
+
+    class _Recording:
+        def get(self, **kwargs):
+            reads.append(kwargs["limit"])
+            return get(**kwargs)
+
+    rows = list(iter_collection_documents(_Recording(), page_size=2))
+
+    assert sorted(doc_id for doc_id, _, _ in rows) == [f"doc-{i}" for i in range(5)]
+    assert reads == [2, 2, 2]
@@ -0,0 +1,58 @@
+import sys
+import types
+import numpy as np
+import pytest
+from embedding_engine import EmbeddingEngine
+from utils.enums import ChromaDBConfig, EmbeddingConfig
+
+
+class _FakeSentenceTransformer:
+    def __init__(self, model_name_or_path, device, **kwargs):
+        self.model_name = model_name_or_path
+        self.kwargs = kwargs
+        self.batches = []
+
+    def encode(self, texts, batch_size, convert_to_numpy, normalize_embeddings):
+        self.batches.append(len(texts))
+        return np.array([[float(len(text)), 1.0] for text in texts], dtype=np.float64)
+
+
+@pytest.fixture(autouse=True)
+def fake_sentence_transformers(monkeypatch):
+    module = types.ModuleType("sentence_transformers")
+    module.SentenceTransformer = _FakeSentenceTransformer
+    monkeypatch.setitem(sys.modules, "sentence_transformers", module)
+    monkeypatch.setattr(EmbeddingEngine, "_loaded_models", {})
+
+
+def test_file_path_belongs_to_the_chroma_config():
+    assert ChromaDBConfig.FILE_PATH.endswith("data_file.txt")
+    assert not hasattr(EmbeddingConfig, "FILE_PATH")
+
+
+def test_engines_with_different_backends_load_separate_models():
+    torch_engine = EmbeddingEngine("all-MiniLM-L6-v2", backend="torch")
+    onnx_engine = EmbeddingEngine("all-MiniLM-L6-v2", backend="onnx", onnx_file_name="onnx/model_qint8.onnx")
+
+    assert torch_engine._model is not onnx_engine._model
+    assert onnx_engine._model.kwargs == {"backend": "onnx", "model_kwargs": {"file_name": "onnx/model_qint8.onnx"}}
+    assert torch_engine.cache_key != onnx_engine.cache_key
+
+
+def test_engines_with_the_same_settings_share_one_model():
+    first = EmbeddingEngine("all-MiniLM-L6-v2", backend="onnx")
+    second = EmbeddingEngine("all-MiniLM-L6-v2", backend="onnx")
+
+    assert first._model is second._model
+    assert first.kwargs == {"backend": "onnx"}
+
+
+def test_embed_encodes_in_batches_and_keeps_input_order():
+    engine = EmbeddingEngine("all-MiniLM-L6-v2", batch_size=2, num_workers=2)
+    texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+
+    vectors = engine.embed(texts)
+
+    assert sorted(engine._model.batches) == [1, 2, 2]
+    assert [vector[0] for vector in vectors] == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert all(vector.dtype == np.float32 for vector in vectors)
@@ -0,0 +1,104 @@
+import asyncio
+import types
+import pytest
+from google.api_core import exceptions as google_exceptions
+from gemini_client import GeminiClient
+
+
+class _FakeModel:
+    """Stands in for `genai.GenerativeModel`, failing with the queued errors first."""
+
+    def __init__(self, errors=(), delay: float = 0.0):
+        self.errors = list(errors)
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate_content_async(self, prompt, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.errors:
+                raise self.errors.pop(0)
+            return types.SimpleNamespace(text=f" answer to {prompt} ")
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def make_client(monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+
+    def make(model: _FakeModel, **kwargs) -> GeminiClient:
+        client = GeminiClient(backoff=0.001, **kwargs)
+        client._model = model
+        return client
+
+    return make
+
+
+def test_transient_errors_are_retried(make_client):
+    model = _FakeModel(errors=[google_exceptions.ServiceUnavailable("busy"), google_exceptions.ResourceExhausted("quota")])
+    client = make_client(model, max_retries=2)
+
+    assert asyncio.run(client.generate("q")) == "answer to q"
+    assert model.calls == 3
+
+
+def test_non_retryable_errors_are_raised_at_once(make_client):
+    model = _FakeModel(errors=[google_exceptions.InvalidArgument("bad prompt")])
+    client = make_client(model, max_retries=2)
+
+    with pytest.raises(google_exceptions.InvalidArgument):
+        asyncio.run(client.generate("q"))
+    assert model.calls == 1
+
+
+def test_each_attempt_is_bounded_by_the_timeout(make_client):
+    model = _FakeModel(delay=1.0)
+    client = make_client(model, max_retries=1)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(client.generate("q", timeout=0.02))
+    assert model.calls == 2
+
+
+def test_concurrent_calls_are_capped(make_client):
+    model = _FakeModel(delay=0.02)
+    client = make_client(model, max_concurrency=2)
+
+    async def ask_many():
+        return await asyncio.gather(*(client.generate(f"q{i}") for i in range(6)))
+
+    assert len(asyncio.run(ask_many())) == 6
+    assert model.max_in_flight == 2
+
+
+class _FakeStreamingModel:
+    """Streams fixed pieces and records how many of them were pulled."""
+
+    def __init__(self, pieces):
+        self.pieces = pieces
+        self.pulled = 0
+
+    async def generate_content_async(self, prompt, stream=False):
+        async def pieces():
+            for text in self.pieces:
+                self.pulled += 1
+                yield types.SimpleNamespace(text=text)
+
+        return pieces()
+
+
+def test_stream_stops_pulling_once_the_cap_is_reached(make_client):
+    model = _FakeStreamingModel(["abcd", "efgh", "ijkl", "mnop"])
+    client = make_client(model)
+
+    async def collect():
+        return [piece async for piece in client.stream("q", max_chars=6)]
+
+    assert asyncio.run(collect()) == ["abcd", "ef"]
+    assert model.pulled == 2
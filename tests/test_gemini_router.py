@@ -0,0 +1,118 @@
+import json
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import routers.gemini_router as gemini_router
+from routers.collections_router import resolve_collection_name
+from semantic_cache import SemanticCache
+
+
+class _FakeGemini:
+    def __init__(self, pieces=(), error: Exception = None):
+        self.pieces = pieces
+        self.error = error
+        self.prompts = []
+
+    async def generate(self, prompt, timeout=None):
+        self.prompts.append(prompt)
+        if "fail please" in prompt:
+            raise RuntimeError("boom")
+        return "an answer"
+
+    async def stream(self, prompt, max_chars=None, timeout=None):
+        for piece in self.pieces:
+            yield piece
+        if self.error is not None:
+            raise self.error
+
+
+def _events(body: str) -> list[tuple[str, object]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        event, data = block.split("\n")
+        events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+def _client(monkeypatch, gemini: _FakeGemini, collection_name: str = "test_docs") -> TestClient:
+    monkeypatch.setattr(gemini_router, "get_gemini_client", lambda: gemini)
+    app = FastAPI()
+    app.include_router(gemini_router.router)
+    app.include_router(gemini_router.collection_router)
+    app.dependency_overrides[resolve_collection_name] = lambda: collection_name
+    return TestClient(app)
+
+
+def test_stream_sends_tokens_then_the_full_answer(monkeypatch):
+    client = _client(monkeypatch, _FakeGemini(["Hel", "lo"]))
+
+    response = client.post("/ask-gemini/stream", json={"question": "hi"})
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert _events(response.text) == [
+        ("token", "Hel"),
+        ("token", "lo"),
+        ("done", {"question": "hi", "answer": "Hello"}),
+    ]
+
+
+def test_stream_reports_midway_failures_as_an_error_event(monkeypatch):
+    client = _client(monkeypatch, _FakeGemini(["Hel"], error=RuntimeError("boom")))
+
+    response = client.post("/ask-gemini/stream", json={"question": "hi"})
+
+    assert response.status_code == 200
+    assert _events(response.text) == [
+        ("token", "Hel"),
+        ("error", {"detail": "Error from Gemini API: boom"}),
+    ]
+
+
+def _batch_client(monkeypatch, collection, gemini: _FakeGemini):
+    """Client whose RAG routes read `collection`, recording the size of every collection.query."""
+    queries = []
+    query = collection.query
+
+    class _Recording:
+        def __getattr__(self, name):
+            return getattr(collection, name)
+
+        def query(self, **kwargs):
+            queries.append(len(kwargs["query_embeddings"]))
+            return query(**kwargs)
+
+    collection.add(
+        ids=[f"doc-{i}" for i in range(5)],
+        documents=[f"policy line {i}" for i in range(5)],
+        metadatas=[{"source": "policy.txt", "line_number": i} for i in range(5)],
+    )
+    monkeypatch.setattr(gemini_router, "get_chroma_collection", lambda *args, **kwargs: _Recording())
+    monkeypatch.setattr(gemini_router, "answer_cache", SemanticCache(threshold=0.95, ttl_seconds=60, max_entries=10))
+    return _client(monkeypatch, gemini, collection.name), queries
+
+
+def test_batch_retrieves_every_query_in_one_lookup_trimmed_to_its_top_k(monkeypatch, word_tokenizer, collection):
+    client, queries = _batch_client(monkeypatch, collection, _FakeGemini())
+
+    response = client.post("/ask_rag/batch", json={
+        "queries": [{"question": "first", "top_k": 1}, {"question": "second", "top_k": 3}],
+        "answer": False,
+    })
+
+    results = response.json()["results"]
+    assert queries == [2]
+    assert [len(result["documents_used"]) for result in results] == [1, 3]
+    assert [result["query"] for result in results] == ["first", "second"]
+
+
+def test_batch_reports_a_failed_answer_without_failing_the_others(monkeypatch, word_tokenizer, collection):
+    gemini = _FakeGemini()
+    client, _ = _batch_client(monkeypatch, collection, gemini)
+
+    body = client.post("/ask_rag/batch", json={
+        "queries": [{"question": "works", "top_k": 2}, {"question": "fail please", "top_k": 2}],
+    }).json()
+
+    assert (body["count"], body["failed"]) == (2, 1)
+    assert body["results"][0]["answer"] == "an answer"
+    assert body["results"][1]["error"] == "Error from Gemini API: boom"
+    assert len(gemini.prompts) == 2
@@ -0,0 +1,114 @@
+import threading
+import time
+import pytest
+from embedding_engine import IngestStats
+from ingest_jobs import IngestJobManager, JobQueueFullError
+from utils.enums import JobStatus
+
+
+def _wait(job, timeout: float = 5.0):
+    deadline = time.time() + timeout
+    while job.status in (JobStatus.QUEUED, JobStatus.RUNNING) and time.time() < deadline:
+        time.sleep(0.01)
+    return job
+
+
+def _idle(manager, timeout: float = 5.0) -> bool:
+    """Wait until no source has a running or waiting job; the key is dropped just after the last job ends."""
+    deadline = time.time() + timeout
+    while manager._waiting and time.time() < deadline:
+        time.sleep(0.01)
+    return not manager._waiting
+
+
+def test_job_reports_progress_and_stats_and_runs_cleanup():
+    manager = IngestJobManager(max_workers=1)
+    cleaned = threading.Event()
+
+    def task(job):
+        job.report_progress("processed", 3)
+        job.report_progress("written", 2)
+        return IngestStats(chunks=3)
+
+    job = _wait(manager.submit("a.txt", task, cleanup=cleaned.set))
+
+    assert job.status == JobStatus.COMPLETED
+    assert (job.chunks_processed, job.chunks_written) == (3, 2)
+    assert job.stats["chunks"] == 3
+    assert cleaned.is_set()
+    assert manager.get(job.id) is job
+
+
+def test_failed_job_records_the_error_and_still_cleans_up():
+    manager = IngestJobManager(max_workers=1)
+    cleaned = threading.Event()
+
+    def task(job):
+        raise ValueError("bad file")
+
+    job = _wait(manager.submit("a.txt", task, cleanup=cleaned.set))
+
+    assert job.status == JobStatus.FAILED
+    assert job.error == "bad file"
+    assert cleaned.is_set()
+
+
+def test_submit_refuses_jobs_beyond_max_pending():
+    manager = IngestJobManager(max_workers=1, max_pending=1)
+    release = threading.Event()
+    running = manager.submit("a.txt", lambda job: (release.wait(5), IngestStats())[1])
+    while running.status == JobStatus.QUEUED:
+        time.sleep(0.01)
+    manager.submit("b.txt", lambda job: IngestStats())
+
+    with pytest.raises(JobQueueFullError):
+        manager.submit("c.txt", lambda job: IngestStats())
+    release.set()
+
+
+def test_jobs_of_one_source_never_overlap():
+    manager = IngestJobManager(max_workers=4)
+    active, overlaps = [], []
+
+    def task(job):
+        active.append(job.id)
+        if len(active) > 1:
+            overlaps.append(list(active))
+        time.sleep(0.05)
+        active.remove(job.id)
+        return IngestStats()
+
+    jobs = [manager.submit("same.txt", task, collection="docs") for _ in range(3)]
+
+    assert all(_wait(job).status == JobStatus.COMPLETED for job in jobs)
+    assert overlaps == []
+    assert _idle(manager)
+
+
+def test_jobs_waiting_for_their_source_do_not_hold_a_worker():
+    manager = IngestJobManager(max_workers=2)
+    release = threading.Event()
+    first = manager.submit("same.txt", lambda job: (release.wait(5), IngestStats())[1], collection="docs")
+    second = manager.submit("same.txt", lambda job: IngestStats(), collection="docs")
+
+    other = _wait(manager.submit("other.txt", lambda job: IngestStats(), collection="docs"))
+
+    assert other.status == JobStatus.COMPLETED
+    assert (first.status, second.status) == (JobStatus.RUNNING, JobStatus.QUEUED)
+    release.set()
+    assert _wait(second).status == JobStatus.COMPLETED
+    assert _idle(manager)
+
+
+def test_one_source_in_two_collections_runs_concurrently():
+    manager = IngestJobManager(max_workers=2)
+    release = threading.Event()
+    blocked = manager.submit("a.txt", lambda job: (release.wait(5), IngestStats())[1], collection="hr-dept")
+
+    other = _wait(manager.submit("a.txt", lambda job: IngestStats(), collection="finance"))
+
+    assert other.status == JobStatus.COMPLETED
+    assert other.as_dict()["collection"] == "finance"
+    assert blocked.status == JobStatus.RUNNING
+    release.set()
+    assert _wait(blocked).status == JobStatus.COMPLETED
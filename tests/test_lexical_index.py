@@ -0,0 +1,94 @@
+import pytest
+from chroma_functionalities import delete_source_documents, get_loaded_lexical_index, write_chunks
+from lexical_index import BM25Index, drop_lexical_indexes, reciprocal_rank_fusion, tokenize
+from routers.gemini_router import retrieve_documents_batch
+import routers.gemini_router as gemini_router
+
+
+@pytest.fixture(autouse=True)
+def fresh_indexes():
+    drop_lexical_indexes()
+    yield
+    drop_lexical_indexes()
+
+
+def test_tokenizer_keeps_section_numbers_whole():
+    assert tokenize("See Section 1.2, Leave.") == ["see", "section", "1.2", "leave"]
+
+
+def test_bm25_prefers_rare_terms_and_shorter_documents():
+    index = BM25Index()
+    index.load([
+        ("long", "leave policy applies to every employee of the company in every office", {}),
+        ("short", "leave policy", {}),
+        ("other", "travel policy", {}),
+    ])
+
+    ranking = [doc_id for doc_id, _ in index.search("leave", 3)]
+
+    assert ranking == ["short", "long"]
+    assert index.search("policy", 1)[0][0] in {"short", "other"}
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "d", "a"]])
+
+    assert fused[0] == "b"
+    assert set(fused) == {"a", "b", "c", "d"}
+
+
+def test_index_follows_writes_and_source_deletions(word_tokenizer, collection):
+    write_chunks(collection, ["Section 1.2 covers sick leave."], ["a-1"], [{"source": "a.txt", "line_number": 0}])
+    index = get_loaded_lexical_index(collection)
+    assert [doc_id for doc_id, _ in index.search("1.2", 5)] == ["a-1"]
+
+    write_chunks(collection, ["Section 1.2 of travel."], ["b-1"], [{"source": "b.txt", "line_number": 0}])
+    assert {doc_id for doc_id, _ in index.search("1.2", 5)} == {"a-1", "b-1"}
+
+    delete_source_documents(collection, "a.txt")
+    assert [doc_id for doc_id, _ in index.search("1.2", 5)] == ["b-1"]
+
+
+def test_hybrid_retrieval_returns_lexical_hits_the_vectors_miss(monkeypatch, hash_embedding, collection):
+    collection.add(
+        ids=[f"doc-{i}" for i in range(30)],
+        documents=[f"filler text number {i}" for i in range(29)] + ["the 4.7 reimbursement rule"],
+        metadatas=[{"source": "policy.txt", "line_number": i} for i in range(30)],
+    )
+    monkeypatch.setattr(gemini_router, "get_chroma_collection", lambda *args, **kwargs: collection)
+    embedding = hash_embedding(["unrelated"])[0]
+
+    (lexical_docs, _), = retrieve_documents_batch(["rule 4.7"], [embedding], [3], mode="lexical")
+    (hybrid_docs, hybrid_metadata), = retrieve_documents_batch(["rule 4.7"], [embedding], [3], mode="hybrid")
+
+    assert lexical_docs == ["the 4.7 reimbursement rule"]
+    assert "the 4.7 reimbursement rule" in hybrid_docs
+    assert len(hybrid_docs) == 3 and len(hybrid_metadata) == 3
+
+
+def test_index_is_rebuilt_after_writes_from_another_process(monkeypatch, word_tokenizer, collection):
+    write_chunks(collection, ["Section 1.2 covers sick leave."], ["a-1"], [{"source": "a.txt", "line_number": 0}])
+    index = get_loaded_lexical_index(collection)
+    monkeypatch.setattr(index, "reload_interval", 0)
+
+    # Bypasses write_chunks, like ingest_cli.py running next to the server
+    collection.add(ids=["b-1"], documents=["Section 1.2 of travel."], metadatas=[{"source": "b.txt"}])
+
+    assert {doc_id for doc_id, _ in get_loaded_lexical_index(collection).search("1.2", 5)} == {"a-1", "b-1"}
+
+
+def test_rebuilds_are_rate_limited():
+    index = BM25Index(reload_interval=60)
+    loads = []
+
+    def rows():
+        loads.append(1)
+        return [("a", "leave policy", {})]
+
+    index.ensure_current(1, rows)
+    index.ensure_current(2, rows)
+    assert len(loads) == 1
+
+    index.reload_interval = 0
+    index.ensure_current(2, rows)
+    assert len(loads) == 2
@@ -0,0 +1,50 @@
+import json
+import pytest
+import utils.logger as logger_module
+from utils.enums import LogConfig
+from utils.logger import setup_logger
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    """A log file of its own, whose background writer is stopped at teardown unless `_flush` already did."""
+    path = str(tmp_path / "test.log")
+    yield path
+    listener = logger_module._listeners.pop(path, None)
+    if listener is not None:
+        listener.stop()
+    logger_module._queues.pop(path, None)
+
+
+def _flush(path: str) -> list[str]:
+    """Stop the writer of a log file, which drains its queue, and return the written lines."""
+    logger_module._listeners.pop(path).stop()
+    logger_module._queues.pop(path)
+    with open(path) as f:
+        return f.read().splitlines()
+
+
+def test_records_are_written_by_the_background_writer_with_their_original_arguments(log_file):
+    logger = setup_logger("tests.queue", log_file=log_file)
+    state = {"stage": "embed"}
+
+    logger.warning("stage %s", state)
+    state["stage"] = "write"
+
+    assert logger.handlers[0].queue is logger_module._queues[log_file]
+    assert _flush(log_file)[0].endswith("tests.queue - WARNING - stage {'stage': 'embed'}")
+
+
+def test_json_format_includes_extra_fields_and_the_traceback(log_file, monkeypatch):
+    monkeypatch.setattr(LogConfig, "FORMAT", "json")
+    logger = setup_logger("tests.json", log_file=log_file)
+
+    try:
+        raise ValueError("bad chunk")
+    except ValueError:
+        logger.exception("Ingest failed", extra={"job_id": "job-1"})
+
+    entry = json.loads(_flush(log_file)[0])
+    assert (entry["level"], entry["logger"], entry["message"]) == ("ERROR", "tests.json", "Ingest failed")
+    assert entry["job_id"] == "job-1"
+    assert "ValueError: bad chunk" in entry["exception"]
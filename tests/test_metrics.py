@@ -0,0 +1,68 @@
+import logging
+import time
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from utils.metrics import REQUESTS, MetricsRegistry, timed
+from utils.request_timing import RequestTimingMiddleware
+
+
+def test_histograms_render_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("demo_seconds", "Demo.", ("stage",), buckets=(0.1, 1.0))
+    counter = registry.counter("demo_events", "Demo events.")
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, stage="embed")
+    counter.inc(2)
+
+    lines = registry.render().splitlines()
+
+    assert 'demo_seconds_bucket{stage="embed",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{stage="embed",le="1"} 2' in lines
+    assert 'demo_seconds_bucket{stage="embed",le="+Inf"} 3' in lines
+    assert 'demo_seconds_count{stage="embed"} 3' in lines
+    assert "# TYPE demo_events_total counter" in lines
+    assert "demo_events_total 2" in lines
+
+
+def _client(**kwargs) -> TestClient:
+    router = APIRouter()
+
+    @router.get("/items/{item_id}")
+    def read_item(item_id: str):
+        with timed("retrieval", "search"):
+            time.sleep(0.01)
+        return {"id": item_id}
+
+    @router.get("/stream")
+    def stream():
+        def body():
+            time.sleep(0.03)
+            yield "done"
+        return StreamingResponse(body())
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    app.add_middleware(RequestTimingMiddleware, **kwargs)
+    return TestClient(app)
+
+
+def test_requests_are_counted_per_route_template_with_their_stages():
+    client = _client(timing_headers=True, slow_request_ms=0)
+
+    response = client.get("/api/items/42")
+
+    assert response.headers["server-timing"].startswith("search;dur=")
+    assert 'rag_http_requests_total{method="GET",route="/api/items/{item_id}",status="200"}' in "\n".join(
+        REQUESTS.samples()
+    )
+
+
+def test_streamed_responses_are_timed_to_the_last_byte(caplog):
+    client = _client(timing_headers=False, slow_request_ms=20)
+
+    with caplog.at_level(logging.WARNING, logger="utils.request_timing"):
+        response = client.get("/api/stream")
+
+    assert "server-timing" not in response.headers
+    assert "Slow request: GET /api/stream -> 200" in caplog.text
@@ -0,0 +1,67 @@
+import time
+from reranker import Reranker
+
+
+class _FakeCrossEncoder:
+    """Scores a pair by how many query words the document contains."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.scored = []
+
+    def predict(self, pairs, batch_size=32, show_progress_bar=False):
+        time.sleep(self.delay)
+        self.scored.append(len(pairs))
+        return [len(set(query.split()) & set(doc.split())) for query, doc in pairs]
+
+
+def _reranker(model: _FakeCrossEncoder, latency_budget_ms: float = 1000) -> Reranker:
+    reranker = Reranker(latency_budget_ms=latency_budget_ms, cache_max_entries=100)
+    reranker._model = model
+    return reranker
+
+
+CANDIDATES = (["travel rules", "sick leave days", "leave days"], [{"line_number": 0}, {"line_number": 1}, {"line_number": 2}])
+
+
+def test_candidates_are_reordered_by_score_and_trimmed():
+    reranker = _reranker(_FakeCrossEncoder())
+
+    (docs, metadatas), = reranker.rerank_many(["sick leave days"], [CANDIDATES], [2])
+
+    assert docs == ["sick leave days", "leave days"]
+    assert metadatas == [{"line_number": 1}, {"line_number": 2}]
+
+
+def test_all_queries_are_scored_in_one_pass_and_scores_are_cached():
+    model = _FakeCrossEncoder()
+    reranker = _reranker(model)
+
+    reranker.rerank_many(["sick leave", "travel"], [CANDIDATES, CANDIDATES], [1, 1])
+    reranker.rerank_many(["sick leave"], [CANDIDATES], [1])
+
+    assert model.scored == [6]
+    assert reranker.stats()["cache_hit_rate"] == round(3 / 9, 4)
+
+
+def test_rerank_is_skipped_when_the_estimate_exceeds_the_budget():
+    reranker = _reranker(_FakeCrossEncoder(delay=0.05), latency_budget_ms=20)
+    reranker.rerank_many(["warm up"], [(["a"], [{}])], [1])
+
+    (docs, _), = reranker.rerank_many(["sick leave days"], [CANDIDATES], [2])
+
+    assert docs == ["travel rules", "sick leave days"]
+    assert reranker.stats()["skipped_queries"] == 1
+
+
+def test_cached_pairs_are_reranked_whatever_the_budget():
+    model = _FakeCrossEncoder()
+    reranker = _reranker(model)
+    reranker.rerank_many(["sick leave days"], [CANDIDATES], [2])
+    reranker.latency_budget = 0
+    reranker._seconds_per_pair = 1.0
+
+    (docs, _), = reranker.rerank_many(["sick leave days"], [CANDIDATES], [2])
+
+    assert docs == ["sick leave days", "leave days"]
+    assert len(model.scored) == 1
@@ -0,0 +1,61 @@
+import logging
+import os
+import pytest
+from conftest import HashEmbedding
+from resource_registry import ResourceRegistry
+from utils.enums import ChromaDBConfig
+
+
+@pytest.fixture
+def fresh_registry(tmp_path, monkeypatch):
+    """A registry with its database in a temporary directory, embedded with `HashEmbedding`."""
+    monkeypatch.chdir(tmp_path)
+    registry = ResourceRegistry()
+    registry._embedding_func = HashEmbedding()
+    return registry
+
+
+def _fill(collection, count: int = 3):
+    collection.add(ids=[f"doc-{i}" for i in range(count)], documents=[f"line {i}" for i in range(count)])
+
+
+def test_reset_empties_the_collection_and_keeps_its_settings(fresh_registry):
+    collection = fresh_registry.get_collection()
+    _fill(collection)
+    version = fresh_registry.collection_version
+
+    assert fresh_registry.reset_collection() == 3
+
+    reset = fresh_registry.get_collection()
+    assert reset.count() == 0
+    assert reset.name == collection.name
+    assert reset.metadata == collection.metadata
+    assert fresh_registry.collection_version > version
+
+
+def test_dropped_database_is_reopened_on_next_use(fresh_registry, tmp_path):
+    _fill(fresh_registry.get_collection())
+
+    dropped = fresh_registry.drop_database()
+
+    assert dropped == os.path.join(str(tmp_path), ChromaDBConfig.DB_DIRECTORY)
+    assert not os.path.exists(dropped)
+    assert fresh_registry.get_collection().count() == 0
+    assert os.path.isdir(dropped)
+
+    fresh_registry.drop_database()
+    with pytest.raises(FileNotFoundError):
+        fresh_registry.drop_database()
+
+
+def test_default_collection_created_with_other_settings_is_reported(fresh_registry, caplog):
+    fresh_registry.client.create_collection(
+        "text_data", configuration={"hnsw": {"space": "l2"}}, embedding_function=fresh_registry.embedding_func
+    )
+
+    with caplog.at_level(logging.WARNING, logger="resource_registry"):
+        collection = fresh_registry.get_collection()
+
+    assert collection.configuration_json["hnsw"]["space"] == "l2"
+    assert "space='l2' (configured 'cosine')" in caplog.text
+    assert "/collections/text_data/rebuild" in caplog.text
@@ -0,0 +1,17 @@
+from section_chunker import iter_section_chunks
+
+
+def _tokens(tokenizer, text: str) -> int:
+    return len(tokenizer(text, add_special_tokens=False)["input_ids"])
+
+
+def test_heading_followed_by_near_limit_paragraph_stays_within_max_tokens(word_tokenizer):
+    paragraph = " ".join(f"word{i}" for i in range(19)) + "."  # 20 tokens
+    text = f"1. Leave\n\n{paragraph}\n\n2. Pay\n\n{paragraph}\n"
+
+    chunks = list(iter_section_chunks([text], max_tokens=20, min_tokens=5))
+
+    assert all(_tokens(word_tokenizer, chunk) <= 20 for chunk, _ in chunks)
+    assert chunks[0][0].startswith("1. Leave")
+    assert chunks[0][1] == {"section": "1. Leave"}
+    assert " ".join(chunk for chunk, _ in chunks).split() == text.split()
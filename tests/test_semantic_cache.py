@@ -0,0 +1,35 @@
+from chroma_functionalities import delete_documents, delete_source_documents, write_chunks
+from resource_registry import registry
+from semantic_cache import SemanticCache
+
+PAYLOAD = {"answer": "20 days"}
+
+
+def test_similar_query_in_the_same_scope_hits():
+    cache = SemanticCache(threshold=0.95, ttl_seconds=60, max_entries=10)
+    cache.store([1.0, 0.0, 0.1], PAYLOAD, version=1, scope="vector")
+
+    assert cache.lookup([1.0, 0.0, 0.12], version=1, scope="vector") == PAYLOAD
+    assert cache.lookup([1.0, 0.0, 0.12], version=1, scope="hybrid") is None
+    assert cache.lookup([0.0, 1.0, 0.0], version=1, scope="vector") is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_uploads_and_deletions_invalidate_cached_answers(word_tokenizer, collection):
+    cache = SemanticCache(threshold=0.95, ttl_seconds=60, max_entries=10)
+    query = [1.0, 0.0]
+    metadata = {"source": "leave.txt", "line_number": 0}
+
+    cache.store(query, PAYLOAD, registry.collection_version)
+    write_chunks(collection, ["Employees get 20 days of leave."], ["chunk-1"], [metadata])
+    assert cache.lookup(query, registry.collection_version) is None
+
+    cache.store(query, PAYLOAD, registry.collection_version)
+    delete_documents(collection, ["chunk-1"])
+    assert cache.lookup(query, registry.collection_version) is None
+
+    write_chunks(collection, ["Employees get 20 days of leave."], ["chunk-1"], [metadata])
+    cache.store(query, PAYLOAD, registry.collection_version)
+    delete_source_documents(collection, "leave.txt")
+    assert cache.lookup(query, registry.collection_version) is None
+    assert collection.count() == 0
@@ -0,0 +1,33 @@
+from chroma_functionalities import chunk_text_by_tokens, chunk_texts_by_tokens, iter_chunks_by_tokens
+from utils.read_data import ReadDataClass
+
+TEXT = " ".join(f"Word{i}," for i in range(23))  # 46 tokens: each word and its comma
+
+
+def test_chunks_are_exact_slices_of_the_source_text(word_tokenizer):
+    text = "Leave  Policy:\n\tEmployees GET 20 days (paid)."
+
+    chunks = chunk_text_by_tokens(text, max_tokens=4, overlap_tokens=1)
+
+    assert chunks == ["Leave  Policy:\n\tEmployees", "Employees GET 20 days", "days (paid)."]
+    assert all(chunk in text for chunk in chunks)
+
+
+def test_streamed_blocks_keep_the_final_partial_chunk(word_tokenizer):
+    blocks = list(ReadDataClass.iter_text_blocks(TEXT, block_size=60))
+    assert len(blocks) > 1
+
+    chunks = list(iter_chunks_by_tokens(blocks, max_tokens=10, overlap_tokens=2))
+
+    assert chunks == chunk_text_by_tokens(TEXT, max_tokens=10, overlap_tokens=2)
+    assert len(chunks) == 6
+    assert chunks[0].startswith("Word0,") and chunks[-1].endswith("Word22,")
+
+
+def test_batched_chunking_matches_chunking_each_text(word_tokenizer):
+    texts = [TEXT, "", "Short text."]
+
+    batched = chunk_texts_by_tokens(texts, max_tokens=10, overlap_tokens=2)
+
+    assert batched == [chunk_text_by_tokens(text, max_tokens=10, overlap_tokens=2) for text in texts]
+    assert batched[1] == [] and batched[2] == ["Short text."]
@@ -1,12 +1,130 @@
 # utils/enums.py
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
 class ChromaDBConfig:
     COLLECTION_NAME = "text_data"
     DB_DIRECTORY = "RAG_db"
     EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+    DISTANCE_SPACE = "cosine"
+    READ_BLOCK_SIZE = 64 * 1024  # bytes read per block when streaming a file
+    TOKENIZE_BATCH_BLOCKS = 8  # blocks tokenized per batched tokenizer call when chunking
+    INGEST_BATCH_SIZE = 256  # chunks embedded and written per batch
+    WRITE_BATCH_SIZE = 128  # chunks per collection.add call
+    DATA_PAGE_SIZE = 100  # default page size of /data and /raw_data
+    DATA_MAX_PAGE_SIZE = 1000  # largest page a client may request
+    STREAM_PAGE_SIZE = 500  # rows read per collection.get when streaming /data/stream
+    MAX_OPEN_COLLECTIONS = int(os.getenv("CHROMA_MAX_OPEN_COLLECTIONS", "16"))  # cached collection handles
     FILE_PATH = "raw_data\data_file.txt"
 
+class IndexConfig:
+    # HNSW parameters of new collections; 0 keeps Chroma's default (shown in brackets)
+    MAX_NEIGHBORS = int(os.getenv("HNSW_MAX_NEIGHBORS", "0"))  # M, the graph degree [16]
+    EF_CONSTRUCTION = int(os.getenv("HNSW_EF_CONSTRUCTION", "0"))  # candidates kept while building [100]
+    EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", "0"))  # candidates kept while querying [100]
+    BATCH_SIZE = int(os.getenv("HNSW_BATCH_SIZE", "0"))  # vectors buffered before they enter the graph [100]
+    SYNC_THRESHOLD = int(os.getenv("HNSW_SYNC_THRESHOLD", "0"))  # vectors added between index flushes to disk [1000]
+    REBUILD_PAGE_SIZE = int(os.getenv("INDEX_REBUILD_PAGE_SIZE", "500"))  # rows copied per page by a rebuild
+    ALIASES_FILE = "collection_aliases.json"  # collection name -> rebuilt collection, in the database directory
+
+class EmbeddingConfig:
+    BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+    NUM_WORKERS = int(os.getenv("EMBEDDING_NUM_WORKERS", "1"))
+    BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")  # torch, onnx or openvino
+    ONNX_FILE_NAME = os.getenv("EMBEDDING_ONNX_FILE", "")  # e.g. onnx/model_qint8_avx512_vnni.onnx
+    DEVICE = os.getenv("EMBEDDING_DEVICE", "cpu")
+    TORCH_THREADS = int(os.getenv("EMBEDDING_TORCH_THREADS", "0"))  # 0 keeps the torch default
+    CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+    CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "embedding_cache.sqlite3")
+    CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "100000"))
+
+class GeminiConfig:
+    MODEL_NAME = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
+    TIMEOUT_SECONDS = float(os.getenv("GEMINI_TIMEOUT_SECONDS", "30"))
+    MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "2"))
+    RETRY_BACKOFF_SECONDS = float(os.getenv("GEMINI_RETRY_BACKOFF_SECONDS", "0.5"))
+    MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "16"))
+    ANSWER_MAX_CHARS = int(os.getenv("GEMINI_ANSWER_MAX_CHARS", "500"))
+    # Base URL of a Gemini-compatible REST endpoint (e.g. a proxy or the benchmark stand-in);
+    # when set, calls go over plain HTTP instead of the SDK's gRPC transport
+    API_ENDPOINT = os.getenv("GEMINI_API_ENDPOINT", "")
+
+class RetrievalMode:
+    VECTOR = "vector"
+    LEXICAL = "lexical"
+    HYBRID = "hybrid"
+
+class RAGConfig:
+    TOP_K = int(os.getenv("RAG_TOP_K", "3"))
+    RETRIEVAL_MODE = os.getenv("RAG_RETRIEVAL_MODE", RetrievalMode.VECTOR)
+    HYBRID_CANDIDATES = int(os.getenv("RAG_HYBRID_CANDIDATES", "20"))  # hits per ranking fused in hybrid mode
+    BATCH_MAX_QUERIES = int(os.getenv("RAG_BATCH_MAX_QUERIES", "256"))
+
+class RerankConfig:
+    ENABLED = os.getenv("RERANK_ENABLED", "false").lower() == "true"  # default when a request does not say
+    MODEL_NAME = os.getenv("RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+    CANDIDATES = int(os.getenv("RERANK_CANDIDATES", "20"))  # chunks over-fetched per query before reranking
+    BATCH_SIZE = int(os.getenv("RERANK_BATCH_SIZE", "32"))
+    LATENCY_BUDGET_MS = float(os.getenv("RERANK_LATENCY_BUDGET_MS", "150"))
+    CACHE_MAX_ENTRIES = int(os.getenv("RERANK_CACHE_MAX_ENTRIES", "10000"))
+
+class ContextConfig:
+    TOKEN_BUDGET = int(os.getenv("RAG_CONTEXT_TOKEN_BUDGET", "1500"))  # max tokens of retrieved context per prompt
+    DEDUP_THRESHOLD = float(os.getenv("RAG_CONTEXT_DEDUP_THRESHOLD", "0.9"))  # share of words already covered
+    MIN_OVERLAP_CHARS = 20  # shortest text shared by neighbouring chunks that counts as their overlap
+
+class LexicalConfig:
+    K1 = float(os.getenv("BM25_K1", "1.5"))
+    B = float(os.getenv("BM25_B", "0.75"))
+    RRF_K = int(os.getenv("RRF_K", "60"))
+    RELOAD_INTERVAL_SECONDS = float(os.getenv("BM25_RELOAD_INTERVAL_SECONDS", "30"))  # min time between rebuilds
+
+class MetricsConfig:
+    TIMING_HEADERS = os.getenv("METRICS_TIMING_HEADERS", "false").lower() == "true"  # add a Server-Timing header
+    SLOW_REQUEST_MS = float(os.getenv("METRICS_SLOW_REQUEST_MS", "2000"))  # 0 disables the slow-request log
+
+class ChunkingStrategy:
+    TOKEN = "token"  # fixed-size token windows with overlap
+    STRUCTURE = "structure"  # headings, paragraphs and sentences within the token limit
+
+class ChunkingConfig:
+    STRATEGY = os.getenv("CHUNKING_STRATEGY", ChunkingStrategy.TOKEN)  # default when an upload does not say
+    MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", "300"))
+    OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", "50"))  # token strategy only
+    SECTION_MIN_TOKENS = int(os.getenv("CHUNK_SECTION_MIN_TOKENS", "100"))  # smaller sections share a chunk
+
+class SemanticCacheConfig:
+    ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+    SIMILARITY_THRESHOLD = float(os.getenv("ANSWER_CACHE_SIMILARITY_THRESHOLD", "0.95"))
+    TTL_SECONDS = float(os.getenv("ANSWER_CACHE_TTL_SECONDS", "3600"))
+    MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "1000"))
+
+class IngestConfig:
+    WORKERS = int(os.getenv("INGEST_WORKERS", "2"))
+    MAX_PENDING_JOBS = int(os.getenv("INGEST_MAX_PENDING_JOBS", "32"))
+    JOBS_KEPT = int(os.getenv("INGEST_JOBS_KEPT", "200"))
+    CHUNK_PROCESSES = int(os.getenv("INGEST_CHUNK_PROCESSES", str(os.cpu_count() or 1)))
+    DIRECTORY_ROOT = os.getenv("INGEST_DIRECTORY_ROOT", os.getcwd())  # server-side directories must live under it
+
+class JobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class LogConfig:
+    LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+    FORMAT = os.getenv("LOG_FORMAT", "text").lower()  # text or json
+    FILE = os.getenv("LOG_FILE", "app.log")
+    MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+    BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+
 class Messages:
     APP_RUNNING = "ChromaDB FastAPI app is running!"
+    APP_WARMING_UP = "Resources are still warming up."
     DOC_NOT_FOUND = "Document not found"
     DOC_DELETED = "Document deleted successfully."
     ALL_DOCS_DELETED = "Successfully deleted all documents."
@@ -24,21 +142,47 @@ class Messages:
     DOCUMENTS_ADDED = "Documents added to the collection."
     FORCE_CLEAR_COLLECTION = "Force mode enabled. Clearing collection."
     FILE_UPLOADED = "File successfully processed and stored in collection."
+    FILE_QUEUED = "File accepted; ingestion is running in the background."
+    JOB_NOT_FOUND = "Job not found"
     INVALID_FILE_TYPE = "Only .txt files are supported."
+    INVALID_BULK_FILE_TYPE = "Only .txt and .zip files are supported."
+    NO_TEXT_FILES = "No .txt files found to ingest."
+    DIRECTORY_NOT_ALLOWED = "Directory is outside the allowed ingest root."
+    INVALID_WHERE_FILTER = "The 'where' filter must be a JSON object."
     ERROR_GENERAL = "An error occurred"
     ERROR_DELETION = "An error occurred during deletion"
     ERROR_FILE_UPLOAD = "An error occurred during file upload"
     DATABASE_DROPPED = "Database directory  successfully deleted."
     DATABASE_NOT_FOUND = "Database directory  does not exist."
+    COLLECTION_CREATED = "Collection created."
+    COLLECTION_DELETED = "Collection deleted."
+    INDEX_UPDATED = "Index search parameters updated."
+    REBUILD_QUEUED = "Rebuild queued. The collection switches to the new index when it completes."
+    COLLECTION_REBUILDING = "Collection '{collection}' is being rebuilt; writes resume once it switches to the new index."
 
 class MetadataKeys:
     LINE_NUMBER = "line_number"
     SOURCE = "source"
+    SECTION = "section"
+    UPLOADED_AT = "uploaded_at"  # Unix time of the ingest that first stored the chunk
+    TAGS = "tags"
 
 class Endpoints:
     ROOT = "/"
     DATA = "/data"
     DATA_BY_ID = "/data/{doc_id}"
+    DATA_STREAM = "/data/stream"
     RAW_DATA = "/raw_data"
     UPLOAD_TEXT_FILE = "/upload-text-file"
-    DROP_DATABASE = "/drop-database"
\ No newline at end of file
+    UPLOAD_TEXT_FILES = "/upload-text-files"
+    INGEST_DIRECTORY = "/ingest-directory"
+    DROP_DATABASE = "/drop-database"
+    READY = "/ready"
+    METRICS = "/metrics"
+    EMBEDDING_CACHE = "/embedding-cache"
+    JOBS = "/jobs"
+    JOB_BY_ID = "/jobs/{job_id}"
+    COLLECTIONS = "/collections"
+    COLLECTION_BY_NAME = "/collections/{collection}"  # also the prefix of the collection-scoped routes
+    COLLECTION_INDEX = "/collections/{collection}/index"
+    COLLECTION_REBUILD = "/collections/{collection}/rebuild"
\ No newline at end of file
@@ -1,38 +1,82 @@
+import atexit
+import copy
+import json
 import logging
-from logging.handlers import RotatingFileHandler
-import os
+import queue
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from utils.enums import LogConfig
 
-def setup_logger(name: str, log_file: str = "app.log", max_bytes: int = 10*1024*1024, backup_count: int = 5) -> logging.Logger:
+# Standard LogRecord attributes; anything else on a record came from `extra=`
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_queues = {}  # log file -> queue shared by every logger writing to it
+_listeners = {}
+_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line, including any `extra=` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in _RECORD_FIELDS})
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _EnqueueHandler(QueueHandler):
     """
-    Configures and returns a logger with console and rotating file handlers.
-    
-    Args:
-        name: Name of the logger (usually __name__ of the calling module).
-        log_file: Path to the log file.
-        max_bytes: Maximum size of the log file before rotation (default: 10MB).
-        backup_count: Number of backup log files to keep (default: 5).
-    
-    Returns:
-        Configured logger instance.
+    Queue handler that does as little as possible on the calling thread.
+
+    The stock `prepare` fully formats the record before enqueueing it; here only the
+    message arguments are merged (they may be mutated after the call) and a traceback
+    is rendered to text, and the background writer does the formatting.
     """
-    # Create logger
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)  # Set default level to INFO
-    
-    # Avoid duplicate handlers if logger is already configured
-    if not logger.handlers:
-        # Formatter
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S"
-        )
-        
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _build_formatter() -> logging.Formatter:
+    if LogConfig.FORMAT == "json":
+        return JsonFormatter()
+    return logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S"
+    )
+
+
+def _get_queue(log_file: str, max_bytes: int, backup_count: int) -> queue.Queue:
+    """Return the queue for a log file, starting its background writer on first use."""
+    with _lock:
+        if log_file in _queues:
+            return _queues[log_file]
+
+        formatter = _build_formatter()
+        handlers = []
+
         # Console handler
         console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
-        
+        handlers.append(console_handler)
+
         # File handler with rotation
         try:
             file_handler = RotatingFileHandler(
@@ -40,10 +84,59 @@ def setup_logger(name: str, log_file: str = "app.log", max_bytes: int = 10*1024*
                 maxBytes=max_bytes,
                 backupCount=backup_count
             )
-            file_handler.setLevel(logging.INFO)
             file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
+            handlers.append(file_handler)
         except Exception as e:
-            logger.error(f"Failed to set up file handler for logging: {str(e)}")
-    
-    return logger
\ No newline at end of file
+            console_handler.handle(logging.makeLogRecord({
+                "name": __name__, "levelno": logging.ERROR, "levelname": "ERROR",
+                "msg": f"Failed to set up file handler for logging: {str(e)}"
+            }))
+
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        _queues[log_file] = log_queue
+        _listeners[log_file] = listener
+        return log_queue
+
+
+def stop_logging() -> None:
+    """Flush the queued records and stop the background writers (registered with `atexit`)."""
+    with _lock:
+        for listener in _listeners.values():
+            listener.stop()
+        _listeners.clear()
+        _queues.clear()
+
+
+atexit.register(stop_logging)
+
+
+def setup_logger(name: str, log_file: str = LogConfig.FILE, max_bytes: int = LogConfig.MAX_BYTES,
+                 backup_count: int = LogConfig.BACKUP_COUNT) -> logging.Logger:
+    """
+    Configures and returns a logger that writes through a background queue.
+
+    The logger only enqueues records; a `QueueListener` thread per log file formats
+    them and writes to the console and a rotating file, so disk I/O and rotation never
+    happen on the calling thread. The level (`LOG_LEVEL`) and the text or JSON output
+    format (`LOG_FORMAT`) come from the configuration.
+
+    Args:
+        name: Name of the logger (usually __name__ of the calling module).
+        log_file: Path to the log file.
+        max_bytes: Maximum size of the log file before rotation (default: 10MB).
+        backup_count: Number of backup log files to keep (default: 5).
+
+    Returns:
+        Configured logger instance.
+    """
+    # Create logger
+    logger = logging.getLogger(name)
+    logger.setLevel(LogConfig.LEVEL)
+
+    # Avoid duplicate handlers if logger is already configured
+    if not logger.handlers:
+        logger.addHandler(_EnqueueHandler(_get_queue(log_file, max_bytes, backup_count)))
+
+    return logger
@@ -1,4 +0,0 @@
-class ReadDataClass:
-    
-    def stream_file(file_path:str):
-        pass
\ No newline at end of file
@@ -0,0 +1,78 @@
+import codecs
+import re
+from typing import BinaryIO, Iterator, Union
+from utils.enums import ChromaDBConfig
+
+WHITESPACE = re.compile(r"[ \n\t]")
+
+
+class ReadDataClass:
+
+    @staticmethod
+    def stream_file(source: Union[str, BinaryIO], block_size: int = ChromaDBConfig.READ_BLOCK_SIZE,
+                    encoding: str = "utf-8") -> Iterator[str]:
+        """
+        Read a text file in fixed-size blocks without loading it into memory.
+
+        Every yielded block ends on a whitespace boundary, so a word (and therefore a
+        token) is never split between two blocks. Multi-byte characters cut by a block
+        boundary are reassembled by an incremental decoder.
+
+        Args:
+            source (str | BinaryIO): Path to the file, or a binary file object (e.g. an upload).
+            block_size (int): Number of bytes read per block.
+            encoding (str): Text encoding of the file.
+
+        Yields:
+            str: Consecutive text blocks of the file.
+        """
+        if isinstance(source, str):
+            with open(source, "rb") as f:
+                yield from ReadDataClass.stream_file(f, block_size, encoding)
+            return
+
+        decoder = codecs.getincrementaldecoder(encoding)()
+        pending = ""
+        while True:
+            raw = source.read(block_size)
+            if not raw:
+                break
+            pending += decoder.decode(raw)
+            cut = max(pending.rfind(" "), pending.rfind("\n"), pending.rfind("\t"))
+            if cut >= 0:
+                yield pending[:cut + 1]
+                pending = pending[cut + 1:]
+
+        pending += decoder.decode(b"", final=True)
+        if pending:
+            yield pending
+
+    @staticmethod
+    def iter_text_blocks(text: str, block_size: int = ChromaDBConfig.READ_BLOCK_SIZE) -> Iterator[str]:
+        """
+        Split an in-memory text into blocks of about `block_size` characters.
+
+        Like `stream_file`, every block but the last ends on a whitespace boundary, so
+        a word is never split between two blocks.
+
+        Args:
+            text (str): The text to split.
+            block_size (int): Target number of characters per block.
+
+        Yields:
+            str: Consecutive text blocks.
+        """
+        start = 0
+        while len(text) - start > block_size:
+            end = start + block_size
+            cut = max(text.rfind(" ", start, end), text.rfind("\n", start, end), text.rfind("\t", start, end))
+            if cut < 0:
+                # A single word longer than a block: cut at the first whitespace after it
+                match = WHITESPACE.search(text, end)
+                if match is None:
+                    break
+                cut = match.start()
+            yield text[start:cut + 1]
+            start = cut + 1
+        if start < len(text):
+            yield text[start:]
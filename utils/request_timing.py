@@ -0,0 +1,116 @@
+import time
+from utils.enums import MetricsConfig
+from utils.logger import setup_logger
+from utils.metrics import REQUEST_SECONDS, REQUESTS, start_request_stages
+
+logger = setup_logger(__name__)
+
+
+def format_server_timing(stages: dict, total: float = None) -> str:
+    """
+    Format a stage breakdown as a `Server-Timing` header value (durations in ms).
+
+    Args:
+        stages (dict): Stage name -> seconds.
+        total (float): Optional total duration in seconds, added as `total`.
+
+    Returns:
+        str: e.g. `embed;dur=12.3, search;dur=4.1`.
+    """
+    entries = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in stages.items()]
+    if total is not None:
+        entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+def route_template(scope: dict) -> str:
+    """
+    Return the path template of the route that served a request, e.g. `/api/ask_rag`,
+    `/data/{doc_id}` or `/collections/{collection}/data`, so metrics are labelled per
+    route rather than per URL.
+
+    Args:
+        scope (dict): ASGI scope of the request, after routing.
+
+    Returns:
+        str: The full path template, or "unmatched" if no route matched.
+    """
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    template = getattr(route, "path_format", route.path)
+    path_params = scope.get("path_params", {})
+    try:
+        rendered = template.format(**path_params)
+    except (KeyError, IndexError, ValueError):
+        return template
+    # Routes of an included router only know their own path, not the router's prefix
+    path = scope["path"]
+    if not rendered or not path.endswith(rendered):
+        return template
+    prefix = path[:len(path) - len(rendered)]
+    # Path parameters the route does not use belong to the prefix, e.g. /collections/{collection}
+    for name, value in path_params.items():
+        placeholder = "{" + name + "}"
+        if placeholder not in template:
+            prefix = prefix.replace(f"/{value}", f"/{placeholder}", 1)
+    return prefix + template
+
+
+class RequestTimingMiddleware:
+    """
+    ASGI middleware that times every HTTP request.
+
+    Each request gets its own stage breakdown (see `utils.metrics.timed`). The request
+    is counted and its duration observed when the last byte of the response is sent,
+    so streamed answers are timed to the end of the stream. The stages completed before
+    the response starts are sent in a `Server-Timing` header when `TIMING_HEADERS` is
+    on, and requests slower than `SLOW_REQUEST_MS` are logged with their full breakdown.
+    """
+
+    def __init__(self, app, timing_headers: bool = MetricsConfig.TIMING_HEADERS,
+                 slow_request_ms: float = MetricsConfig.SLOW_REQUEST_MS):
+        self.app = app
+        self.timing_headers = timing_headers
+        self.slow_request = slow_request_ms / 1000
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        stages = start_request_stages()
+        status = 500
+        finished = False
+
+        def finish() -> None:
+            nonlocal finished
+            if finished:
+                return
+            finished = True
+            elapsed = time.perf_counter() - start
+            route = route_template(scope)
+            REQUESTS.inc(method=scope["method"], route=route, status=status)
+            REQUEST_SECONDS.observe(elapsed, method=scope["method"], route=route)
+            if self.slow_request and elapsed >= self.slow_request:
+                logger.warning(f"Slow request: {scope['method']} {scope['path']} -> {status} in "
+                               f"{elapsed * 1000:.0f} ms ({format_server_timing(stages) or 'no stages'})")
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.timing_headers:
+                    value = format_server_timing(stages, time.perf_counter() - start)
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"server-timing", value.encode("latin-1"))
+                    ]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                finish()
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            finish()
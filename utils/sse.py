@@ -0,0 +1,15 @@
+import json
+
+
+def format_sse(event: str, data) -> str:
+    """
+    Format one Server-Sent Event.
+
+    Args:
+        event: Event name (e.g. "sources", "token", "done", "error").
+        data: JSON-serializable payload.
+
+    Returns:
+        str: The event, ready to be written to a `text/event-stream` response.
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"